@@ -2,6 +2,8 @@ import requests
 
 def fectch_random_user_freeapi():
     url = "https://api.freeapi.app/api/v1/public/randomusers/user/random"
+    # Random users must not be cached - for endpoints you poll again and again,
+    # see 2-LearnPython/033_http_cache.py (ETag / If-None-Match revalidation)
     response = requests.get(url)
     data = response.json()
 
@@ -75,6 +75,7 @@ with open(log_file, "w") as f:
     f.write("2026-01-27 10:04:00 ERROR Database unreachable\n")
 
 # Read and find errors
+# (Reads every line - to look at one time window of a big log see 027_log_time_seek.py)
 error_count = 0
 with open(log_file, "r") as f:
     for line in f:
@@ -127,6 +128,7 @@ with open(detailed_log, "w") as f:
     f.write("INFO Backup completed\n")
 
 # Count by level
+# (Fine for small files - for multi-GB logs see 021_log_statistics.py)
 info_count = 0
 warning_count = 0
 error_count = 0
@@ -14,8 +14,14 @@ REAL-WORLD SCENARIO:
 
 HOW TO RUN:
     python3 010_writing_files.py
+
+IMPORTING OTHER LESSONS:
+    Lesson file names start with a digit (029_audit_log.py), which
+    'import' can't handle. importlib.import_module("029_audit_log")
+    loads them anyway - the later scripts share code this way.
 """
 
+import importlib
 import os
 from datetime import datetime
 
@@ -64,6 +70,8 @@ servers = [
     {"name": "api-01", "ip": "10.0.2.10", "status": "stopped"}
 ]
 
+# f-strings break the row when a value contains a comma - for big or
+# untrusted data use 030_streaming_reports.py (csv module, streamed rows)
 csv_file = "./inventory.csv"
 with open(csv_file, "w") as f:
     # Write header
@@ -112,19 +120,22 @@ print("-" * 50)
 # Real DevOps example 3: Write audit log
 print("Example 3: Write audit log")
 
+# Opening the file for every line is slow with thousands of events and
+# breaks lines when several processes write at once. 029_audit_log.py keeps
+# one file open, batches the writes and rotates the file.
+audit_log = importlib.import_module("029_audit_log")
+audit_writer = audit_log.AuditWriter("./audit.log")
+
 def log_action(action, user, result):
     """Log action to audit file."""
-    log_file = "./audit.log"
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    with open(log_file, "a") as f:
-        f.write(f"[{timestamp}] {user} - {action} - {result}\n")
+    audit_writer.log(action, user, result)
 
 # Log some actions
 log_action("server_restart", "admin", "SUCCESS")
 log_action("backup_create", "backup-user", "SUCCESS")
 log_action("config_update", "deployer", "FAILED")
 
+audit_writer.close()  # Write out the buffered lines before reading the file
 print("✓ Logged actions")
 
 # Show log
@@ -137,6 +148,7 @@ print("-" * 50)
 # Real DevOps example 4: Generate HTML report
 print("Example 4: Generate HTML report")
 
+# Values are not escaped here - 030_streaming_reports.py uses html.escape()
 html_file = "./report.html"
 with open(html_file, "w") as f:
     f.write("<html>\n")
@@ -181,6 +181,7 @@ def run_command(command, description=""):
 output = run_command(["whoami"], "Get current user")
 if output:
     print(f"  Current user: {output.strip()}")
+print("  (One command at a time - for thousands of commands see 035_command_runner.py)")
 
 # DevOps Pro Tip
 print("\n" + "=" * 50)
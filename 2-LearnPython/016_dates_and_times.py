@@ -53,6 +53,7 @@ print("Example 3: Parse date strings")
 date_string = "2026-01-27 14:30:00"
 parsed = datetime.strptime(date_string, "%Y-%m-%d %H:%M:%S")
 print(f"Parsed: {parsed}")
+print("  (strptime() is slow for millions of log lines - see 028_fast_timestamps.py)")
 print()
 
 # Example 4: Date arithmetic
@@ -105,7 +105,12 @@ print()
 print("Example 6: Find log files")
 
 def find_files(directory, extension):
-    """Find all files with given extension."""
+    """
+    Find all files with given extension.
+    
+    extension can be a tuple, e.g. (".log", ".log.gz") to include
+    rotated, compressed logs.
+    """
     found_files = []
     
     for item in os.listdir(directory):
@@ -121,10 +126,16 @@ for i in range(3):
     with open(f"/tmp/test_devops/logs/app_{i}.log", "w") as f:
         f.write("Log data")
 
-log_files = find_files("/tmp/test_devops/logs", ".log")
+# Rotated logs are usually gzipped
+import gzip
+with gzip.open("/tmp/test_devops/logs/app_3.log.gz", "wt") as f:
+    f.write("Old log data")
+
+log_files = find_files("/tmp/test_devops/logs", (".log", ".log.gz"))
 print(f"Found {len(log_files)} log files:")
 for f in log_files:
     print(f"  - {f}")
+print("  (021_log_statistics.py reads .gz/.bz2/.xz/.zst logs without unpacking them)")
 
 print()
 
@@ -75,6 +75,8 @@ for log in log_entries:
     match = re.search(ip_pattern, log)
     if match:
         print(f"  - {match.group()}")
+# Careful: \d{1,3} also accepts "999.1.1.1" - validate with the ipaddress module.
+print("  (top client IPs/networks over big logs: see 025_top_talkers.py)")
 
 print()
 
@@ -83,19 +85,21 @@ print("Example 5: Parse nginx access log")
 
 nginx_log = '192.168.1.10 - - [27/Jan/2026:14:30:00] "GET /api/users HTTP/1.1" 200 1234'
 
-# Extract components
-ip = re.search(r"^\d+\.\d+\.\d+\.\d+", nginx_log).group()
-date = re.search(r"\[(.*?)\]", nginx_log).group(1)
-method = re.search(r'"(\w+)', nginx_log).group(1)
-path = re.search(r'"\w+ (\S+)', nginx_log).group(1)
-status = re.search(r'" (\d+)', nginx_log).group(1)
+# Extract all components with ONE pattern, compiled once.
+# Five separate re.search() calls would scan the line five times.
+nginx_pattern = re.compile(
+    r'(?P<ip>\S+) \S+ \S+ \[(?P<date>[^\]]*)\] "(?P<method>\w+) (?P<path>\S+)[^"]*" (?P<status>\d+)'
+)
 
-print("Parsed log:")
-print(f"  IP: {ip}")
-print(f"  Date: {date}")
-print(f"  Method: {method}")
-print(f"  Path: {path}")
-print(f"  Status: {status}")
+match = nginx_pattern.match(nginx_log)
+if match:
+    print("Parsed log:")
+    print(f"  IP: {match.group('ip')}")
+    print(f"  Date: {match.group('date')}")
+    print(f"  Method: {match.group('method')}")
+    print(f"  Path: {match.group('path')}")
+    print(f"  Status: {match.group('status')}")
+print("  (for whole access logs see 023_access_log_parser.py)")
 
 print()
 
@@ -160,6 +164,7 @@ for log in logs:
     if match:
         error_msg = match.group(1)
         print(f"  - {error_msg}")
+print("  (matching hundreds of patterns at once: see 024_signature_matcher.py)")
 
 print()
 
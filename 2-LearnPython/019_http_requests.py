@@ -76,6 +76,7 @@ print("Code:")
 print("  response = requests.get('https://api.github.com/users/github')")
 print("  data = response.json()")
 print("  print(data['name'])")
+print("  (Polling the same API? Cache it and send If-None-Match - see 033_http_cache.py)")
 
 if HAS_REQUESTS:
     try:
@@ -106,6 +107,7 @@ print('''Code:
   healthy, message = check_health("https://example.com")
   print(f"Status: {message}")
 ''')
+print("  (One URL at a time, new connection each - for a fleet see 031_health_checker.py)")
 
 if HAS_REQUESTS:
     def check_health(url):
@@ -194,6 +196,7 @@ print('''Code:
   webhook = "https://hooks.slack.com/services/YOUR/WEBHOOK/URL"
   send_slack_alert(webhook, "Server web-01 is down!")
 ''')
+print("  (One POST per alert floods the channel - see 032_alert_dispatcher.py)")
 
 # DevOps Pro Tip
 print("\n" + "=" * 50)
@@ -21,14 +21,53 @@ This script combines:
 - File operations
 - Date/time
 - Error handling
+- Threads (checks run at the same time)
+
+Checks are registered with @register_check and run concurrently, each in
+its own daemon thread. Every check has its own timeout and the whole run
+has a time budget, so one hung check (e.g. a dead NFS mount)
+is reported as TIMEOUT instead of holding up the other results.
+
+Disk usage is read natively with os.statvfs() for every mount listed in
+/proc/self/mounts (no `df` process per sample), for both bytes and inodes.
+Memory is sampled by MemInfoReader, which parses every /proc/meminfo
+field from one reusable buffer and remembers where each field sits.
+Services are looked up in a process index built by one walk of /proc
+per run (no `pgrep` process per service).
+
+Daemon mode (--daemon) keeps running and re-checks every --interval
+seconds. Because the process stays alive it keeps state between ticks:
+CPU utilisation, network and disk I/O rates are computed from counter
+deltas in /proc/stat, /proc/net/dev and /proc/diskstats, and the last
+--history samples are kept in a fixed-size ring buffer.
+
+With --metrics-port the daemon also serves the latest results and raw
+gauges in Prometheus text format (or OpenMetrics if the scraper asks for
+it) on /metrics. The page is rendered once per tick, so a scrape is only
+a memory read and never runs checks.
 
 HOW TO RUN:
     python3 020_simple_monitoring.py
+    python3 020_simple_monitoring.py --check-timeout 5 --budget 15
+    python3 020_simple_monitoring.py --mount '/' --mount '/var*'
+    python3 020_simple_monitoring.py --exclude-mount '/snap/*'
+    python3 020_simple_monitoring.py --service nginx --service sshd
+    python3 020_simple_monitoring.py --daemon --interval 10
+    python3 020_simple_monitoring.py --daemon --interval 15 --metrics-port 9109
+    curl http://localhost:9109/metrics
 """
 
+import argparse
+import fnmatch
+import http.server
 import os
-import subprocess
+import queue
+import re
+import signal
 import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime
 
 # ANSI color codes for terminal
@@ -38,6 +77,53 @@ RED = '\033[91m'
 RESET = '\033[0m'
 BOLD = '\033[1m'
 
+# Default limits (seconds)
+DEFAULT_CHECK_TIMEOUT = 10
+DEFAULT_RUN_BUDGET = 30
+
+# Daemon mode defaults
+DEFAULT_INTERVAL = 60
+DEFAULT_HISTORY = 60
+CPU_SAMPLE_WINDOW = 0.5  # One-shot runs measure CPU over this many seconds
+
+# Usage thresholds (percent)
+WARNING_PERCENT = 75
+CRITICAL_PERCENT = 90
+
+# Registered checks: name -> (title, function, timeout or None)
+CHECKS = {}
+
+# Prometheus metric families: name -> (type, help)
+METRIC_HELP = {
+    "monitor_check_ok": ("gauge", "1 if the check passed, 0 if it failed"),
+    "monitor_check_duration_seconds": ("gauge", "How long the check took"),
+    "monitor_check_timed_out": ("gauge", "1 if the check hit its timeout"),
+    "monitor_last_run_timestamp_seconds": ("gauge", "Unix time of the last completed run"),
+    "monitor_filesystem_size_bytes": ("gauge", "Filesystem size"),
+    "monitor_filesystem_used_bytes": ("gauge", "Filesystem space used"),
+    "monitor_filesystem_avail_bytes": ("gauge", "Filesystem space available to non-root users"),
+    "monitor_filesystem_files": ("gauge", "Filesystem total inodes"),
+    "monitor_filesystem_files_free": ("gauge", "Filesystem free inodes"),
+    "monitor_meminfo_bytes": ("gauge", "/proc/meminfo field in bytes"),
+    "monitor_meminfo_hugepages": ("gauge", "/proc/meminfo HugePages_* count"),
+    "monitor_service_processes": ("gauge", "Number of processes with this name"),
+    "monitor_service_rss_bytes": ("gauge", "Total resident memory of the service processes"),
+    "monitor_service_cpu_seconds_total": ("counter", "Total user+system CPU time of the service processes"),
+    "monitor_cpu_usage_ratio": ("gauge", "CPU busy time ratio since the previous sample"),
+    "monitor_network_receive_bytes_per_second": ("gauge", "Network receive rate"),
+    "monitor_network_transmit_bytes_per_second": ("gauge", "Network transmit rate"),
+    "monitor_disk_read_bytes_per_second": ("gauge", "Disk read rate"),
+    "monitor_disk_written_bytes_per_second": ("gauge", "Disk write rate"),
+}
+
+# Filesystems that are not real storage (skipped by default)
+PSEUDO_FILESYSTEMS = {
+    "autofs", "binfmt_misc", "bpf", "cgroup", "cgroup2", "configfs",
+    "debugfs", "devpts", "devtmpfs", "efivarfs", "fusectl", "hugetlbfs",
+    "mqueue", "nsfs", "proc", "pstore", "ramfs", "rpc_pipefs", "securityfs",
+    "selinuxfs", "squashfs", "sysfs", "tracefs",
+}
+
 
 def print_header(title):
     """Print formatted header."""
@@ -46,124 +132,703 @@ def print_header(title):
     print("=" * 60)
 
 
-def check_disk_space():
-    """Check disk usage."""
-    print_header("DISK SPACE CHECK")
+def register_check(name, title, timeout=None):
+    """
+    Register a check function with the scheduler.
+    
+    A check returns (ok, messages) where messages is a list of lines
+    to print. Checks must not print directly: they run at the same time
+    and their output would get mixed up. A check may also return
+    (ok, messages, gauges) where gauges is a list of
+    (metric_name, labels_dict, value) for the /metrics endpoint.
+    
+    Args:
+        name: Key used in results (e.g. "disk")
+        title: Header printed above the check output
+        timeout: Seconds before the check is reported as TIMEOUT
+                 (None = use the run's default check timeout)
+    """
+    def decorator(func):
+        CHECKS[name] = (title, func, timeout)
+        return func
+    return decorator
+
+
+def _unescape_mount_field(field):
+    """Decode octal escapes used in /proc/mounts (e.g. '\\040' for a space)."""
+    if "\\" not in field:
+        return field
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), field)
+
+
+def read_mounts(mounts_file="/proc/self/mounts"):
+    """
+    Read the mount table.
+    
+    Returns:
+        List of (device, mountpoint, fstype) tuples. If a mountpoint is
+        mounted over, only the last (visible) entry is kept.
+    """
+    mounts = {}
+    with open(mounts_file, "r") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 3:
+                continue
+            device, mountpoint, fstype = parts[0], _unescape_mount_field(parts[1]), parts[2]
+            mounts.pop(mountpoint, None)  # Keep table order of the visible mount
+            mounts[mountpoint] = (device, mountpoint, fstype)
+    return list(mounts.values())
+
+
+def _matches_any(value, patterns):
+    """Check value against a list of shell-style patterns."""
+    return any(fnmatch.fnmatchcase(value, pattern) for pattern in patterns)
+
+
+def collect_disk_usage(include=None, exclude=None, fstypes=None, exclude_fstypes=PSEUDO_FILESYSTEMS,
+                       mounts_file="/proc/self/mounts"):
+    """
+    Collect byte and inode usage for mounted filesystems with os.statvfs().
+    
+    Args:
+        include: Mountpoint patterns to keep, e.g. ["/", "/var*"] (None = all)
+        exclude: Mountpoint patterns to skip, e.g. ["/snap/*"]
+        fstypes: Filesystem types to keep, e.g. ["ext4", "xfs"] (None = all)
+        exclude_fstypes: Filesystem types to skip (default: pseudo filesystems)
+        mounts_file: Mount table to read
+    
+    Returns:
+        List of dicts, one per mount. Percentages are computed like df:
+        used / (used + available to unprivileged users).
+    """
+    usage = []
+    for device, mountpoint, fstype in read_mounts(mounts_file):
+        if include and not _matches_any(mountpoint, include):
+            continue
+        if exclude and _matches_any(mountpoint, exclude):
+            continue
+        if fstypes and fstype not in fstypes:
+            continue
+        if exclude_fstypes and fstype in exclude_fstypes:
+            continue
+        
+        try:
+            st = os.statvfs(mountpoint)
+        except OSError:
+            continue  # Mount vanished or permission denied
+        
+        if st.f_blocks == 0:
+            continue  # Nothing to measure (e.g. empty pseudo mount)
+        
+        bytes_total = st.f_blocks * st.f_frsize
+        bytes_used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        bytes_avail = st.f_bavail * st.f_frsize
+        bytes_usable = bytes_used + bytes_avail
+        
+        inodes_used = st.f_files - st.f_ffree
+        inodes_usable = inodes_used + st.f_favail
+        
+        usage.append({
+            "mount": mountpoint,
+            "device": device,
+            "fstype": fstype,
+            "bytes_total": bytes_total,
+            "bytes_used": bytes_used,
+            "bytes_avail": bytes_avail,
+            "bytes_percent": (bytes_used / bytes_usable * 100) if bytes_usable else 0.0,
+            "inodes_total": st.f_files,
+            "inodes_used": inodes_used,
+            "inodes_free": st.f_favail,
+            # Some filesystems (btrfs, vfat) report no inode counts
+            "inodes_percent": (inodes_used / inodes_usable * 100) if inodes_usable else 0.0,
+        })
+    return usage
+
+
+def format_bytes(num):
+    """Format a byte count like df -h (e.g. 12.3G)."""
+    for unit in ("B", "K", "M", "G", "T"):
+        if abs(num) < 1024 or unit == "T":
+            return f"{num:.1f}{unit}" if unit != "B" else f"{num}{unit}"
+        num /= 1024
+
+
+@register_check("disk", "DISK SPACE CHECK")
+def check_disk_space(include=None, exclude=None):
+    """Check byte and inode usage on every mounted filesystem."""
+    messages = []
     
     try:
-        result = subprocess.run(
-            ["df", "-h", "/"],
-            capture_output=True,
-            text=True
-        )
+        mounts = collect_disk_usage(include=include, exclude=exclude)
+    except Exception as e:
+        messages.append(f"{RED}✗ Error checking disk: {e}{RESET}")
+        return False, messages
+    
+    if not mounts:
+        messages.append(f"{YELLOW}⚠ No filesystems matched the mount filters{RESET}")
+        return True, messages
+    
+    all_ok = True
+    warned = False
+    gauges = []
+    for disk in mounts:
+        labels = {"mount": disk["mount"], "device": disk["device"], "fstype": disk["fstype"]}
+        gauges.append(("monitor_filesystem_size_bytes", labels, disk["bytes_total"]))
+        gauges.append(("monitor_filesystem_used_bytes", labels, disk["bytes_used"]))
+        gauges.append(("monitor_filesystem_avail_bytes", labels, disk["bytes_avail"]))
+        gauges.append(("monitor_filesystem_files", labels, disk["inodes_total"]))
+        gauges.append(("monitor_filesystem_files_free", labels, disk["inodes_free"]))
         
-        if result.returncode == 0:
-            lines = result.stdout.strip().split("\n")
-            if len(lines) >= 2:
-                data_line = lines[1].split()
-                usage_percent = int(data_line[4].replace("%", ""))
-                
-                print(f"Root partition usage: {usage_percent}%")
-                
-                if usage_percent > 90:
-                    print(f"{RED}✗ CRITICAL: Disk usage very high!{RESET}")
-                    return False, usage_percent
-                elif usage_percent > 75:
-                    print(f"{YELLOW}⚠ WARNING: Disk usage high{RESET}")
-                    return True, usage_percent
+        worst = max(disk["bytes_percent"], disk["inodes_percent"])
+        if worst > CRITICAL_PERCENT:
+            symbol = f"{RED}✗{RESET}"
+            all_ok = False
+        elif worst > WARNING_PERCENT:
+            symbol = f"{YELLOW}⚠{RESET}"
+            warned = True
+        else:
+            symbol = f"{GREEN}✓{RESET}"
+        messages.append(
+            f"  {symbol} {disk['mount']} ({disk['fstype']}): "
+            f"{disk['bytes_percent']:.0f}% of {format_bytes(disk['bytes_total'])} used, "
+            f"inodes {disk['inodes_percent']:.0f}%"
+        )
+    
+    if not all_ok:
+        messages.append(f"{RED}✗ CRITICAL: Disk usage very high!{RESET}")
+    elif warned:
+        messages.append(f"{YELLOW}⚠ WARNING: Disk usage high{RESET}")
+    else:
+        messages.append(f"{GREEN}✓ OK: Disk usage normal{RESET}")
+    return all_ok, messages, gauges
+
+
+class MemInfoReader:
+    """
+    Sample /proc/meminfo without re-splitting the whole file every time.
+    
+    The file is read with os.preadv() into one preallocated buffer. The
+    first sample records the byte range of every field's number; later
+    samples convert those ranges straight to int. If the layout changes
+    (a value grew a digit, a field appeared), the offsets are rebuilt.
+    
+    Values are returned in bytes; HugePages_* fields are page counts.
+    """
+    
+    def __init__(self, path="/proc/meminfo", buffer_size=8192):
+        self.path = path
+        self._fd = os.open(path, os.O_RDONLY)
+        self._buffer = bytearray(buffer_size)
+        self._layout = []   # (name, value_start, value_end, line_end, multiplier)
+        self._layout_size = -1
+        self._lock = threading.Lock()
+    
+    def close(self):
+        """Close the file descriptor."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+    
+    def _read(self):
+        """Read the whole file into the buffer, growing it if needed."""
+        while True:
+            size = os.preadv(self._fd, [self._buffer], 0)
+            if size < len(self._buffer):
+                return size
+            self._buffer = bytearray(len(self._buffer) * 2)
+    
+    def _build_layout(self, size):
+        """Find the value range of every 'Name:   1234 kB' line."""
+        buf = self._buffer
+        layout = []
+        pos = 0
+        while pos < size:
+            line_end = buf.find(b"\n", pos, size)
+            if line_end == -1:
+                break
+            colon = buf.find(b":", pos, line_end)
+            if colon != -1:
+                name = buf[pos:colon].decode()
+                if buf[line_end - 3:line_end] == b" kB":
+                    layout.append((name, colon + 1, line_end - 3, line_end, 1024))
                 else:
-                    print(f"{GREEN}✓ OK: Disk usage normal{RESET}")
-                    return True, usage_percent
+                    layout.append((name, colon + 1, line_end, line_end, 1))
+            pos = line_end + 1
+        self._layout = layout
+        self._layout_size = size
     
-    except Exception as e:
-        print(f"{RED}✗ Error checking disk: {e}{RESET}")
-        return False, 0
+    def _parse(self):
+        """Parse values with the cached layout (None if the layout is stale)."""
+        buf = self._buffer
+        values = {}
+        for name, start, end, line_end, multiplier in self._layout:
+            if buf[line_end] != 10:  # Line moved - layout is stale
+                return None
+            values[name] = int(buf[start:end]) * multiplier
+        return values
+    
+    def sample(self):
+        """Return a dict of every meminfo field."""
+        with self._lock:
+            size = self._read()
+            values = None
+            if size == self._layout_size:
+                values = self._parse()
+            if values is None:
+                self._build_layout(size)
+                values = self._parse()
+            return values
+
+
+def memory_summary(meminfo):
+    """
+    Derive usage percentages from a MemInfoReader sample.
+    
+    Returns:
+        Dict with used_percent, swap_used_percent, dirty, writeback,
+        slab and hugepages fields
+    """
+    total = meminfo.get("MemTotal", 0)
+    available = meminfo.get("MemAvailable")
+    if available is None:
+        # Kernels before 3.14 have no MemAvailable
+        available = meminfo.get("MemFree", 0) + meminfo.get("Buffers", 0) + meminfo.get("Cached", 0)
     
-    return False, 0
+    swap_total = meminfo.get("SwapTotal", 0)
+    swap_used = swap_total - meminfo.get("SwapFree", 0)
+    
+    return {
+        "used_percent": ((total - available) / total * 100) if total else 0.0,
+        "swap_used_percent": (swap_used / swap_total * 100) if swap_total else 0.0,
+        "dirty": meminfo.get("Dirty", 0),
+        "writeback": meminfo.get("Writeback", 0),
+        "slab": meminfo.get("Slab", 0),
+        "slab_unreclaimable": meminfo.get("SUnreclaim", 0),
+        "hugepages_total": meminfo.get("HugePages_Total", 0),
+        "hugepages_free": meminfo.get("HugePages_Free", 0),
+    }
+
+
+_meminfo_reader = None
 
 
+def get_meminfo_reader():
+    """Return the shared MemInfoReader (opened on first use)."""
+    global _meminfo_reader
+    if _meminfo_reader is None:
+        _meminfo_reader = MemInfoReader()
+    return _meminfo_reader
+
+
+@register_check("memory", "MEMORY CHECK")
 def check_memory():
     """Check memory usage."""
-    print_header("MEMORY CHECK")
+    messages = []
+    
+    # /proc/meminfo only exists on Linux
+    if not os.path.exists("/proc/meminfo"):
+        messages.append(f"{YELLOW}⚠ Cannot check memory on this system{RESET}")
+        return True, messages
     
     try:
-        # Try to read /proc/meminfo (Linux)
-        if os.path.exists("/proc/meminfo"):
-            with open("/proc/meminfo", "r") as f:
-                lines = f.readlines()
-            
-            mem_info = {}
-            for line in lines[:3]:  # First 3 lines
-                parts = line.split()
-                key = parts[0].rstrip(":")
-                value = int(parts[1])
-                mem_info[key] = value
-            
-            total = mem_info.get("MemTotal", 0)
-            available = mem_info.get("MemAvailable", 0)
-            
-            if total > 0:
-                used_percent = ((total - available) / total) * 100
-                print(f"Memory usage: {used_percent:.1f}%")
-                
-                if used_percent > 90:
-                    print(f"{RED}✗ CRITICAL: Memory usage very high!{RESET}")
-                    return False
-                elif used_percent > 75:
-                    print(f"{YELLOW}⚠ WARNING: Memory usage high{RESET}")
-                    return True
-                else:
-                    print(f"{GREEN}✓ OK: Memory usage normal{RESET}")
-                    return True
+        meminfo = get_meminfo_reader().sample()
+        summary = memory_summary(meminfo)
+    except Exception as e:
+        messages.append(f"{RED}✗ Error checking memory: {e}{RESET}")
+        return False, messages
+    
+    used_percent = summary["used_percent"]
+    messages.append(f"Memory usage: {used_percent:.1f}%")
+    messages.append(f"Swap usage: {summary['swap_used_percent']:.1f}%")
+    messages.append(f"Dirty: {format_bytes(summary['dirty'])}, Writeback: {format_bytes(summary['writeback'])}")
+    messages.append(f"Slab: {format_bytes(summary['slab'])} ({format_bytes(summary['slab_unreclaimable'])} unreclaimable)")
+    if summary["hugepages_total"]:
+        messages.append(f"HugePages: {summary['hugepages_free']}/{summary['hugepages_total']} free")
+    
+    gauges = []
+    for field, value in meminfo.items():
+        if field.startswith("HugePages_"):
+            gauges.append(("monitor_meminfo_hugepages", {"field": field}, value))
         else:
-            print(f"{YELLOW}⚠ Cannot check memory on this system{RESET}")
-            return True
+            gauges.append(("monitor_meminfo_bytes", {"field": field}, value))
     
-    except Exception as e:
-        print(f"{RED}✗ Error checking memory: {e}{RESET}")
-        return False
+    ok = True
+    if used_percent > CRITICAL_PERCENT:
+        messages.append(f"{RED}✗ CRITICAL: Memory usage very high!{RESET}")
+        ok = False
+    elif used_percent > WARNING_PERCENT or summary["swap_used_percent"] > CRITICAL_PERCENT:
+        messages.append(f"{YELLOW}⚠ WARNING: Memory usage high{RESET}")
+    else:
+        messages.append(f"{GREEN}✓ OK: Memory usage normal{RESET}")
+    return ok, messages, gauges
+
+
+# Kernel process names are cut to 15 characters (TASK_COMM_LEN - 1)
+COMM_MAX_LENGTH = 15
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def scan_processes(proc_dir="/proc"):
+    """
+    Build a process index with one walk of /proc.
+    
+    Each /proc/<pid>/stat already contains the process name (the same
+    value as /proc/<pid>/comm, which is what `pgrep -x` matches), so one
+    read per process is enough.
     
-    return True
+    Returns:
+        Dict of name -> {"pids": [...], "count", "rss_bytes", "cpu_ticks"}
+        where cpu_ticks is user + system time in clock ticks
+    """
+    index = {}
+    with os.scandir(proc_dir) as entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(f"{proc_dir}/{entry.name}/stat", "rb") as f:
+                    stat = f.read()
+            except OSError:
+                continue  # Process exited while we were scanning
+            
+            # Format: pid (name) state ppid ... - name may contain spaces or ')'
+            open_paren = stat.find(b"(")
+            close_paren = stat.rfind(b")")
+            if open_paren == -1 or close_paren == -1:
+                continue
+            name = stat[open_paren + 1:close_paren].decode(errors="replace")
+            fields = stat[close_paren + 2:].split()
+            # fields[0] is state (stat field 3): utime=14, stime=15, rss=24
+            utime, stime, rss_pages = int(fields[11]), int(fields[12]), int(fields[21])
+            
+            info = index.get(name)
+            if info is None:
+                info = index[name] = {"pids": [], "count": 0, "rss_bytes": 0, "cpu_ticks": 0}
+            info["pids"].append(int(entry.name))
+            info["count"] += 1
+            info["rss_bytes"] += rss_pages * PAGE_SIZE
+            info["cpu_ticks"] += utime + stime
+    return index
 
 
-def check_process(process_name):
-    """Check if a process is running."""
-    try:
-        result = subprocess.run(
-            ["pgrep", "-x", process_name],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode == 0:
-            pid_count = len(result.stdout.strip().split("\n"))
-            print(f"  {GREEN}✓{RESET} {process_name}: running ({pid_count} process{'es' if pid_count > 1 else ''})")
-            return True
-        else:
-            print(f"  {RED}✗{RESET} {process_name}: not running")
-            return False
+def check_process(process_name, inventory, messages):
+    """Check if a process is running, using an index from scan_processes()."""
+    info = inventory.get(process_name[:COMM_MAX_LENGTH])
     
-    except Exception as e:
-        print(f"  {RED}✗{RESET} Error checking {process_name}: {e}")
+    if info:
+        pid_count = info["count"]
+        cpu_seconds = info["cpu_ticks"] / CLOCK_TICKS
+        messages.append(
+            f"  {GREEN}✓{RESET} {process_name}: running ({pid_count} process{'es' if pid_count > 1 else ''}, "
+            f"RSS {format_bytes(info['rss_bytes'])}, CPU time {cpu_seconds:.1f}s)"
+        )
+        return True
+    else:
+        messages.append(f"  {RED}✗{RESET} {process_name}: not running")
         return False
 
 
-def check_services():
+# Common services to check (you can customize)
+DEFAULT_SERVICES = ["python3"]  # Using python3 as example since it's running this script
+
+
+@register_check("services", "SERVICE CHECK")
+def check_services(services=None):
     """Check if important services are running."""
-    print_header("SERVICE CHECK")
+    messages = []
+    
+    if not services:
+        services = DEFAULT_SERVICES
     
-    # Common services to check (you can customize)
-    services = ["python3"]  # Using python3 as example since it's running this script
+    try:
+        inventory = scan_processes()
+    except Exception as e:
+        messages.append(f"{RED}✗ Error scanning processes: {e}{RESET}")
+        return False, messages
     
     all_ok = True
+    gauges = []
     for service in services:
-        if not check_process(service):
+        if not check_process(service, inventory, messages):
             all_ok = False
+        info = inventory.get(service[:COMM_MAX_LENGTH])
+        labels = {"service": service}
+        gauges.append(("monitor_service_processes", labels, info["count"] if info else 0))
+        if info:
+            gauges.append(("monitor_service_rss_bytes", labels, info["rss_bytes"]))
+            gauges.append(("monitor_service_cpu_seconds_total", labels, info["cpu_ticks"] / CLOCK_TICKS))
+    
+    return all_ok, messages, gauges
+
+
+def read_cpu_times(stat_file="/proc/stat"):
+    """
+    Read aggregate CPU time counters (in clock ticks).
+    
+    Returns:
+        (busy, total) - guest time is already included in user time
+    """
+    with open(stat_file, "r") as f:
+        fields = f.readline().split()
+    # cpu user nice system idle iowait irq softirq steal [guest guest_nice]
+    values = [int(v) for v in fields[1:9]]
+    idle = values[3] + values[4]  # idle + iowait
+    total = sum(values)
+    return total - idle, total
+
+
+def read_network_counters(net_file="/proc/net/dev"):
+    """Read per-interface (rx_bytes, tx_bytes) counters."""
+    counters = {}
+    with open(net_file, "r") as f:
+        for line in f:
+            if ":" not in line:
+                continue  # Header lines
+            iface, data = line.split(":", 1)
+            fields = data.split()
+            counters[iface.strip()] = (int(fields[0]), int(fields[8]))
+    return counters
+
+
+def read_disk_io_counters(diskstats_file="/proc/diskstats", block_dir="/sys/block"):
+    """
+    Read per-device (read_bytes, written_bytes) counters.
+    
+    Only whole disks are included (devices listed in /sys/block), so
+    partitions are not counted twice. Loop and RAM devices are skipped.
+    """
+    counters = {}
+    with open(diskstats_file, "r") as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) < 10:
+                continue
+            name = fields[2]
+            if name.startswith(("loop", "ram")) or not os.path.exists(f"{block_dir}/{name}"):
+                continue
+            # diskstats sectors are always 512 bytes
+            counters[name] = (int(fields[5]) * 512, int(fields[9]) * 512)
+    return counters
+
+
+def _rates(current, previous, elapsed):
+    """Turn two {name: (a, b)} counter snapshots into per-second rates."""
+    rates = {}
+    for name, (a, b) in current.items():
+        if name not in previous:
+            continue  # New device/interface - no baseline yet
+        prev_a, prev_b = previous[name]
+        # Counters can reset (driver reload) - report 0 instead of a negative rate
+        rates[name] = (max(a - prev_a, 0) / elapsed, max(b - prev_b, 0) / elapsed)
+    return rates
+
+
+class SystemSampler:
+    """
+    Compute CPU utilisation and I/O rates from counter deltas.
+    
+    Every call to sample() reads the raw counters and compares them with
+    the previous call. The first sample has no baseline, so its rates are
+    None. The last `history` samples are kept in a ring buffer.
+    """
+    
+    def __init__(self, history=DEFAULT_HISTORY):
+        self.history = deque(maxlen=history)
+        self._previous = None
+        self._lock = threading.Lock()
+    
+    def sample(self):
+        """
+        Take a sample.
+        
+        Returns:
+            Dict with time, cpu_percent, network (iface -> (rx/s, tx/s))
+            and disk_io (device -> (read/s, write/s)) - rates in bytes/s
+        """
+        with self._lock:
+            now = time.monotonic()
+            cpu = read_cpu_times()
+            network = read_network_counters()
+            disk_io = read_disk_io_counters()
+            
+            sample = {"time": time.time(), "cpu_percent": None, "network": None, "disk_io": None}
+            if self._previous is not None:
+                prev_time, prev_cpu, prev_network, prev_disk_io = self._previous
+                elapsed = now - prev_time
+                busy_delta = cpu[0] - prev_cpu[0]
+                total_delta = cpu[1] - prev_cpu[1]
+                sample["cpu_percent"] = (busy_delta / total_delta * 100) if total_delta > 0 else 0.0
+                if elapsed > 0:
+                    sample["network"] = _rates(network, prev_network, elapsed)
+                    sample["disk_io"] = _rates(disk_io, prev_disk_io, elapsed)
+            
+            self._previous = (now, cpu, network, disk_io)
+            self.history.append(sample)
+            return sample
+
+
+@register_check("cpu", "CPU AND I/O CHECK")
+def check_cpu(sampler=None):
+    """
+    Check CPU utilisation and show network / disk I/O rates.
+    
+    In daemon mode the long-lived sampler is passed in and the delta is
+    taken since the previous tick. A one-shot run has no previous tick,
+    so it measures over CPU_SAMPLE_WINDOW seconds.
+    """
+    messages = []
+    
+    if not os.path.exists("/proc/stat"):
+        messages.append(f"{YELLOW}⚠ Cannot check CPU on this system{RESET}")
+        return True, messages
+    
+    try:
+        if sampler is None:
+            sampler = SystemSampler(history=2)
+        if not sampler.history:
+            sampler.sample()
+            time.sleep(CPU_SAMPLE_WINDOW)
+        sample = sampler.sample()
+    except Exception as e:
+        messages.append(f"{RED}✗ Error checking CPU: {e}{RESET}")
+        return False, messages
+    
+    for iface, (rx, tx) in sorted(sample["network"].items()):
+        messages.append(f"  net {iface}: rx {format_bytes(rx)}/s, tx {format_bytes(tx)}/s")
+    for device, (read, written) in sorted(sample["disk_io"].items()):
+        messages.append(f"  disk {device}: read {format_bytes(read)}/s, write {format_bytes(written)}/s")
+    
+    cpu_percent = sample["cpu_percent"]
+    gauges = [("monitor_cpu_usage_ratio", {}, cpu_percent / 100)]
+    for iface, (rx, tx) in sample["network"].items():
+        gauges.append(("monitor_network_receive_bytes_per_second", {"interface": iface}, rx))
+        gauges.append(("monitor_network_transmit_bytes_per_second", {"interface": iface}, tx))
+    for device, (read, written) in sample["disk_io"].items():
+        gauges.append(("monitor_disk_read_bytes_per_second", {"device": device}, read))
+        gauges.append(("monitor_disk_written_bytes_per_second", {"device": device}, written))
+    
+    ok = True
+    messages.append(f"CPU usage: {cpu_percent:.1f}%")
+    if cpu_percent > CRITICAL_PERCENT:
+        messages.append(f"{RED}✗ CRITICAL: CPU usage very high!{RESET}")
+        ok = False
+    elif cpu_percent > WARNING_PERCENT:
+        messages.append(f"{YELLOW}⚠ WARNING: CPU usage high{RESET}")
+    else:
+        messages.append(f"{GREEN}✓ OK: CPU usage normal{RESET}")
+    return ok, messages, gauges
+
+
+# Threads of checks that timed out and are still stuck: name -> thread
+_stuck_checks = {}
+
+
+def _run_one_check(name, func, kwargs, results_queue):
+    """Thread target: run one check and put its outcome on the queue."""
+    start = time.monotonic()
+    gauges = []
+    try:
+        result = func(**kwargs)
+        ok, messages = result[0], result[1]
+        if len(result) > 2:
+            gauges = result[2]
+    except Exception as e:
+        ok, messages = False, [f"{RED}✗ Check crashed: {e}{RESET}"]
+    results_queue.put((name, ok, messages, gauges, time.monotonic() - start))
+
+
+def run_checks(checks=None, check_timeout=DEFAULT_CHECK_TIMEOUT, run_budget=DEFAULT_RUN_BUDGET, options=None):
+    """
+    Run registered checks at the same time.
+    
+    Each check runs in a daemon thread. A check that does not finish
+    within its timeout (or before the run budget is used up) is marked
+    as TIMEOUT and left behind - daemon threads never block exit. While
+    a left-behind thread is still stuck, that check is not started again
+    (otherwise daemon mode would pile up one stuck thread per tick).
+    
+    Args:
+        checks: Dict like CHECKS (default: all registered checks)
+        check_timeout: Default per-check timeout in seconds
+        run_budget: Time budget for the whole run in seconds
+        options: Dict of name -> keyword arguments for that check
     
-    return all_ok
+    Returns:
+        Dict of name -> {"title", "ok", "messages", "gauges", "duration",
+        "timed_out"} in registration order
+    """
+    if checks is None:
+        checks = CHECKS
+    if options is None:
+        options = {}
+    
+    results_queue = queue.Queue()
+    started = time.monotonic()
+    run_deadline = started + run_budget
+    
+    deadlines = {}
+    threads = {}
+    finished = {}
+    pending = set()
+    for name, (title, func, timeout) in checks.items():
+        stuck = _stuck_checks.get(name)
+        if stuck is not None:
+            if stuck.is_alive():
+                finished[name] = (False, [f"{RED}✗ TIMEOUT: previous run is still stuck{RESET}"], [], 0.0, True)
+                continue
+            del _stuck_checks[name]
+        
+        limit = timeout if timeout is not None else check_timeout
+        deadlines[name] = min(started + limit, run_deadline)
+        thread = threading.Thread(
+            target=_run_one_check,
+            args=(name, func, options.get(name, {}), results_queue),
+            name=f"check-{name}",
+            daemon=True
+        )
+        thread.start()
+        threads[name] = thread
+        pending.add(name)
+    
+    while pending:
+        now = time.monotonic()
+        expired = [name for name in pending if deadlines[name] <= now]
+        for name in expired:
+            pending.discard(name)
+            _stuck_checks[name] = threads[name]
+            finished[name] = (False, [f"{RED}✗ TIMEOUT: no result after {now - started:.1f}s{RESET}"], [], now - started, True)
+        if not pending:
+            break
+        
+        wait = min(deadlines[name] for name in pending) - now
+        try:
+            name, ok, messages, gauges, duration = results_queue.get(timeout=max(wait, 0))
+        except queue.Empty:
+            continue
+        
+        # Late results from checks already marked TIMEOUT are dropped
+        if name in pending:
+            pending.discard(name)
+            finished[name] = (ok, messages, gauges, duration, False)
+    
+    results = {}
+    for name, (title, func, timeout) in checks.items():
+        ok, messages, gauges, duration, timed_out = finished[name]
+        results[name] = {
+            "title": title,
+            "ok": ok,
+            "messages": messages,
+            "gauges": gauges,
+            "duration": duration,
+            "timed_out": timed_out,
+        }
+    return results
 
 
-def generate_report(results):
+def generate_report(results, verbose=True):
     """Generate monitoring report file."""
     report_file = "/tmp/system_monitor_report.txt"
     
@@ -175,9 +840,8 @@ def generate_report(results):
             f.write("\n")
             
             f.write("RESULTS:\n")
-            f.write(f"  Disk Check: {'PASS' if results['disk'] else 'FAIL'}\n")
-            f.write(f"  Memory Check: {'PASS' if results['memory'] else 'FAIL'}\n")
-            f.write(f"  Services Check: {'PASS' if results['services'] else 'FAIL'}\n")
+            for check, status in results.items():
+                f.write(f"  {check.capitalize()} Check: {'PASS' if status else 'FAIL'}\n")
             f.write("\n")
             
             f.write("OVERALL STATUS: ")
@@ -186,7 +850,8 @@ def generate_report(results):
             else:
                 f.write("SOME CHECKS FAILED ✗\n")
         
-        print(f"\n{GREEN}✓{RESET} Report saved to: {report_file}")
+        if verbose:
+            print(f"\n{GREEN}✓{RESET} Report saved to: {report_file}")
         return True
     
     except Exception as e:
@@ -194,27 +859,207 @@ def generate_report(results):
         return False
 
 
+def _escape_label_value(value):
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_metrics(check_results, openmetrics=False):
+    """
+    Render check results and their gauges as a Prometheus text page.
+    
+    Args:
+        check_results: Output of run_checks()
+        openmetrics: Render OpenMetrics 1.0 instead of Prometheus 0.0.4
+    
+    Returns:
+        The page as bytes (ready to send)
+    """
+    families = {}
+    for name, check in check_results.items():
+        labels = {"check": name}
+        families.setdefault("monitor_check_ok", []).append((labels, 1 if check["ok"] else 0))
+        families.setdefault("monitor_check_duration_seconds", []).append((labels, check["duration"]))
+        families.setdefault("monitor_check_timed_out", []).append((labels, 1 if check["timed_out"] else 0))
+        for metric, metric_labels, value in check["gauges"]:
+            families.setdefault(metric, []).append((metric_labels, value))
+    families["monitor_last_run_timestamp_seconds"] = [({}, time.time())]
+    
+    lines = []
+    for metric, samples in families.items():
+        metric_type, help_text = METRIC_HELP.get(metric, ("gauge", metric))
+        family = metric
+        if openmetrics and metric_type == "counter" and metric.endswith("_total"):
+            family = metric[:-len("_total")]  # OpenMetrics names the family without _total
+        lines.append(f"# HELP {family} {help_text}")
+        lines.append(f"# TYPE {family} {metric_type}")
+        for labels, value in samples:
+            if labels:
+                label_text = ",".join(f'{key}="{_escape_label_value(val)}"' for key, val in labels.items())
+                lines.append(f"{metric}{{{label_text}}} {value}")
+            else:
+                lines.append(f"{metric} {value}")
+    if openmetrics:
+        lines.append("# EOF")
+    return ("\n".join(lines) + "\n").encode()
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+class MetricsHandler(http.server.BaseHTTPRequestHandler):
+    """Serve the pre-rendered metrics page - never runs checks."""
+    
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404, "Try /metrics")
+            return
+        
+        pages = self.server.pages  # (prometheus, openmetrics) - swapped atomically
+        if pages is None:
+            self.send_error(503, "No results yet")
+            return
+        
+        if "application/openmetrics-text" in self.headers.get("Accept", ""):
+            body, content_type = pages[1], OPENMETRICS_CONTENT_TYPE
+        else:
+            body, content_type = pages[0], PROMETHEUS_CONTENT_TYPE
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass  # One log line per scrape would flood the daemon's output
+
+
+def start_metrics_server(port, address=""):
+    """Start the /metrics HTTP server in a background thread."""
+    server = http.server.ThreadingHTTPServer((address, port), MetricsHandler)
+    server.daemon_threads = True
+    server.pages = None
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    return server
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Simple system monitoring script")
+    parser.add_argument("--check-timeout", type=float, default=DEFAULT_CHECK_TIMEOUT,
+                        help=f"seconds before a single check times out (default: {DEFAULT_CHECK_TIMEOUT})")
+    parser.add_argument("--budget", type=float, default=DEFAULT_RUN_BUDGET,
+                        help=f"time budget for the whole run in seconds (default: {DEFAULT_RUN_BUDGET})")
+    parser.add_argument("--mount", action="append", metavar="PATTERN",
+                        help="only check mountpoints matching this pattern (repeatable)")
+    parser.add_argument("--exclude-mount", action="append", metavar="PATTERN",
+                        help="skip mountpoints matching this pattern (repeatable)")
+    parser.add_argument("--service", action="append", metavar="NAME",
+                        help=f"process name that must be running (repeatable, default: {' '.join(DEFAULT_SERVICES)})")
+    parser.add_argument("--daemon", action="store_true",
+                        help="keep running and re-check every --interval seconds")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help=f"seconds between checks in daemon mode (default: {DEFAULT_INTERVAL})")
+    parser.add_argument("--history", type=int, default=DEFAULT_HISTORY,
+                        help=f"number of recent samples kept in daemon mode (default: {DEFAULT_HISTORY})")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="serve Prometheus metrics on this port (daemon mode only)")
+    parser.add_argument("--metrics-address", default="", metavar="ADDR",
+                        help="address for the metrics server (default: all interfaces)")
+    args = parser.parse_args()
+    if args.metrics_port is not None and not args.daemon:
+        parser.error("--metrics-port requires --daemon")
+    if args.interval <= 0:
+        parser.error("--interval must be greater than 0")
+    return args
+
+
+def run_daemon(args, options):
+    """
+    Run checks every args.interval seconds until SIGTERM or Ctrl+C.
+    
+    Ticks are scheduled on a fixed grid (start + n * interval). If a tick
+    runs late, missed ticks are skipped instead of run back to back.
+    """
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    
+    sampler = SystemSampler(history=args.history)
+    sampler.sample()  # Baseline for the first tick's deltas
+    options["cpu"] = {"sampler": sampler}
+    
+    # A run must finish before the next tick starts
+    run_budget = min(args.budget, args.interval)
+    
+    server = None
+    if args.metrics_port is not None:
+        server = start_metrics_server(args.metrics_port, args.metrics_address)
+        print(f"{BOLD}Serving metrics on http://{args.metrics_address or '0.0.0.0'}:{args.metrics_port}/metrics{RESET}")
+    
+    print(f"{BOLD}Daemon mode: checking every {args.interval:g}s (Ctrl+C to stop){RESET}")
+    next_tick = time.monotonic() + min(args.interval, 1.0)
+    try:
+        while not stop.wait(max(next_tick - time.monotonic(), 0)):
+            check_results = run_checks(check_timeout=args.check_timeout, run_budget=run_budget, options=options)
+            results = {name: check["ok"] for name, check in check_results.items()}
+            generate_report(results, verbose=False)
+            if server is not None:
+                server.pages = (render_metrics(check_results), render_metrics(check_results, openmetrics=True))
+            
+            status = " ".join(
+                f"{name} {GREEN + '✓' if ok else RED + '✗'}{RESET}" for name, ok in results.items()
+            )
+            latest = sampler.history[-1]
+            cpu = f"cpu {latest['cpu_percent']:.1f}%" if latest["cpu_percent"] is not None else "cpu n/a"
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {status}  ({cpu})")
+            for name, check in check_results.items():
+                if not check["ok"]:
+                    for line in check["messages"]:
+                        print(f"    {line}")
+            
+            next_tick += args.interval
+            now = time.monotonic()
+            if next_tick < now:
+                skipped = int((now - next_tick) // args.interval) + 1
+                next_tick += skipped * args.interval
+    except KeyboardInterrupt:
+        pass
+    if server is not None:
+        server.shutdown()
+    print(f"\n{BOLD}Monitoring stopped{RESET}")
+
+
 def main():
     """Main monitoring function."""
+    args = parse_args()
+    
     print(f"\n{BOLD}{'=' * 60}{RESET}")
     print(f"{BOLD}SYSTEM MONITORING SCRIPT{RESET}")
     print(f"{BOLD}Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{RESET}")
     print(f"{BOLD}{'=' * 60}{RESET}")
     
-    # Run all checks
-    results = {}
+    # Run all checks at the same time
+    options = {
+        "disk": {"include": args.mount, "exclude": args.exclude_mount},
+        "services": {"services": args.service},
+    }
     
-    # Disk check
-    disk_ok, disk_usage = check_disk_space()
-    results['disk'] = disk_ok
+    if args.daemon:
+        run_daemon(args, options)
+        sys.exit(0)
     
-    # Memory check
-    memory_ok = check_memory()
-    results['memory'] = memory_ok
+    check_results = run_checks(check_timeout=args.check_timeout, run_budget=args.budget, options=options)
     
-    # Services check
-    services_ok = check_services()
-    results['services'] = services_ok
+    # Print output in registration order (not completion order)
+    results = {}
+    for name, check in check_results.items():
+        print_header(check["title"])
+        for line in check["messages"]:
+            print(line)
+        print(f"  (took {check['duration']:.2f}s)")
+        results[name] = check["ok"]
     
     # Generate report
     print_header("GENERATING REPORT")
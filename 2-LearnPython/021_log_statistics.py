@@ -0,0 +1,883 @@
+#!/usr/bin/env python3
+"""
+Log Statistics for Big Files
+
+WHAT: Count log levels in multi-GB log files quickly
+WHERE: Daily log reports, incident reviews, alert tuning
+WHY: Text-mode line-by-line loops (see 009_reading_files.py) spend most
+     of their time decoding every line - too slow for 5-20 GB per day
+
+REAL-WORLD SCENARIO:
+- How many ERRORs did the app log yesterday?
+- When did the error rate spike (errors per 5 minutes)?
+- Compare WARNING counts between two days
+
+HOW IT WORKS:
+- The file is read in binary, in big chunks, with readinto() into one
+  preallocated buffer (no new string per line, no decoding)
+- Each chunk is cut at its last newline; the partial line is carried
+  over to the start of the buffer for the next read
+- Level words are counted with bytes.count() - a C loop over the whole
+  chunk, once per level. Like `"ERROR" in line` it is a substring test,
+  but it counts every occurrence (a line that says ERROR twice counts 2)
+- For time windows, logs are time-ordered, so the lines of one minute
+  are one contiguous region: a binary search over line starts finds where
+  each minute ends, and the level counts run per region. Only one
+  timestamp per region is looked at, not one per line. Lines without a
+  timestamp (stack traces) count towards the minute before them.
+
+PARALLEL MODE:
+- File arguments are glob patterns; rotated siblings (app.log.1,
+  app.log.2, ...) are picked up too and scanned oldest first
+- Big files are split into byte ranges (--range-size). Each worker in a
+  ProcessPoolExecutor owns the lines that START inside its range, so
+  ranges never split or double count a line
+- Per-range counters and matching lines (--find) are merged in file and
+  offset order, so the output is the same for any number of workers
+
+COMPRESSED LOGS:
+- Compression is detected from the first bytes of the file (not the
+  name): gzip, bzip2 and xz use the standard library, zstd needs the
+  'zstandard' package (pip3 install zstandard)
+- Data is decompressed in chunks straight into the line scanner - no
+  temp files, memory stays at one buffer
+- gzip files made of many members (bgzip, `pigz -i`, or `cat a.gz b.gz`)
+  are split at member boundaries and decompressed in parallel. Each
+  worker checks that its members join up with the next worker's; if they
+  don't (e.g. a normal single-member .gz), the file is read sequentially
+
+HOW TO RUN:
+    python3 021_log_statistics.py                      # demo with sample log
+    python3 021_log_statistics.py /var/log/app.log
+    python3 021_log_statistics.py app.log --window 5   # rates per 5 minutes
+    python3 021_log_statistics.py '/var/log/app/*.log' --jobs 8 --find ERROR
+    python3 021_log_statistics.py /var/log/nginx/access.log.2.gz
+"""
+
+import argparse
+import bz2
+import glob
+import gzip
+import lzma
+import os
+import re
+import sys
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# zstd support is optional
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+# Read 8 MiB at a time - big enough to amortise syscalls, small enough for cache
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+LEVELS = ("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG")
+LEVEL_TOKENS = tuple((level, level.encode()) for level in LEVELS)
+
+# "YYYY-MM-DD HH:MM" at the start of a line (16 bytes)
+MINUTE_PATTERN = re.compile(rb"^\d{4}-\d\d-\d\d[ T]\d\d:\d\d", re.MULTILINE)
+MINUTE_LENGTH = 16
+MINUTE_FORMAT = "%Y-%m-%d %H:%M"
+
+# Below this many bytes a linear scan beats the binary search
+LINEAR_SCAN_BYTES = 4096
+
+# Parallel mode: bytes per work item, and matching lines kept per item
+DEFAULT_RANGE_SIZE = 64 * 1024 * 1024
+DEFAULT_MAX_MATCHES = 1000
+
+# Compression formats by their first bytes
+MAGIC_BYTES = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+COMPRESSED_EXTENSIONS = (".gz", ".bz2", ".xz", ".zst")
+
+# gzip member header: magic + deflate method
+GZIP_MEMBER_HEADER = b"\x1f\x8b\x08"
+# How far past a split point to look for the next gzip member
+GZIP_SEARCH_BYTES = 1024 * 1024
+COMPRESSED_BLOCK = 1024 * 1024
+
+
+def iter_line_chunks(f, chunk_size=DEFAULT_CHUNK_SIZE, leftover=None):
+    """
+    Read a binary file object in chunks that end on a line boundary.
+
+    Args:
+        f: File object opened in binary mode (anything with readinto())
+        chunk_size: Buffer size in bytes
+        leftover: Optional list - if given, a last line without a trailing
+            newline is appended to it instead of being yielded
+
+    Yields:
+        (buffer, end) - buffer[:end] contains only complete lines.
+        The same buffer is reused: process it before the next iteration.
+    """
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    filled = 0  # Bytes carried over from the previous chunk
+
+    while True:
+        read = f.readinto(view[filled:])
+        if not read:
+            break
+        filled += read
+
+        end = buffer.rfind(b"\n", 0, filled) + 1
+        if end == 0:
+            if filled == len(buffer):
+                # A single line is longer than the buffer - grow it
+                view.release()
+                buffer.extend(bytes(len(buffer)))
+                view = memoryview(buffer)
+            continue
+
+        yield buffer, end
+
+        # Move the partial last line to the front of the buffer
+        tail = filled - end
+        if tail:
+            buffer[:tail] = buffer[end:filled]
+        filled = tail
+
+    view.release()
+    if filled and leftover is not None:
+        leftover.append(bytes(buffer[:filled]))
+    elif filled:
+        # Last line without a trailing newline
+        if filled == len(buffer):
+            buffer.append(10)
+        else:
+            buffer[filled] = 10
+        yield buffer, filled + 1
+
+
+def _next_stamped_line(buffer, pos, end):
+    """
+    Find the first line at or after pos (a line start) with a timestamp.
+
+    Returns:
+        (line_start, minute_bytes), or (end, None) if there is none
+    """
+    match = MINUTE_PATTERN.search(buffer, pos, end)
+    if match is None:
+        return end, None
+    return match.start(), match.group()
+
+
+def _minute_region_end(buffer, pos, minute, end):
+    """
+    Find where the run of lines stamped `minute` that starts at pos ends.
+
+    Galloping search (probe 4 KB, 8 KB, 16 KB ... ahead) to bracket the
+    end, then binary search over line starts. Assumes the log is
+    time-ordered. Cost grows with log(region size), not chunk size.
+    """
+    answer = end
+    low, high = pos, end
+    step = LINEAR_SCAN_BYTES
+    while low + step < end:
+        newline = buffer.find(b"\n", low + step, end)
+        if newline == -1:
+            break
+        line_start, stamp = _next_stamped_line(buffer, newline + 1, end)
+        if stamp is None:
+            high = newline + 1      # Only unstamped lines after the probe
+            break
+        if stamp != minute:
+            answer = high = line_start
+            break
+        low = line_start
+        step *= 2
+
+    while high - low > LINEAR_SCAN_BYTES:
+        middle = (low + high) // 2
+        newline = buffer.find(b"\n", middle, high)
+        if newline == -1:
+            high = middle
+            continue
+        line_start, stamp = _next_stamped_line(buffer, newline + 1, high)
+        if stamp is None:
+            high = newline + 1      # Only unstamped lines after middle
+        elif stamp == minute:
+            low = line_start        # Still the same minute
+        else:
+            answer = high = line_start
+
+    # Finish with a linear scan of the remaining lines
+    line_start, stamp = _next_stamped_line(buffer, low, high)
+    while stamp is not None:
+        if stamp != minute:
+            return line_start
+        newline = buffer.find(b"\n", line_start, high)
+        line_start, stamp = _next_stamped_line(buffer, newline + 1, high)
+    return answer
+
+
+def count_buffer(buffer, start, end, stats, last_minute=b""):
+    """
+    Count lines and levels in buffer[start:end] (whole lines only).
+
+    Args:
+        buffer: Bytes-like object
+        start, end: Byte range, aligned to line starts
+        stats: Stats dict from new_stats(), updated in place
+        last_minute: Minute of the line before `start` (for unstamped lines)
+
+    Returns:
+        Minute of the last timestamped line (pass it to the next call)
+    """
+    stats["lines"] += buffer.count(b"\n", start, end)
+    stats["bytes"] += end - start
+    levels = stats["levels"]
+    minutes = stats["minutes"]
+
+    pos = start
+    minute = last_minute
+    while pos < end:
+        line_start, stamp = _next_stamped_line(buffer, pos, end)
+        if line_start > pos:
+            region_end = line_start           # Unstamped lines: previous minute
+        else:
+            minute = stamp
+            region_end = _minute_region_end(buffer, pos, minute, end)
+
+        for level, token in LEVEL_TOKENS:
+            found = buffer.count(token, pos, region_end)
+            if found:
+                levels[level] += found
+                minutes[minute, level] += found
+        pos = region_end
+    return minute
+
+
+def find_lines(buffer, start, end, token, base_offset=0, limit=DEFAULT_MAX_MATCHES):
+    """
+    Find lines in buffer[start:end] that contain token.
+
+    Args:
+        buffer: Bytes-like object
+        start, end: Byte range, aligned to line starts
+        token: Bytes to look for (e.g. b"ERROR")
+        base_offset: File offset of buffer[0] (for reporting)
+        limit: Stop after this many matches
+
+    Returns:
+        List of (file_offset, line_text)
+    """
+    matches = []
+    pos = buffer.find(token, start, end)
+    while pos != -1 and len(matches) < limit:
+        line_start = buffer.rfind(b"\n", start, pos) + 1 or start
+        line_end = buffer.find(b"\n", pos, end)
+        if line_end == -1:
+            line_end = end
+        text = bytes(buffer[line_start:line_end]).decode(errors="replace")
+        matches.append((base_offset + line_start, text))
+        pos = buffer.find(token, line_end, end)
+    return matches
+
+
+def new_stats():
+    """Create an empty statistics dict."""
+    return {"lines": 0, "bytes": 0, "levels": Counter(), "minutes": Counter(),
+            "last_minute": b"", "matches": []}
+
+
+def merge_stats(total, part, continuation=False):
+    """
+    Add the counts of one stats dict to another (in place).
+
+    Args:
+        continuation: True if part comes right after total in the same
+            file - part's lines before its first timestamp then belong
+            to total's last minute
+    """
+    total["lines"] += part["lines"]
+    total["bytes"] += part["bytes"]
+    total["levels"].update(part["levels"])
+    if continuation and total["last_minute"]:
+        for (minute, level), count in part["minutes"].items():
+            total["minutes"][minute or total["last_minute"], level] += count
+    else:
+        total["minutes"].update(part["minutes"])
+    total["last_minute"] = part["last_minute"] or total["last_minute"]
+    total["matches"].extend(part["matches"])
+    return total
+
+
+def scan_stream(f, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Count log levels in an open binary file object.
+
+    Returns:
+        Stats dict: lines, bytes, levels (level -> count) and
+        minutes ((minute_bytes, level) -> count, minute b"" if unknown)
+    """
+    return scan_stream_matches(f, chunk_size)
+
+
+def scan_stream_matches(f, chunk_size=DEFAULT_CHUNK_SIZE, find=None, base_offset=0,
+                        max_matches=DEFAULT_MAX_MATCHES, partial_edges=False):
+    """
+    Like scan_stream(), also collecting lines that contain `find` (bytes).
+
+    Args:
+        partial_edges: The stream may start and end in the middle of a
+            line. The bytes up to the first newline are returned in
+            stats["head"] (None if there is no newline at all) and the
+            bytes after the last newline in stats["tail"], uncounted.
+    """
+    stats = new_stats()
+    minute = b""
+    offset = base_offset
+    tail = [] if partial_edges else None
+    head = None if partial_edges else b""
+    for buffer, end in iter_line_chunks(f, chunk_size, tail):
+        start = 0
+        if head is None:
+            start = buffer.find(b"\n", 0, end) + 1
+            head = bytes(buffer[:start])
+        minute = count_buffer(buffer, start, end, stats, minute)
+        if find and len(stats["matches"]) < max_matches:
+            limit = max_matches - len(stats["matches"])
+            stats["matches"].extend(find_lines(buffer, start, end, find, offset, limit))
+        offset += end
+    stats["last_minute"] = minute
+    if partial_edges:
+        stats["head"] = head
+        stats["tail"] = tail[0] if tail else b""
+    return stats
+
+
+def detect_compression(path):
+    """
+    Detect the compression format from the file's first bytes.
+
+    Returns:
+        "gzip", "bz2", "xz", "zstd" or None for plain files
+    """
+    with open(path, "rb") as f:
+        head = f.read(6)
+    for magic, name in MAGIC_BYTES:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def open_log(path, compression="detect"):
+    """
+    Open a log file for binary reading, decompressing on the fly.
+
+    The returned object supports readinto(), so it can go straight into
+    iter_line_chunks().
+    """
+    if compression == "detect":
+        compression = detect_compression(path)
+    if compression is None:
+        return open(path, "rb", buffering=0)
+    if compression == "gzip":
+        return gzip.open(path, "rb")
+    if compression == "bz2":
+        return bz2.open(path, "rb")
+    if compression == "xz":
+        return lzma.open(path, "rb")
+    if not HAS_ZSTD:
+        raise RuntimeError(f"{path} is zstd-compressed - install: pip3 install zstandard")
+    return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True, closefd=True)
+
+
+def scan_file(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Count log levels in a file (plain or compressed). See scan_stream()."""
+    with open_log(path) as f:
+        return scan_stream(f, chunk_size)
+
+
+class _GzipMembersReader:
+    """
+    Decompress consecutive gzip members, starting at byte `start`.
+
+    Stops after the member that ends at or after `stop` - the next
+    worker starts there. member_end is the compressed offset where the
+    last decompressed member ended.
+    """
+
+    def __init__(self, f, start, stop):
+        self.f = f
+        self.stop = stop
+        self.member_end = start
+        self.output_bytes = 0
+        f.seek(start)
+        self._input_offset = start   # File offset of self._input[0]
+        self._input = b""
+        self._decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        self._member_started = False
+        self._pending = b""
+        self._pending_pos = 0
+        self._done = False
+
+    def _fill(self):
+        """Decompress more input into self._pending."""
+        if not self._input:
+            self._input = self.f.read(COMPRESSED_BLOCK)
+            if not self._input:
+                if self._member_started:
+                    raise EOFError("gzip member is truncated")
+                self._done = True
+                return
+        if not self._member_started:
+            if len(self._input) < 2:
+                self._input += self.f.read(COMPRESSED_BLOCK)
+            if not self._input.startswith(b"\x1f\x8b"):
+                self._done = True  # Trailing padding after the last member
+                return
+            self._member_started = True
+
+        data, self._input = self._input, b""
+        self._pending = self._decompressor.decompress(data)
+        self._pending_pos = 0
+        if self._decompressor.eof:
+            rest = self._decompressor.unused_data
+            self.member_end = self._input_offset + len(data) - len(rest)
+            self._input_offset = self.member_end
+            self._input = rest
+            self._decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            self._member_started = False
+            if self.member_end >= self.stop:
+                self._done = True
+        else:
+            self._input_offset += len(data)
+
+    def readinto(self, buffer):
+        while self._pending_pos >= len(self._pending):
+            if self._done:
+                return 0
+            self._fill()
+        size = min(len(buffer), len(self._pending) - self._pending_pos)
+        buffer[:size] = self._pending[self._pending_pos:self._pending_pos + size]
+        self._pending_pos += size
+        self.output_bytes += size
+        return size
+
+
+def _is_gzip_member_start(f, offset):
+    """Check that a gzip member starts at offset by decompressing a little of it."""
+    f.seek(offset)
+    data = f.read(64 * 1024)
+    if not data.startswith(GZIP_MEMBER_HEADER) or data[3] & 0xE0:
+        return False  # Reserved flag bits must be zero
+    try:
+        zlib.decompressobj(zlib.MAX_WBITS | 16).decompress(data, 64 * 1024)
+    except zlib.error:
+        return False
+    return True
+
+
+def _find_gzip_member(f, offset, limit):
+    """Return the first offset in [offset, limit) where a gzip member starts, or None."""
+    f.seek(offset)
+    window = f.read(limit - offset + len(GZIP_MEMBER_HEADER))
+    pos = window.find(GZIP_MEMBER_HEADER)
+    while pos != -1 and offset + pos < limit:
+        if _is_gzip_member_start(f, offset + pos):
+            return offset + pos
+        pos = window.find(GZIP_MEMBER_HEADER, pos + 1)
+    return None
+
+
+def plan_gzip_members(path, size, range_size=DEFAULT_RANGE_SIZE):
+    """
+    Split a gzip file into (start, stop) ranges that begin on member starts.
+
+    Returns a single range when no member start is found near the split
+    points (a normal single-member .gz file).
+    """
+    starts = [0]
+    with open(path, "rb") as f:
+        for split in range(range_size, size, range_size):
+            if split <= starts[-1]:
+                continue
+            member = _find_gzip_member(f, split, min(split + GZIP_SEARCH_BYTES, size))
+            if member is not None:
+                starts.append(member)
+    return list(zip(starts, starts[1:] + [size]))
+
+
+def scan_gzip_members(path, start, stop, chunk_size=DEFAULT_CHUNK_SIZE, find=None,
+                      max_matches=DEFAULT_MAX_MATCHES):
+    """
+    Scan the gzip members of a file from `start` up to `stop`.
+
+    Runs in a worker. Match offsets are relative to this part's
+    decompressed data; scan_files() turns them into file offsets.
+
+    Returns:
+        Stats dict with head/tail, member_start, member_end and
+        output_bytes - or {"error": message} if start was not a member
+    """
+    with open(path, "rb") as f:
+        reader = _GzipMembersReader(f, start, stop)
+        try:
+            stats = scan_stream_matches(reader, chunk_size, find, 0, max_matches, partial_edges=True)
+        except (zlib.error, EOFError) as e:
+            return {"error": str(e)}
+    stats["member_start"] = start
+    stats["member_end"] = reader.member_end
+    stats["output_bytes"] = reader.output_bytes
+    return stats
+
+
+def _merge_gzip_parts(parts, find, max_matches):
+    """
+    Join the parts of a parallel gzip scan.
+
+    A line cut between two parts is rebuilt from the first part's tail
+    and the next part's head, then counted.
+
+    Returns:
+        Stats dict, or None if the parts do not join up (fall back to a
+        sequential scan)
+    """
+    total = new_stats()
+    expected_start = 0
+    carry = b""          # Unfinished line from the previous parts
+    output_offset = 0    # Decompressed offset of the current part's data
+    for part in parts:
+        if "error" in part or part["member_start"] != expected_start:
+            return None
+        expected_start = part["member_end"]
+
+        if part["head"] is None:
+            carry += part["tail"]       # No newline in this whole part
+        else:
+            line = carry + part["head"]
+            if line:
+                joined = new_stats()
+                joined["last_minute"] = count_buffer(line, 0, len(line), joined, total["last_minute"])
+                if find:
+                    joined["matches"] = find_lines(line, 0, len(line), find, output_offset - len(carry), max_matches)
+                merge_stats(total, joined, continuation=True)
+            part["matches"] = [(offset + output_offset, text) for offset, text in part["matches"]]
+            merge_stats(total, part, continuation=True)
+            carry = part["tail"]
+        output_offset += part["output_bytes"]
+
+    if carry:
+        line = carry + b"\n"
+        joined = new_stats()
+        joined["last_minute"] = count_buffer(line, 0, len(line), joined, total["last_minute"])
+        if find:
+            joined["matches"] = find_lines(line, 0, len(line), find, output_offset - len(carry), max_matches)
+        merge_stats(total, joined, continuation=True)
+    return total
+
+
+class _RangeReader:
+    """File wrapper whose readinto() stops after `length` bytes."""
+
+    def __init__(self, f, length):
+        self.f = f
+        self.remaining = length
+
+    def readinto(self, buffer):
+        if self.remaining <= 0:
+            return 0
+        with memoryview(buffer) as view:
+            read = self.f.readinto(view[:self.remaining])
+        self.remaining -= read
+        return read
+
+
+def _line_start_at_or_after(f, offset):
+    """Return the offset of the first line that starts at or after offset."""
+    if offset == 0:
+        return 0
+    f.seek(offset - 1)
+    position = offset - 1
+    while True:
+        block = f.read(64 * 1024)
+        if not block:
+            return position  # End of file
+        newline = block.find(b"\n")
+        if newline != -1:
+            return position + newline + 1
+        position += len(block)
+
+
+def open_range(path, start, end):
+    """
+    Open the lines of a plain file that start in the byte range [start, end).
+
+    Returns:
+        (reader with readinto() for iter_line_chunks(), file offset of
+        its first byte). Close the reader's .f when done.
+    """
+    f = open(path, "rb", buffering=0)
+    first = _line_start_at_or_after(f, start)
+    last = _line_start_at_or_after(f, end)
+    f.seek(first)
+    return _RangeReader(f, max(last - first, 0)), first
+
+
+def scan_range(path, start, end, chunk_size=DEFAULT_CHUNK_SIZE, find=None, max_matches=DEFAULT_MAX_MATCHES):
+    """
+    Scan the lines of a file that start in the byte range [start, end).
+
+    Runs in a worker process, so it only takes and returns picklable data.
+    """
+    reader, first = open_range(path, start, end)
+    with reader.f:
+        return scan_stream_matches(reader, chunk_size, find, first, max_matches)
+
+
+def _rotation_key(path):
+    """Sort key: base name, then oldest rotation first (app.log.2.gz, app.log.1, app.log)."""
+    if path.endswith(COMPRESSED_EXTENSIONS):
+        path = path.rsplit(".", 1)[0]
+    base, _, suffix = path.rpartition(".")
+    if base and suffix.isdigit():
+        return (base, -int(suffix))
+    return (path, 0)
+
+
+def expand_log_files(patterns):
+    """
+    Expand glob patterns into log files, including rotated siblings.
+
+    Returns:
+        Sorted list of paths, rotated files oldest first
+    """
+    paths = set()
+    for pattern in patterns:
+        for candidate in glob.glob(pattern) + glob.glob(pattern + ".[0-9]*"):
+            if os.path.isfile(candidate):
+                paths.add(candidate)
+    return sorted(paths, key=_rotation_key)
+
+
+def plan_ranges(paths, range_size=DEFAULT_RANGE_SIZE):
+    """
+    Split files into (kind, path, start, end) work items of about range_size bytes.
+
+    kind is "lines" for plain files (split anywhere, aligned to lines by
+    the worker), "gzip-members" for gzip files with several members, and
+    "stream" for other compressed files (one item, read sequentially).
+    """
+    work = []
+    for path in paths:
+        size = os.path.getsize(path)
+        compression = detect_compression(path)
+        if compression is None:
+            for start in range(0, max(size, 1), range_size):
+                work.append(("lines", path, start, min(start + range_size, size)))
+        elif compression == "gzip" and size > range_size:
+            members = plan_gzip_members(path, size, range_size)
+            kind = "gzip-members" if len(members) > 1 else "stream"
+            for start, stop in members:
+                work.append((kind, path, start, stop))
+        else:
+            work.append(("stream", path, 0, size))
+    return work
+
+
+def scan_work_item(kind, path, start, end, chunk_size=DEFAULT_CHUNK_SIZE, find=None,
+                   max_matches=DEFAULT_MAX_MATCHES):
+    """Run one work item from plan_ranges() (in a worker process)."""
+    if kind == "lines":
+        return scan_range(path, start, end, chunk_size, find, max_matches)
+    if kind == "gzip-members":
+        return scan_gzip_members(path, start, end, chunk_size, find, max_matches)
+    with open_log(path) as f:
+        return scan_stream_matches(f, chunk_size, find, 0, max_matches)
+
+
+def scan_files(paths, jobs=None, range_size=DEFAULT_RANGE_SIZE, chunk_size=DEFAULT_CHUNK_SIZE,
+               find=None, max_matches=DEFAULT_MAX_MATCHES):
+    """
+    Scan many files in parallel.
+
+    Args:
+        paths: Files in the order they should be merged
+        jobs: Worker processes (default: CPU count, 1 = no pool)
+        range_size: Bytes per work item
+        chunk_size: Read buffer size per worker
+        find: Optional bytes - collect lines that contain it
+        max_matches: Matching lines kept per work item
+
+    Returns:
+        Dict of path -> stats, in the order of paths
+    """
+    work = plan_ranges(paths, range_size)
+    chunk_size = min(chunk_size, range_size)
+    args = [item + (chunk_size, find, max_matches) for item in work]
+
+    if jobs == 1 or len(work) == 1:
+        parts = [scan_work_item(*item) for item in args]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            # map() returns results in submission order - deterministic merge
+            parts = list(pool.map(scan_work_item, *zip(*args)))
+
+    results = {path: new_stats() for path in paths}
+    gzip_parts = {}
+    for (kind, path, start, end), part in zip(work, parts):
+        if kind == "gzip-members":
+            gzip_parts.setdefault(path, []).append(part)
+        else:
+            merge_stats(results[path], part, continuation=True)
+
+    for path, file_parts in gzip_parts.items():
+        merged = _merge_gzip_parts(file_parts, find, max_matches)
+        if merged is None:
+            # Members did not join up - not really a multi-member file
+            with open_log(path, "gzip") as f:
+                merged = scan_stream_matches(f, chunk_size, find, 0, max_matches)
+        results[path] = merged
+    return results
+
+
+def level_rates(stats, window_minutes=1):
+    """
+    Group per-minute counts into time windows.
+
+    Args:
+        stats: Output of scan_file()
+        window_minutes: Window size in minutes
+
+    Returns:
+        Sorted list of (window_start_datetime, Counter of level -> count).
+        Lines without a timestamp are not included.
+    """
+    window_seconds = window_minutes * 60
+    windows = {}
+    parsed = {}  # Decode each distinct minute only once
+    for (minute, level), count in stats["minutes"].items():
+        if not minute:
+            continue
+        if minute not in parsed:
+            moment = datetime.strptime(minute.decode().replace("T", " "), MINUTE_FORMAT)
+            bucket = int(moment.timestamp()) // window_seconds * window_seconds
+            parsed[minute] = datetime.fromtimestamp(bucket)
+        windows.setdefault(parsed[minute], Counter())[level] += count
+    return sorted(windows.items())
+
+
+def print_stats(stats, window_minutes=None, elapsed=None):
+    """Print a statistics report."""
+    print("Log Statistics:")
+    print(f"  Lines: {stats['lines']:,}")
+    for level in LEVELS:
+        if stats["levels"][level]:
+            print(f"  {level}: {stats['levels'][level]:,}")
+
+    if elapsed:
+        mb = stats["bytes"] / (1024 * 1024)
+        print(f"  Scanned {mb:.1f} MB in {elapsed:.2f}s ({mb / elapsed:.1f} MB/s)")
+
+    if window_minutes:
+        print(f"\nRates per {window_minutes} minute(s):")
+        for start, counts in level_rates(stats, window_minutes):
+            summary = ", ".join(
+                f"{level} {counts[level] / window_minutes:.1f}/min" for level in LEVELS if counts[level]
+            )
+            print(f"  {start.strftime(MINUTE_FORMAT)}  {summary}")
+
+
+def create_sample_log(path, lines=200_000):
+    """Write a sample log file for the demo."""
+    levels = ["INFO"] * 7 + ["WARNING"] * 2 + ["ERROR"]
+    with open(path, "w") as f:
+        for i in range(lines):
+            second = i // 40  # 40 lines per second
+            level = levels[i % len(levels)]
+            f.write(f"2026-01-27 {10 + second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d} "
+                    f"{level} request {i} handled\n")
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Count log levels in large log files")
+    parser.add_argument("files", nargs="*", help="log files or glob patterns (default: generated sample)")
+    parser.add_argument("--window", type=int, metavar="MINUTES",
+                        help="also show rates per time window of this many minutes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"read buffer size in bytes (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--range-size", type=int, default=DEFAULT_RANGE_SIZE,
+                        help=f"bytes per parallel work item (default: {DEFAULT_RANGE_SIZE})")
+    parser.add_argument("--find", metavar="TEXT",
+                        help="also list lines containing TEXT (e.g. ERROR)")
+    parser.add_argument("--max-matches", type=int, default=DEFAULT_MAX_MATCHES,
+                        help=f"matching lines to show (default: {DEFAULT_MAX_MATCHES})")
+    return parser.parse_args()
+
+
+def main():
+    """Scan files given on the command line (or a sample log)."""
+    args = parse_args()
+
+    files = args.files
+    window = args.window
+    if not files:
+        sample = "/tmp/test_devops_sample.log"
+        create_sample_log(sample)
+        print(f"Created sample log: {sample}\n")
+        files = [sample]
+        window = window or 10
+
+    paths = expand_log_files(files)
+    if not paths:
+        print(f"✗ No files match: {' '.join(files)}")
+        sys.exit(1)
+
+    find = args.find.encode() if args.find else None
+    start = time.perf_counter()
+    results = scan_files(paths, args.jobs, args.range_size, args.chunk_size, find, args.max_matches)
+    elapsed = time.perf_counter() - start
+
+    total = new_stats()
+    for path, stats in results.items():
+        print(f"File: {path}")
+        print_stats(stats, window)
+        print("-" * 50)
+        merge_stats(total, stats)
+
+    if len(paths) > 1:
+        print(f"TOTAL ({len(paths)} files):")
+        print_stats(total)
+        print("-" * 50)
+    mb = total["bytes"] / (1024 * 1024)
+    print(f"Scanned {mb:.1f} MB in {elapsed:.2f}s ({mb / elapsed:.1f} MB/s) with {args.jobs} worker(s)")
+
+    if find:
+        print(f"\nLines containing {args.find!r}:")
+        shown = 0
+        for path, stats in results.items():
+            for offset, text in stats["matches"]:
+                if shown == args.max_matches:
+                    break
+                print(f"  {path}:{offset}: {text}")
+                shown += 1
+
+    # DevOps Pro Tip
+    print("\n" + "=" * 50)
+    print("💡 For big files, work in bytes, not lines!")
+    print("   Open with 'rb' and read big chunks with readinto()")
+    print("   Let C loops like bytes.count() do the per-line work")
+    print("   Decode only what you print")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
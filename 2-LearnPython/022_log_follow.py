@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Follow Logs Incrementally (tail -F with memory)
+
+WHAT: Process only the bytes appended to a log since the last run
+WHERE: Cron jobs and agents that alert on new ERROR lines
+WHY: Re-scanning a 10 GB log every minute to find a few new lines
+     wastes minutes of I/O - remember where you stopped instead
+
+REAL-WORLD SCENARIO:
+- Cron job every minute: "any new ERRORs in app.log since last time?"
+- Long-running watcher that prints new ERROR lines as they are written
+- Survive logrotate: finish the rotated file, then start the new one
+
+HOW IT WORKS:
+- A small JSON state file stores, per log: device, inode and the byte
+  offset of the first unprocessed line. It is written atomically
+  (temp file + os.replace) after each pass
+- Each pass seeks to the offset and reads only the new bytes, in chunks,
+  with the scanner from 021_log_statistics.py. A half-written last line
+  is left for the next pass
+- Rotation: if the inode changed, the rest of the old file is read from
+  its rotated name (same inode, e.g. app.log.1) before the new file is
+  read from byte 0. If the file got smaller (copytruncate), it is read
+  again from the start
+- Follow mode waits for changes with inotify (Linux) and falls back to
+  polling elsewhere
+- Lines are processed before the state is saved, so after a crash some
+  lines may be reported twice, but none are lost
+
+HOW TO RUN:
+    python3 022_log_follow.py                          # demo
+    python3 022_log_follow.py /var/log/app.log --once  # cron: new lines since last run
+    python3 022_log_follow.py /var/log/app.log         # follow until Ctrl+C
+    python3 022_log_follow.py app.log --find ERROR --state /var/lib/myjob/offsets.json
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import importlib
+import json
+import os
+import select
+import sys
+import time
+
+log_statistics = importlib.import_module("021_log_statistics")
+
+DEFAULT_STATE_FILE = os.path.expanduser("~/.log_follow_state.json")
+DEFAULT_POLL_INTERVAL = 1.0
+
+# inotify event flags (from <sys/inotify.h>)
+IN_MODIFY = 0x002
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+
+
+def load_state(state_file):
+    """Load saved offsets (empty dict if there is no state yet)."""
+    try:
+        with open(state_file, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError:
+        print(f"⚠️  State file {state_file} is corrupt - starting from scratch")
+        return {}
+
+
+def save_state(state_file, state):
+    """Write the state atomically - readers never see a half-written file."""
+    directory = os.path.dirname(os.path.abspath(state_file))
+    os.makedirs(directory, exist_ok=True)
+    temp_file = f"{state_file}.tmp.{os.getpid()}"
+    with open(temp_file, "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, state_file)
+
+
+def read_new_lines(path, offset, on_chunk, chunk_size=log_statistics.DEFAULT_CHUNK_SIZE):
+    """
+    Read complete lines from offset to the end of the file.
+
+    Args:
+        path: File to read
+        offset: Byte offset to start at (must be a line start)
+        on_chunk: Called as on_chunk(buffer, end, file_offset) for each
+            chunk of complete lines
+        chunk_size: Read buffer size
+
+    Returns:
+        New offset - just after the last complete line
+    """
+    leftover = []
+    with open(path, "rb", buffering=0) as f:
+        f.seek(offset)
+        for buffer, end in log_statistics.iter_line_chunks(f, chunk_size, leftover):
+            on_chunk(buffer, end, offset)
+            offset += end
+    return offset  # A partial last line (in leftover) waits for the next pass
+
+
+def _find_rotated(path, inode, device):
+    """Find the rotated copy of path (same inode), e.g. app.log.1."""
+    directory = os.path.dirname(path) or "."
+    prefix = os.path.basename(path) + "."
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return None
+    for name in names:
+        if not name.startswith(prefix):
+            continue
+        candidate = os.path.join(directory, name)
+        try:
+            st = os.stat(candidate)
+        except OSError:
+            continue
+        if st.st_ino == inode and st.st_dev == device:
+            return candidate
+    return None
+
+
+def process_file(path, state, on_chunk):
+    """
+    Process the lines appended to path since the saved offset.
+
+    Args:
+        path: Log file
+        state: State dict, updated in place
+        on_chunk: Callback for chunks of new lines (see read_new_lines())
+
+    Returns:
+        Number of new bytes processed
+    """
+    key = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return 0  # Between rotation and creation of the new file
+
+    saved = state.get(key)
+    offset = 0
+    processed = 0
+    if saved is not None:
+        if (saved["inode"], saved["device"]) != (st.st_ino, st.st_dev):
+            # Rotated: finish the old file first, if we can still find it
+            rotated = _find_rotated(path, saved["inode"], saved["device"])
+            if rotated is not None:
+                end = read_new_lines(rotated, saved["offset"], on_chunk)
+                processed += end - saved["offset"]
+                print(f"  ↻ {path} was rotated to {rotated} - finished it, starting new file")
+            else:
+                print(f"  ↻ {path} was rotated - old file is gone, starting new file")
+        elif st.st_size < saved["offset"]:
+            print(f"  ✂ {path} was truncated - reading from the start")
+        else:
+            offset = saved["offset"]
+
+    if st.st_size > offset:
+        end = read_new_lines(path, offset, on_chunk)
+        processed += end - offset
+        offset = end
+
+    state[key] = {"inode": st.st_ino, "device": st.st_dev, "offset": offset}
+    return processed
+
+
+class LineHandler:
+    """Count levels and print matching lines for every new chunk."""
+
+    def __init__(self, path, find=None, quiet=False):
+        self.path = path
+        self.find = find
+        self.quiet = quiet
+        self.stats = log_statistics.new_stats()
+
+    def __call__(self, buffer, end, file_offset):
+        log_statistics.count_buffer(buffer, 0, end, self.stats)
+        if self.find:
+            for offset, text in log_statistics.find_lines(buffer, 0, end, self.find, file_offset, limit=sys.maxsize):
+                if not self.quiet:
+                    print(f"  {self.path}:{offset}: {text}")
+
+
+class InotifyWatcher:
+    """Wait for changes in the log directories using Linux inotify."""
+
+    def __init__(self, directories):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_MODIFY | IN_CREATE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+        for directory in directories:
+            # Watch the directory, not the file, so rotation is seen too
+            if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout):
+        """Block until something changes (or timeout). Returns True on change."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        while True:
+            try:
+                if not os.read(self.fd, 64 * 1024):
+                    break
+            except BlockingIOError:
+                break  # All queued events drained
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollWatcher:
+    """Fallback watcher: just sleep between passes."""
+
+    def __init__(self, interval=DEFAULT_POLL_INTERVAL):
+        self.interval = interval
+
+    def wait(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        return True
+
+    def close(self):
+        pass
+
+
+def make_watcher(paths, poll_interval=DEFAULT_POLL_INTERVAL):
+    """Use inotify when available, otherwise polling."""
+    directories = sorted({os.path.dirname(os.path.abspath(path)) for path in paths})
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directories)
+        except (OSError, AttributeError) as e:
+            print(f"⚠️  inotify not available ({e}) - polling every {poll_interval}s")
+    return PollWatcher(poll_interval)
+
+
+def run_pass(paths, state, handlers):
+    """Process new lines of every file once. Returns bytes processed."""
+    total = 0
+    for path in paths:
+        total += process_file(path, state, handlers[path])
+    return total
+
+
+def print_summary(handlers):
+    """Print level counts of new lines per file."""
+    for path, handler in handlers.items():
+        stats = handler.stats
+        levels = ", ".join(f"{level} {stats['levels'][level]}" for level in log_statistics.LEVELS
+                           if stats["levels"][level])
+        print(f"  {path}: {stats['lines']} new line(s){' - ' + levels if levels else ''}")
+
+
+def follow(paths, state_file, find=None, poll_interval=DEFAULT_POLL_INTERVAL):
+    """Follow files until Ctrl+C, saving offsets after every pass."""
+    state = load_state(state_file)
+    handlers = {path: LineHandler(path, find) for path in paths}
+    watcher = make_watcher(paths, poll_interval)
+    print(f"Following {len(paths)} file(s) with {type(watcher).__name__} (Ctrl+C to stop)")
+    try:
+        while True:
+            if run_pass(paths, state, handlers):
+                save_state(state_file, state)
+            # Timeout: re-check now and then even without events (NFS, missed events)
+            watcher.wait(30)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        save_state(state_file, state)
+    print("\nStopped. New lines seen:")
+    print_summary(handlers)
+
+
+def run_once(paths, state_file, find=None):
+    """Process lines added since the last run and exit (cron mode)."""
+    state = load_state(state_file)
+    handlers = {path: LineHandler(path, find) for path in paths}
+    processed = run_pass(paths, state, handlers)
+    save_state(state_file, state)
+    print(f"Processed {processed} new byte(s):")
+    print_summary(handlers)
+    return handlers
+
+
+def demo():
+    """Show resume and rotation handling on a sample log."""
+    log_file = "/tmp/test_devops_follow/app.log"
+    state_file = "/tmp/test_devops_follow/state.json"
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    for old in (log_file, log_file + ".1", state_file):
+        if os.path.exists(old):
+            os.remove(old)
+
+    print("Run 1: new log file")
+    with open(log_file, "w") as f:
+        f.write("2026-01-27 10:00:00 INFO Server started\n")
+        f.write("2026-01-27 10:01:00 ERROR Connection timeout\n")
+    run_once([log_file], state_file, b"ERROR")
+    print("-" * 50)
+
+    print("Run 2: two lines appended (plus a half-written one)")
+    with open(log_file, "a") as f:
+        f.write("2026-01-27 10:02:00 INFO Request completed\n")
+        f.write("2026-01-27 10:03:00 ERROR Database unreachable\n")
+        f.write("2026-01-27 10:04:00 WARN")
+    run_once([log_file], state_file, b"ERROR")
+    print("-" * 50)
+
+    print("Run 3: line finished, then logrotate moves the file")
+    with open(log_file, "a") as f:
+        f.write("ING Disk space low\n")
+    os.rename(log_file, log_file + ".1")
+    with open(log_file, "w") as f:
+        f.write("2026-01-27 10:05:00 ERROR Disk full\n")
+    run_once([log_file], state_file, b"ERROR")
+    print("-" * 50)
+
+    print("Run 4: nothing new")
+    run_once([log_file], state_file, b"ERROR")
+
+    print("\nState file:")
+    with open(state_file, "r") as f:
+        print(f.read())
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Process only new log lines, surviving rotation")
+    parser.add_argument("files", nargs="*", help="log files (default: run the demo)")
+    parser.add_argument("--once", action="store_true",
+                        help="process new lines since the last run and exit (for cron)")
+    parser.add_argument("--state", default=DEFAULT_STATE_FILE,
+                        help=f"offset state file (default: {DEFAULT_STATE_FILE})")
+    parser.add_argument("--find", default="ERROR", metavar="TEXT",
+                        help="print new lines containing TEXT (default: ERROR, '' to disable)")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                        help="seconds between checks when inotify is not available")
+    return parser.parse_args()
+
+
+def main():
+    """Follow files, run once, or show the demo."""
+    args = parse_args()
+
+    if not args.files:
+        demo()
+    else:
+        find = args.find.encode() if args.find else None
+        if args.once:
+            run_once(args.files, args.state, find)
+        else:
+            follow(args.files, args.state, find, args.poll_interval)
+
+    # DevOps Pro Tip
+    print("\n" + "=" * 50)
+    print("💡 Never re-read what you already processed!")
+    print("   Save offset + inode after each pass")
+    print("   Inode changed = rotated, size shrank = truncated")
+    print("   Write state files atomically with os.replace()")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
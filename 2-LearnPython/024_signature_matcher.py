@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+"""
+Match Hundreds of Alert Signatures in One Pass
+
+WHAT: Find which of many error signatures (text or regex) each log line matches
+WHERE: Log alerting, incident triage, known-issue detection
+WHY: `"ERROR" in line` (009_reading_files.py) or one re.search() per
+     pattern (018_regex_basics.py) is fine for 5 patterns. With 400
+     patterns, looping over every pattern for every line is 400 scans
+     per line - the alert job can't keep up with the logs
+
+REAL-WORLD SCENARIO:
+- 400 known-issue signatures: "connection refused", "OOM killer", ...
+- Tag each log line with every signature it matches
+- Count hits per signature for the daily alert report
+
+HOW IT WORKS:
+- Plain-text signatures go into a trie (prefix tree) that is turned into
+  ONE regex: "conn(?:ection refused|ect timeout)". The regex engine walks
+  the trie in C, so a line that matches nothing costs one pass, not 400
+- Every regex signature usually contains a fixed piece of text that any
+  match must include (e.g. " refused" in r"port \\d+ refused"). That
+  "anchor" goes into the same trie, so the regex only runs on lines
+  containing its anchor
+- Regexes without an anchor are joined into one alternation (a|b|c)
+- The combined regexes run over a whole chunk of text and jump from one
+  candidate line to the next. Candidate lines are checked exactly: an
+  Aho-Corasick automaton finds all plain-text hits (also overlapping
+  ones like "timeout" inside "connect timeout"), then only the regexes
+  whose anchors were found are run
+
+SIGNATURE FILE (JSON):
+    [
+      {"name": "db-refused", "pattern": "connection refused"},
+      {"name": "slow-query", "pattern": "query took \\\\d{4,}ms", "regex": true},
+      {"name": "oom", "pattern": "out of memory", "ignore_case": true}
+    ]
+
+HOW TO RUN:
+    python3 024_signature_matcher.py                             # demo + benchmark
+    python3 024_signature_matcher.py /var/log/app.log --signatures rules.json
+    python3 024_signature_matcher.py '/var/log/app/*.log' --signatures rules.json --show 20
+"""
+
+import argparse
+import importlib
+import json
+import re
+import sys
+import time
+from collections import Counter, deque
+
+log_statistics = importlib.import_module("021_log_statistics")
+
+# Anchors shorter than this match too many lines to be worth it
+MIN_ANCHOR_LENGTH = 3
+
+# Characters that end a run of literal text in a regex
+REGEX_SPECIAL = set(".^$*+?{}[]()|\\")
+QUANTIFIERS = set("*?{")
+
+# Escapes that stand for one literal character
+LITERAL_ESCAPES = set(".^$*+?{}[]()|\\/-#&~ \"'")
+
+# Numbered or named backreferences break when patterns are combined
+BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+# Global inline flags like (?i) or (?x) change how the whole pattern
+# matches - its plain text can't be used as an anchor
+INLINE_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+
+
+def literal_anchor(pattern):
+    """
+    Find the longest piece of plain text that every match must contain.
+
+    Only looks at the top level of the pattern: text inside groups or
+    before a quantifier (x*, x?, x{0,3}) is optional or ambiguous.
+    Patterns with global inline flags ((?i), (?x), ...) have no anchor.
+
+    Returns:
+        The anchor text, or None if there is no usable anchor
+    """
+    if INLINE_FLAGS.search(pattern):
+        return None  # (?i)abc also matches "ABC", (?x) ignores spaces
+    best = ""
+    run = []
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if in_class:
+            if char == "\\":
+                i += 1
+            elif char == "]":
+                in_class = False
+            i += 1
+            continue
+
+        literal = None
+        if char == "\\" and i + 1 < len(pattern):
+            if pattern[i + 1] in LITERAL_ESCAPES:
+                literal = pattern[i + 1]
+            step = 2
+        elif char == "|" and depth == 0:
+            return None  # Top-level alternation: nothing is required
+        elif char not in REGEX_SPECIAL:
+            literal = char
+            step = 1
+        else:
+            step = 1
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+            elif char == "[":
+                in_class = True
+            elif char == "{":
+                step = max(pattern.find("}", i) + 1 - i, 1)  # Skip {m,n}
+
+        if literal is not None and depth == 0:
+            following = pattern[i + step] if i + step < len(pattern) else ""
+            if following in QUANTIFIERS:
+                literal = None  # "x?" or "x*": the character is optional
+            elif following == "+":
+                run.append(literal)  # "x+": one x is required, then the run ends
+                literal = None
+        if literal is None or depth != 0:
+            if len(run) > len(best):
+                best = "".join(run)
+            run = []
+        else:
+            run.append(literal)
+        i += step
+
+    if len(run) > len(best):
+        best = "".join(run)
+    return best if len(best) >= MIN_ANCHOR_LENGTH else None
+
+
+def trie_regex(words):
+    """
+    Build one regex that matches any of the words, shaped like a trie.
+
+    ["connect timeout", "connection refused"] becomes
+    "connect(?:\\ timeout|ion\\ refused)" - shared prefixes are tested once.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of a word
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = "(?:" + body + ")?"  # A word may end here
+        return body
+
+    return build(trie)
+
+
+class AhoCorasick:
+    """Find every occurrence of many words in one pass over the text."""
+
+    def __init__(self, words):
+        self.goto = [{}]      # State -> {char: next state}
+        self.fail = [0]       # State -> longest proper suffix state
+        self.output = [[]]    # State -> indexes of words ending here
+        for index, word in enumerate(words):
+            state = 0
+            for char in word:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append(index)
+
+        # Breadth-first: set failure links and merge outputs of suffixes
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find_all(self, text):
+        """Return the set of word indexes that occur in text."""
+        goto, fail, output = self.goto, self.fail, self.output
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class SignatureMatcher:
+    """Match log lines against many plain-text and regex signatures at once."""
+
+    def __init__(self, signatures):
+        """
+        Args:
+            signatures: List of dicts with "name" and "pattern", and
+                optionally "regex": true and "ignore_case": true
+        """
+        self.names = [signature["name"] for signature in signatures]
+        needles = {}                 # Text to find -> needle index
+        self.needle_literals = []    # Needle index -> signatures that are this literal
+        self.needle_regexes = []     # Needle index -> [(signature, compiled regex)]
+        self.unanchored = []         # [(signature, compiled regex, source)]
+
+        for index, signature in enumerate(signatures):
+            pattern = signature["pattern"]
+            is_regex = signature.get("regex", False)
+            ignore_case = signature.get("ignore_case", False)
+            if not is_regex and not ignore_case:
+                needle = self._needle(needles, pattern)
+                self.needle_literals[needle].append(index)
+                continue
+
+            source = pattern if is_regex else re.escape(pattern)
+            flags = re.IGNORECASE if ignore_case else 0
+            compiled = re.compile(source, flags)
+            anchor = None if ignore_case else literal_anchor(source)
+            if anchor is not None:
+                needle = self._needle(needles, anchor)
+                self.needle_regexes[needle].append((index, compiled))
+            else:
+                self.unanchored.append((index, compiled, f"(?i:{source})" if ignore_case else f"(?:{source})"))
+
+        words = list(needles)
+        self.automaton = AhoCorasick(words)
+        self.literal_prefilter = re.compile(trie_regex(words)) if words else None
+        self.regex_prefilter = None
+        combinable = [source for _, _, source in self.unanchored if not BACKREFERENCE.search(source)]
+        if self.unanchored and len(combinable) == len(self.unanchored):
+            try:
+                self.regex_prefilter = re.compile("|".join(combinable), re.MULTILINE)
+            except re.error:
+                pass  # e.g. global flags inside a pattern: check each line instead
+
+    def _needle(self, needles, text):
+        """Index of a needle, adding it if new."""
+        if text not in needles:
+            needles[text] = len(needles)
+            self.needle_literals.append([])
+            self.needle_regexes.append([])
+        return needles[text]
+
+    def match_line(self, line):
+        """
+        Return the names of all signatures that match line (in signature order).
+        """
+        matched = []
+        for needle in self.automaton.find_all(line):
+            matched.extend(self.needle_literals[needle])
+            for index, compiled in self.needle_regexes[needle]:
+                if compiled.search(line):
+                    matched.append(index)
+        for index, compiled, _ in self.unanchored:
+            if compiled.search(line):
+                matched.append(index)
+        return [self.names[index] for index in sorted(matched)]
+
+    def _next_candidate(self, prefilter, text, pos):
+        """Start of the next match of prefilter at or after pos (len(text) if none)."""
+        if prefilter is None:
+            return len(text)
+        match = prefilter.search(text, pos)
+        return match.start() if match else len(text)
+
+    def scan_text(self, text):
+        """
+        Find matching lines in a block of complete lines.
+
+        Yields:
+            (line_start, line, names) for every line with at least one match
+        """
+        if self.unanchored and self.regex_prefilter is None:
+            # Can't prefilter these regexes: every line is a candidate
+            for line_start, line in _iter_lines(text):
+                names = self.match_line(line)
+                if names:
+                    yield line_start, line, names
+            return
+
+        pos = 0
+        next_literal = next_regex = -1
+        while pos < len(text):
+            if next_literal < pos:
+                next_literal = self._next_candidate(self.literal_prefilter, text, pos)
+            if next_regex < pos:
+                next_regex = self._next_candidate(self.regex_prefilter, text, pos)
+            candidate = min(next_literal, next_regex)
+            if candidate >= len(text):
+                break
+
+            line_start = text.rfind("\n", 0, candidate) + 1
+            line_end = text.find("\n", candidate)
+            if line_end == -1:
+                line_end = len(text)
+            line = text[line_start:line_end]
+            names = self.match_line(line)
+            if names:
+                yield line_start, line, names
+            pos = line_end + 1  # A line is reported once, however many hits it has
+
+
+def _iter_lines(text):
+    """Yield (line_start, line) for every line in text."""
+    pos = 0
+    for line in text.splitlines():
+        yield pos, line
+        pos += len(line) + 1
+
+
+def scan_files(paths, matcher, show=0, chunk_size=log_statistics.DEFAULT_CHUNK_SIZE):
+    """
+    Count signature hits in log files (plain or compressed).
+
+    Returns:
+        (hits Counter by signature name, list of (path, line, names) samples)
+    """
+    hits = Counter()
+    samples = []
+    for path in paths:
+        with log_statistics.open_log(path) as f:
+            for buffer, end in log_statistics.iter_line_chunks(f, chunk_size):
+                text = buffer[:end].decode("utf-8", errors="replace")
+                for _, line, names in matcher.scan_text(text):
+                    hits.update(names)
+                    if len(samples) < show:
+                        samples.append((path, line, names))
+    return hits, samples
+
+
+def load_signatures(path):
+    """Load and check a JSON signature file."""
+    with open(path, "r") as f:
+        signatures = json.load(f)
+    seen = set()
+    for number, signature in enumerate(signatures, 1):
+        if "name" not in signature or "pattern" not in signature:
+            raise ValueError(f"{path}: signature #{number} needs 'name' and 'pattern'")
+        if signature["name"] in seen:
+            raise ValueError(f"{path}: duplicate signature name {signature['name']!r}")
+        seen.add(signature["name"])
+    return signatures
+
+
+def naive_match_line(signatures, compiled, line):
+    """The one-pattern-at-a-time approach, for comparison."""
+    matched = []
+    for signature, pattern in zip(signatures, compiled):
+        if pattern is None:
+            if signature["pattern"] in line:
+                matched.append(signature["name"])
+        elif pattern.search(line):
+            matched.append(signature["name"])
+    return matched
+
+
+def create_sample_signatures(count=400):
+    """Build a realistic set of alert signatures for the demo."""
+    subjects = ["connection", "database", "disk", "memory", "upstream", "certificate", "replica",
+                "queue", "token", "socket", "cache", "lock", "quota", "worker", "session"]
+    problems = ["refused", "timeout", "full", "exhausted", "expired", "lagging", "corrupted",
+                "rejected", "unavailable", "deadlock", "overflow", "throttled", "reset", "denied"]
+    signatures = []
+    for subject in subjects:
+        for problem in problems:
+            signatures.append({"name": f"{subject}-{problem}", "pattern": f"{subject} {problem}"})
+    signatures.append({"name": "timeout-any", "pattern": "timeout"})  # Overlaps many others
+    signatures.append({"name": "oom", "pattern": "out of memory", "ignore_case": True})
+    signatures.append({"name": "slow-query", "pattern": r"query took \d{4,}ms", "regex": True})
+    signatures.append({"name": "http-5xx", "pattern": r"status=5\d\d", "regex": True})
+    signatures.append({"name": "ticket-ref", "pattern": r"\b[A-Z]{3,}-\d{4}\b", "regex": True})
+    for number in range(count - len(signatures)):
+        signatures.append({"name": f"port-{number}-refused", "regex": True,
+                           "pattern": rf"port {8000 + number} (?:refused|closed)"})
+    return signatures[:count]
+
+
+def create_sample_log(path, lines=100_000):
+    """Write a log where about 1 line in 50 matches a signature."""
+    problems = [
+        "ERROR connection refused by db-01",
+        "ERROR database timeout after 30s",
+        "ERROR Out Of Memory: killed worker 7",
+        "WARNING query took 12345ms on orders",
+        "ERROR upstream returned status=502",
+        "ERROR see INC-1234 - disk full on /var",
+        "ERROR port 8042 refused by firewall",
+        "WARNING connect timeout to cache-02",
+    ]
+    with open(path, "w") as f:
+        for i in range(lines):
+            if i % 50 == 0:
+                message = problems[i // 50 % len(problems)]
+            else:
+                message = f"INFO request {i} handled in {i % 300}ms user=alice path=/api/v1/items status=200"
+            f.write(f"2026-01-27 10:{i // 6000 % 60:02d}:{i // 100 % 60:02d} {message}\n")
+
+
+def benchmark(signatures, sample):
+    """Compare one-pattern-at-a-time with the combined matcher."""
+    with open(sample, "r") as f:
+        text = f.read()
+    lines = text.splitlines()
+    size_mb = len(text) / (1024 * 1024)
+
+    start = time.perf_counter()
+    compiled = [
+        re.compile(s["pattern"] if s.get("regex") else re.escape(s["pattern"]),
+                   re.IGNORECASE if s.get("ignore_case") else 0)
+        if s.get("regex") or s.get("ignore_case") else None
+        for s in signatures
+    ]
+    naive = {}
+    for number, line in enumerate(lines):
+        names = naive_match_line(signatures, compiled, line)
+        if names:
+            naive[number] = names
+    naive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = SignatureMatcher(signatures)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    combined = {}
+    number = position = 0
+    for line_start, _, names in matcher.scan_text(text):
+        number += text.count("\n", position, line_start)  # Line number from offset
+        position = line_start
+        combined[number] = names
+    combined_time = time.perf_counter() - start
+
+    print(f"Benchmark: {len(signatures)} signatures, {len(lines):,} lines ({size_mb:.1f} MB)")
+    print(f"  One pattern at a time:  {naive_time:6.2f}s ({size_mb / naive_time:6.1f} MB/s)")
+    print(f"  SignatureMatcher:       {combined_time:6.2f}s ({size_mb / combined_time:6.1f} MB/s)"
+          f"  - {naive_time / combined_time:.0f}x faster, built in {build_time * 1000:.0f}ms")
+    if matcher.unanchored:
+        print(f"  ({len(matcher.unanchored)} regex(es) have no fixed text to anchor on - they cost the most)")
+    if naive == combined:
+        print(f"  ✓ Same result: {len(combined)} matching lines")
+    else:
+        print(f"  ✗ Results differ ({len(naive)} vs {len(combined)} matching lines)")
+    return matcher
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Match log lines against many alert signatures")
+    parser.add_argument("files", nargs="*", help="log files or glob patterns (default: demo)")
+    parser.add_argument("--signatures", metavar="FILE", help="JSON signature file")
+    parser.add_argument("--show", type=int, default=10, metavar="N",
+                        help="show the first N matching lines (default: 10)")
+    parser.add_argument("--top", type=int, default=20, help="signatures to list (default: 20)")
+    return parser.parse_args()
+
+
+def main():
+    """Scan files with a signature file, or run the demo."""
+    args = parse_args()
+
+    if args.files:
+        if not args.signatures:
+            print("✗ --signatures FILE is required when scanning files")
+            sys.exit(1)
+        try:
+            signatures = load_signatures(args.signatures)
+            matcher = SignatureMatcher(signatures)
+        except (OSError, ValueError, re.error) as e:
+            print(f"✗ Bad signature file: {e}")
+            sys.exit(1)
+        paths = log_statistics.expand_log_files(args.files)
+        if not paths:
+            print(f"✗ No files match: {' '.join(args.files)}")
+            sys.exit(1)
+    else:
+        signatures = create_sample_signatures()
+        signature_file = "/tmp/test_devops_signatures.json"
+        with open(signature_file, "w") as f:
+            json.dump(signatures, f, indent=2)
+        sample = "/tmp/test_devops_signatures.log"
+        create_sample_log(sample)
+        print(f"Created {signature_file} and {sample}\n")
+
+        line = "2026-01-27 10:00:00 ERROR connect timeout: connection refused on port 8001"
+        print(f"Line: {line}")
+        print(f"Matches: {SignatureMatcher(signatures).match_line(line)}")
+        print("-" * 50)
+        print("Inline flags: (?i) and (?x) change what the plain text matches")
+        flagged = [
+            ("(?i)connection refused", "Connection Refused here"),
+            ("(?x) disk full", "ERROR diskfull on /var"),
+            ("(?x) disk \\s full", "ERROR disk full on /var"),
+        ]
+        for pattern, text in flagged:
+            found = SignatureMatcher([{"name": "flagged", "pattern": pattern, "regex": True}]).match_line(text)
+            expected = bool(re.search(pattern, text))
+            status = "✓" if bool(found) == expected else "✗"
+            print(f"  {status} {pattern!r:<28} on {text!r}: {'match' if found else 'no match'}")
+        print("-" * 50)
+        matcher = benchmark(signatures, sample)
+        print("-" * 50)
+        paths = [sample]
+
+    start = time.perf_counter()
+    hits, samples = scan_files(paths, matcher, args.show)
+    elapsed = time.perf_counter() - start
+    print(f"Scanned {len(paths)} file(s) in {elapsed:.2f}s")
+
+    if samples:
+        print(f"\nFirst {len(samples)} matching lines:")
+        for path, line, names in samples:
+            print(f"  {line}")
+            print(f"    → {', '.join(names)}")
+    print(f"\nTop {args.top} signatures:")
+    for name, count in hits.most_common(args.top):
+        print(f"  {name:<30} {count}")
+    if not hits:
+        print("  ✓ No signature matched")
+
+    # DevOps Pro Tip
+    print("\n" + "=" * 50)
+    print("💡 Many patterns? Combine them, don't loop over them!")
+    print("   Build one regex (or automaton) from all patterns")
+    print("   Run it over big chunks to skip clean lines fast")
+    print("   Check only the candidate lines exactly")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Top Talkers: Which Clients Send the Most Requests?
+
+WHAT: Count requests per client IP (or per /24, /64 network) in big logs
+WHERE: DDoS and scraper investigations, rate-limit tuning, capacity reports
+WHY: re.search() + ipaddress per line (see Example 4 in 018_regex_basics.py)
+     takes minutes for tens of millions of lines, and \\d{1,3} happily
+     accepts "999.1.1.1"
+
+REAL-WORLD SCENARIO:
+- "Top 20 client IPs in today's access logs"
+- Is the traffic from one /24 (a single hosting provider)?
+- IPv6 clients rotate addresses inside their /64 - count the /64
+
+HOW IT WORKS:
+- Chunks of the log (plain or compressed, reader from
+  021_log_statistics.py) go through ONE regex findall() - the client IP
+  is the first field of each line, or (--anywhere) every IP-looking token
+- Plain files are split into byte ranges counted by worker processes
+  (--jobs), like 021_log_statistics.py
+- Raw tokens are counted with Counter.update() (a C loop). Logs have
+  millions of lines but usually only thousands of distinct clients
+- Only the distinct tokens are validated with socket.inet_pton() (strict:
+  no "999.1.1.1", no "010.1.1.1") and packed into integers: IPv4 in a
+  uint32 array, IPv6 in two uint64 arrays (high and low 64 bits).
+  "::ffff:1.2.3.4" is counted as 1.2.3.4
+- CIDR bucketing is a bit mask over the whole array; counts per network
+  are summed with NumPy (np.unique + np.bincount) if it's installed,
+  otherwise by sorting the arrays and adding up runs of equal keys
+
+HOW TO RUN:
+    python3 025_top_talkers.py                                  # demo
+    python3 025_top_talkers.py /var/log/nginx/access.log --top 20
+    python3 025_top_talkers.py 'access.log*' --cidr4 24 --cidr6 64
+    python3 025_top_talkers.py /var/log/auth.log --anywhere     # IPs anywhere in the line
+
+NumPy is optional (pip3 install numpy) - it makes the aggregation faster.
+"""
+
+import argparse
+import heapq
+import importlib
+import ipaddress
+import os
+import re
+import socket
+import sys
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+# NumPy is optional
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+log_statistics = importlib.import_module("021_log_statistics")
+
+# First field of every line (nginx/Apache $remote_addr)
+FIRST_FIELD = re.compile(rb"^[^ \n]+", re.MULTILINE)
+
+# Anything that looks like an IP - validated later with inet_pton()
+IP_CANDIDATE = re.compile(
+    rb"(?<![\w:.])(?:"
+    rb"[0-9A-Fa-f]{0,4}(?::[0-9A-Fa-f]{0,4}){2,7}(?:\.\d{1,3}){0,3}"   # IPv6 (also ::ffff:1.2.3.4)
+    rb"|\d{1,3}(?:\.\d{1,3}){3}"                                        # IPv4
+    rb")(?![\w:.])"
+)
+
+IPV4_MAPPED_PREFIX = b"\x00" * 10 + b"\xff\xff"
+
+
+def count_range(kind, path, start, end, anywhere=False, chunk_size=log_statistics.DEFAULT_CHUNK_SIZE):
+    """
+    Count raw address tokens in one work item from plan_ranges().
+
+    Runs in a worker process, so it only takes and returns picklable data.
+
+    Returns:
+        (Counter of bytes tokens, number of lines)
+    """
+    pattern = IP_CANDIDATE if anywhere else FIRST_FIELD
+    tokens = Counter()
+    lines = 0
+    if kind == "lines":
+        reader, _ = log_statistics.open_range(path, start, end)
+        f = reader.f
+    else:
+        reader = f = log_statistics.open_log(path)
+    with f:
+        for buffer, filled in log_statistics.iter_line_chunks(reader, chunk_size):
+            tokens.update(pattern.findall(buffer, 0, filled))
+            lines += buffer.count(b"\n", 0, filled)
+    return tokens, lines
+
+
+def count_tokens(paths, anywhere=False, jobs=None, range_size=log_statistics.DEFAULT_RANGE_SIZE):
+    """
+    Count raw address tokens in log files (plain or compressed).
+
+    Plain files are split into byte ranges and counted in parallel;
+    compressed files are one work item each.
+
+    Args:
+        paths: Log files
+        anywhere: Take every IP-looking token instead of the first field
+        jobs: Worker processes (default: CPU count, 1 = no pool)
+        range_size: Bytes per work item
+
+    Returns:
+        (Counter of bytes tokens, number of lines)
+    """
+    work = []
+    for kind, path, start, end in log_statistics.plan_ranges(paths, range_size):
+        if kind != "lines":
+            if work and work[-1][1] == path:
+                continue  # Counting needs no member split: one stream per file
+            kind, start, end = "stream", 0, 0
+        work.append((kind, path, start, end, anywhere, min(range_size, log_statistics.DEFAULT_CHUNK_SIZE)))
+
+    if jobs == 1 or len(work) <= 1:
+        parts = [count_range(*item) for item in work]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            parts = list(pool.map(count_range, *zip(*work)))
+
+    tokens = Counter()
+    lines = 0
+    for part_tokens, part_lines in parts:
+        tokens.update(part_tokens)
+        lines += part_lines
+    return tokens, lines
+
+
+def pack_addresses(tokens):
+    """
+    Validate distinct tokens and pack them into integer arrays.
+
+    Args:
+        tokens: Counter of bytes tokens (from count_tokens())
+
+    Returns:
+        Dict with "v4" (addresses, counts), "v6" (high, low, counts)
+        and "invalid" (number of lines/tokens that were not an IP)
+    """
+    packed4, counts4 = [], array("Q")
+    packed6, counts6 = [], array("Q")
+    invalid = 0
+    for token, count in tokens.items():
+        text = token.decode("ascii", errors="replace")
+        try:
+            if ":" in text:
+                raw = socket.inet_pton(socket.AF_INET6, text.split("%", 1)[0])  # Drop zone (%eth0)
+                if raw.startswith(IPV4_MAPPED_PREFIX):
+                    packed4.append(raw[12:])
+                    counts4.append(count)
+                    continue
+                packed6.append(raw)
+                counts6.append(count)
+            else:
+                packed4.append(socket.inet_pton(socket.AF_INET, text))
+                counts4.append(count)
+        except OSError:
+            invalid += count
+
+    # One join + one conversion instead of an int() per address
+    addresses4 = _big_endian_array(b"".join(packed4), 4)
+    words6 = _big_endian_array(b"".join(packed6), 8)
+    if HAS_NUMPY:
+        counts4 = np.frombuffer(counts4, dtype=np.uint64)
+        counts6 = np.frombuffer(counts6, dtype=np.uint64)
+    high6, low6 = words6[0::2], words6[1::2]
+    return {"v4": (addresses4, counts4), "v6": (high6, low6, counts6), "invalid": invalid}
+
+
+def _big_endian_array(data, itemsize):
+    """Turn packed network-order bytes into an unsigned integer array."""
+    if HAS_NUMPY:
+        return np.frombuffer(data, dtype=f">u{itemsize}").astype(f"u{itemsize}")
+    values = array("I" if itemsize == 4 else "Q")
+    if values.itemsize != itemsize:  # Very unusual platforms
+        values = array("L" if itemsize == 4 else "Q")
+    values.frombytes(data)
+    if sys.byteorder == "little":
+        values.byteswap()
+    return values
+
+
+def _sum_by_key(keys, counts):
+    """
+    Add up counts of equal keys.
+
+    Returns:
+        (distinct keys, summed counts) - arrays or lists
+    """
+    if HAS_NUMPY:
+        if len(keys) == 0:
+            return keys, counts
+        distinct, inverse = np.unique(keys, return_inverse=True, axis=0)
+        sums = np.bincount(inverse.ravel(), weights=counts, minlength=len(distinct))
+        return distinct, sums.astype(np.uint64)
+
+    # No NumPy: sort once, then merge runs of equal keys
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    distinct, sums = [], array("Q")
+    for index in order:
+        if distinct and distinct[-1] == keys[index]:
+            sums[-1] += counts[index]
+        else:
+            distinct.append(keys[index])
+            sums.append(counts[index])
+    return distinct, sums
+
+
+def aggregate_v4(addresses, counts, prefix=32):
+    """Sum IPv4 counts per /prefix network. Keys are network addresses as ints."""
+    mask = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
+    if HAS_NUMPY:
+        keys = addresses & np.uint32(mask)
+    else:
+        keys = array(addresses.typecode, (address & mask for address in addresses))
+    return _sum_by_key(keys, counts)
+
+
+def aggregate_v6(high, low, counts, prefix=128):
+    """Sum IPv6 counts per /prefix network. Keys are (high, low) 64-bit halves."""
+    high_mask = (0xFFFFFFFFFFFFFFFF << (64 - min(prefix, 64))) & 0xFFFFFFFFFFFFFFFF
+    low_mask = (0xFFFFFFFFFFFFFFFF << (128 - max(prefix, 64))) & 0xFFFFFFFFFFFFFFFF
+    if HAS_NUMPY:
+        keys = np.stack([high & np.uint64(high_mask), low & np.uint64(low_mask)], axis=1)
+        distinct, sums = _sum_by_key(keys, counts)
+        return [(int(h) << 64) | int(l) for h, l in distinct], sums
+    keys = [((h & high_mask) << 64) | (l & low_mask) for h, l in zip(high, low)]
+    return _sum_by_key(keys, counts)
+
+
+def top_n(keys, sums, n):
+    """Return the n (key, count) pairs with the highest counts (ties: lowest key first)."""
+    if HAS_NUMPY and len(sums) > n:
+        sums = np.asarray(sums)
+        cutoff = np.partition(sums, len(sums) - n)[len(sums) - n]
+        candidates = ((int(keys[i]), int(sums[i])) for i in np.nonzero(sums >= cutoff)[0])
+    else:
+        candidates = ((int(key), int(count)) for key, count in zip(keys, sums))
+    return heapq.nsmallest(n, candidates, key=lambda item: (-item[1], item[0]))
+
+
+def top_talkers(paths, top=10, cidr4=32, cidr6=128, anywhere=False, jobs=None):
+    """
+    Find the busiest client networks.
+
+    Returns:
+        Dict with "top" [(network, count)], "total", "lines", "invalid",
+        "distinct_v4", "distinct_v6"
+    """
+    tokens, lines = count_tokens(paths, anywhere, jobs)
+    packed = pack_addresses(tokens)
+
+    keys4, sums4 = aggregate_v4(*packed["v4"], prefix=cidr4)
+    keys6, sums6 = aggregate_v6(*packed["v6"], prefix=cidr6)
+
+    ranked = [(ipaddress.IPv4Network((key, cidr4)), count) for key, count in top_n(keys4, sums4, top)]
+    ranked += [(ipaddress.IPv6Network((key, cidr6)), count) for key, count in top_n(keys6, sums6, top)]
+    ranked.sort(key=lambda item: (-item[1], item[0].version, item[0].network_address))
+
+    total = int(sum(packed["v4"][1])) + int(sum(packed["v6"][2]))
+    return {
+        "top": ranked[:top],
+        "total": total,
+        "lines": lines,
+        "invalid": packed["invalid"],
+        "distinct_v4": len(keys4),
+        "distinct_v6": len(keys6),
+    }
+
+
+def print_report(report, elapsed):
+    """Print the top talkers table."""
+    print(f"Lines: {report['lines']:,}  addresses: {report['total']:,}  "
+          f"not an IP: {report['invalid']:,}  ({elapsed:.2f}s, "
+          f"{report['lines'] / max(elapsed, 1e-9):,.0f} lines/s, NumPy: {'yes' if HAS_NUMPY else 'no'})")
+    print(f"Distinct IPv4 keys: {report['distinct_v4']:,}  IPv6 keys: {report['distinct_v6']:,}")
+    print(f"\n{'CLIENT':<45} {'REQUESTS':>10} {'SHARE':>7}")
+    for network, count in report["top"]:
+        # Show single hosts without the /32 or /128
+        name = str(network.network_address) if network.prefixlen == network.max_prefixlen else str(network)
+        share = count / report["total"] * 100 if report["total"] else 0
+        print(f"{name:<45} {count:>10,} {share:>6.1f}%")
+
+
+def naive_top_talkers(path, top=10):
+    """The one-line-at-a-time approach, for comparison."""
+    counts = Counter()
+    with open(path, "r") as f:
+        for line in f:
+            match = re.search(r"^\S+", line)
+            if match:
+                try:
+                    address = ipaddress.ip_address(match.group())
+                except ValueError:
+                    continue
+                if address.version == 6 and address.ipv4_mapped:
+                    address = address.ipv4_mapped
+                counts[address] += 1
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0].version, item[0]))
+    return [(str(address), count) for address, count in ranked[:top]]
+
+
+def create_sample_access_log(path, lines=1_000_000):
+    """Write an access log with a few heavy clients and a long tail."""
+    clients = []
+    for i in range(20_000):
+        if i % 10 == 9:
+            clients.append(f"2001:db8:{i % 7:x}::{i:x}")            # IPv6, 7 x /64
+        elif i % 10 == 8:
+            clients.append(f"::ffff:198.51.100.{i % 250}")        # Dual-stack socket
+        else:
+            clients.append(f"10.{i % 3}.{i // 256 % 256}.{i % 256}")
+    heavy = ["203.0.113.7", "203.0.113.8", "2001:db8:bad::1", "192.0.2.50"]
+    templates = [f'{client} - - [27/Jan/2026:10:00:00 +0000] "GET /api/items HTTP/1.1" 200 512 "-" "curl/8.5.0"\n'
+                 for client in clients]
+    heavy_templates = [f'{client} - - [27/Jan/2026:10:00:00 +0000] "GET /login HTTP/1.1" 401 64 "-" "python-requests/2.31"\n'
+                       for client in heavy]
+    with open(path, "w") as f:
+        batch = []
+        for i in range(lines):
+            if i % 5 == 0:
+                batch.append(heavy_templates[i // 5 % len(heavy_templates) if i % 3 else 0])
+            elif i % 997 == 0:
+                batch.append('- - - [27/Jan/2026:10:00:00 +0000] "-" 400 0 "-" "-"\n')  # No client IP
+            else:
+                batch.append(templates[(i * 7919) % len(templates)])
+            if len(batch) == 10_000:
+                f.write("".join(batch))
+                batch = []
+        f.write("".join(batch))
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Top client IPs/networks in log files")
+    parser.add_argument("files", nargs="*", help="log files or glob patterns (default: demo)")
+    parser.add_argument("--top", type=int, default=10, help="how many to show (default: 10)")
+    parser.add_argument("--cidr4", type=int, default=32, choices=range(0, 33), metavar="0-32",
+                        help="group IPv4 clients by this prefix length (default: 32)")
+    parser.add_argument("--cidr6", type=int, default=128, choices=range(0, 129), metavar="0-128",
+                        help="group IPv6 clients by this prefix length (default: 128)")
+    parser.add_argument("--anywhere", action="store_true",
+                        help="count every IP in the line, not just the first field")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count)")
+    return parser.parse_args()
+
+
+def main():
+    """Report top talkers for files, or run the demo."""
+    args = parse_args()
+
+    if args.files:
+        paths = log_statistics.expand_log_files(args.files)
+        if not paths:
+            print(f"✗ No files match: {' '.join(args.files)}")
+            sys.exit(1)
+        start = time.perf_counter()
+        report = top_talkers(paths, args.top, args.cidr4, args.cidr6, args.anywhere, args.jobs)
+        print_report(report, time.perf_counter() - start)
+    else:
+        sample = "/tmp/test_devops_talkers.log"
+        create_sample_access_log(sample)
+        print(f"Created sample log: {sample}\n")
+
+        start = time.perf_counter()
+        report = top_talkers([sample], args.top)
+        fast = time.perf_counter() - start
+        print_report(report, fast)
+        print("-" * 50)
+
+        start = time.perf_counter()
+        expected = naive_top_talkers(sample, args.top)
+        slow = time.perf_counter() - start
+        got = [(str(network.network_address), count) for network, count in report["top"]]
+        same = "✓ same top list" if got == expected else "✗ top lists differ"
+        print(f"Line-by-line re.search() + ipaddress: {slow:.2f}s vs {fast:.2f}s "
+              f"({slow / fast:.0f}x) - {same}")
+        print("-" * 50)
+
+        print("Grouped by network (/24 for IPv4, /64 for IPv6):")
+        start = time.perf_counter()
+        report = top_talkers([sample], 5, cidr4=24, cidr6=64)
+        print_report(report, time.perf_counter() - start)
+
+    # DevOps Pro Tip
+    print("\n" + "=" * 50)
+    print("💡 Count first, validate later!")
+    print("   Millions of lines, but only thousands of distinct IPs")
+    print("   Validate each distinct IP once with inet_pton()")
+    print("   Pack IPs into integers - CIDR grouping is just a bit mask")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
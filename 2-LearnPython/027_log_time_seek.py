@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+"""
+Jump to a Time Range in Big Log Files
+
+WHAT: Print the log lines between two times without reading the whole file
+WHERE: Incidents - "show me the ERRORs between 14:00 and 14:05"
+WHY: 009_reading_files.py reads every line and 016_dates_and_times.py
+     parses every timestamp before the filter can say "not yet". For a
+     5-minute window in a 20 GB log that is 20 GB read to print 2 MB
+
+REAL-WORLD SCENARIO:
+- The alert fired at 14:02 - what did the app log from 14:00 to 14:05?
+- Which requests hit /login between 03:10 and 03:15 last night?
+- Same question over app.log, app.log.1, ... - files outside the
+  window are skipped after reading their first and last lines
+
+HOW IT WORKS:
+- Logs are written in time order, so byte offset and time go up
+  together. A binary search over byte offsets finds the window: seek to
+  the middle, skip to the next line start, read that line's timestamp,
+  go left or right. A 20 GB file needs about 23 probes of 4 KB each
+- Lines without a timestamp (stack traces, multi-line messages) belong
+  to the timestamped line before them; probes skip over them
+- From the first line of the window the file is read forward in big
+  chunks and the scan stops at the first line after the window
+- Sparse index (--index): one (offset, time) entry every --index-step
+  MB, saved in ~/.cache. The search starts between two index entries
+  instead of the whole file - fewer seeks on slow disks and network
+  storage. When the file grows only the new part is probed
+- Slightly out-of-order logs (many threads writing) are handled with
+  --slack SECONDS: the search starts that much earlier and stops that
+  much later, and every line is still checked against the window
+- Compressed files can't be seeked: they are read from the start, but
+  the scan still stops right after the window
+
+TIMESTAMPS (at the start of the line, or nginx/Apache style):
+    2026-01-27 14:30:00 ERROR ...          2026-01-27T14:30:00.123Z ...
+    10.0.0.1 - - [27/Jan/2026:14:30:00 +0000] "GET / HTTP/1.1" ...
+    Times are compared as written in the log (the +0000 is ignored).
+
+HOW TO RUN:
+    python3 027_log_time_seek.py                          # demo with a sample log
+    python3 027_log_time_seek.py /var/log/app.log --start 14:00 --end 14:05 --find ERROR
+    python3 027_log_time_seek.py '/var/log/app.log*' --start "2026-01-26 23:55" --end "2026-01-27 00:05"
+    python3 027_log_time_seek.py /var/log/nginx/access.log --start 03:10 --end 03:15 --index --count
+"""
+
+import argparse
+import bisect
+import calendar
+import importlib
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+
+log_statistics = importlib.import_module("021_log_statistics")
+log_cache = importlib.import_module("026_log_cache")
+
+# Read this much per binary search probe (a few dozen lines)
+PROBE_BYTES = 4096
+
+DEFAULT_INDEX_DIR = os.path.expanduser("~/.cache/devops_log_time_index")
+DEFAULT_INDEX_STEP_MB = 16
+DEFAULT_MAX_LINES = 100
+
+# Where the first/last timestamp of a file is searched for (growing)
+SPAN_PROBE_SIZES = (PROBE_BYTES, 64 * 1024, 1024 * 1024)
+
+# Read buffer once the window is found - windows are usually small
+WINDOW_CHUNK_SIZE = 1024 * 1024
+
+# "2026-01-27 14:30:00" at the line start, or "[27/Jan/2026:14:30:00" within
+# the first 120 bytes (nginx/Apache: after the client address and user)
+STAMP_PATTERN = re.compile(
+    rb"(\d{4})-(\d\d)-(\d\d)[ T](\d\d):(\d\d):(\d\d)"
+    rb"|[^\n\[]{0,120}\[(\d\d)/([A-Z][a-z]{2})/(\d{4}):(\d\d):(\d\d):(\d\d)"
+)
+MONTHS = {name.encode(): number for number, name in enumerate(calendar.month_abbr) if name}
+
+
+@lru_cache(maxsize=1024)
+def _day_epoch(year, month, day):
+    """Epoch seconds of midnight - a log has only a few distinct days."""
+    return calendar.timegm((year, month, day, 0, 0, 0))
+
+
+def line_time(buffer, pos=0):
+    """
+    Timestamp of the line starting at buffer[pos] as epoch seconds.
+
+    Returns:
+        int, or None if the line has no timestamp (e.g. a stack trace)
+    """
+    match = STAMP_PATTERN.match(buffer, pos)
+    if match is None:
+        return None
+    groups = match.groups()
+    if groups[0] is not None:
+        year, month, day = int(groups[0]), int(groups[1]), int(groups[2])
+        hour, minute, second = groups[3:6]
+    else:
+        month = MONTHS.get(groups[7])
+        if month is None:
+            return None
+        year, day = int(groups[8]), int(groups[6])
+        hour, minute, second = groups[9:12]
+    return _day_epoch(year, month, day) + int(hour) * 3600 + int(minute) * 60 + int(second)
+
+
+def iter_line_stamps(f, offset, limit, io=None):
+    """
+    Read lines starting in [offset, limit) with small reads.
+
+    Used for probing, not for bulk reading: starts at the first line
+    start at or after offset, reads PROBE_BYTES at a time.
+
+    Args:
+        f: File opened with open(path, "rb")
+        offset: Any byte offset
+        limit: Stop before lines that start here or later
+        io: Optional Counter - "reads" and "bytes" are added
+
+    Yields:
+        (line_start, epoch or None)
+    """
+    base = max(offset - 1, 0)
+    f.seek(base)
+    data = f.read(PROBE_BYTES)
+    if io is not None:
+        io["reads"] += 1
+        io["bytes"] += len(data)
+    if offset == 0:
+        pos = 0
+    else:
+        # The byte before offset tells us if offset is a line start
+        while True:
+            newline = data.find(b"\n")
+            if newline != -1:
+                pos = newline + 1
+                break
+            base += len(data)
+            data = f.read(PROBE_BYTES)
+            if not data:
+                return
+            if io is not None:
+                io["reads"] += 1
+                io["bytes"] += len(data)
+
+    while base + pos < limit:
+        end = data.find(b"\n", pos)
+        if end == -1:
+            more = f.read(PROBE_BYTES)
+            if not more:
+                if pos < len(data):
+                    yield base + pos, line_time(data, pos)  # Last line, no newline
+                return
+            if io is not None:
+                io["reads"] += 1
+                io["bytes"] += len(more)
+            data = data[pos:] + more
+            base += pos
+            pos = 0
+            continue
+        yield base + pos, line_time(data, pos)
+        pos = end + 1
+
+
+def first_stamp(f, offset, limit, io=None):
+    """
+    First timestamped line starting in [offset, limit).
+
+    Returns:
+        (line_start, epoch), or (limit, None) if there is none
+    """
+    for line_start, stamp in iter_line_stamps(f, offset, limit, io):
+        if stamp is not None:
+            return line_start, stamp
+    return limit, None
+
+
+def find_time_offset(f, target, low, high, io=None):
+    """
+    Binary search for the first line stamped at or after target.
+
+    Args:
+        f: File opened with open(path, "rb")
+        target: Epoch seconds
+        low: A line start known to be before the answer (0 = file start)
+        high: An offset known to be at or after the answer (file size)
+
+    Returns:
+        Offset of that line, or high if every line is earlier
+    """
+    limit = high
+    while high - low > PROBE_BYTES:
+        middle = (low + high) // 2
+        line_start, stamp = first_stamp(f, middle, high, io)
+        if stamp is None or stamp >= target:
+            high = middle           # Answer is before the probe (or at it)
+        else:
+            low = line_start        # Everything up to here is too early
+
+    # Narrowed to a few KB: walk the lines
+    for line_start, stamp in iter_line_stamps(f, low, limit, io):
+        if stamp is not None and stamp >= target:
+            return line_start
+    return limit
+
+
+def file_time_span(f, size, io=None):
+    """
+    First and last timestamp of a file (None if not found).
+
+    Used to skip rotated files that are entirely outside the window.
+    """
+    _, first = first_stamp(f, 0, min(size, SPAN_PROBE_SIZES[-1]), io)
+    last = None
+    for tail in SPAN_PROBE_SIZES:
+        for _, stamp in iter_line_stamps(f, max(size - tail, 0), size, io):
+            if stamp is not None:
+                last = stamp
+        if last is not None or tail >= size:
+            break
+    return first, last
+
+
+# ---------------------------------------------------------------------------
+# Sparse index
+# ---------------------------------------------------------------------------
+
+def index_path(path, index_dir=DEFAULT_INDEX_DIR):
+    """
+    Index files are keyed by the file's first bytes, so they follow
+    rotation and appends. None if the file is too short to have a key.
+    """
+    key = log_cache.file_key(path)
+    return None if key is None else os.path.join(index_dir, f"{key}.json")
+
+
+def _save_index(path, index):
+    """Write the index atomically."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_file = f"{path}.tmp.{os.getpid()}"
+    with open(temp_file, "w") as f:
+        json.dump(index, f)
+    os.replace(temp_file, path)
+
+
+def load_index(path, step_mb=DEFAULT_INDEX_STEP_MB, index_dir=DEFAULT_INDEX_DIR, io=None):
+    """
+    Load the sparse index of a file, building or extending it as needed.
+
+    Entries are [probe_offset, line_start, epoch]: the first timestamped
+    line at or after every step-th byte. Epochs are kept non-decreasing
+    (a running maximum) so they can be bisected.
+
+    Returns:
+        (index dict, status) - status is "built", "extended" or "reused"
+    """
+    step = step_mb * 1024 * 1024
+    size = os.path.getsize(path)
+    location = index_path(path, index_dir)
+    index = None  # Files too short for a key get a throwaway index
+    if location is not None:
+        try:
+            with open(location) as f:
+                index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            pass
+
+    with open(path, "rb") as f:
+        status = "reused"
+        if index is not None and (index["step"] != step or index["size"] > size
+                                  or index.get("head") != log_cache.HEAD_BYTES):
+            index = None  # Different step or key, or the file was truncated/replaced
+        if index is not None and index["entries"]:
+            # Re-probe the last entry: catches files rewritten in place
+            probe, line_start, _ = index["entries"][-1]
+            if first_stamp(f, probe, index["size"], io)[0] != line_start:
+                index = None
+        if index is None:
+            index = {"step": step, "size": 0, "entries": [], "head": log_cache.HEAD_BYTES}
+            status = "built"
+
+        if index["size"] < size:
+            entries = index["entries"]
+            if entries:
+                entries.pop()  # The last probe may see more lines now
+            running_max = entries[-1][2] if entries else None
+            for probe in range(entries[-1][0] + step if entries else 0, size, step):
+                line_start, stamp = first_stamp(f, probe, size, io)
+                if stamp is None:
+                    break
+                running_max = stamp if running_max is None else max(running_max, stamp)
+                entries.append([probe, line_start, running_max])
+            index["size"] = size
+            status = "extended" if status == "reused" else status
+            if location is not None:
+                _save_index(location, index)
+    return index, status
+
+
+def index_bracket(index, target, size):
+    """
+    Byte range [low, high) of the file that must contain the first line
+    stamped at or after target, according to the index.
+    """
+    entries = index["entries"]
+    position = bisect.bisect_left([entry[2] for entry in entries], target)
+    low = entries[position - 1][1] if position > 0 else 0
+    high = entries[position][1] if position < len(entries) else size
+    return low, high
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def iter_window_lines(reader, first_offset, start, end, find=None, slack=0, current=None):
+    """
+    Read lines forward and yield those stamped inside [start, end].
+
+    Lines without a timestamp get the time of the line before them.
+    Stops at the first line stamped after end + slack.
+
+    Yields:
+        (offset, line bytes without newline)
+    """
+    stop = end + slack
+    offset = first_offset
+    for buffer, filled in log_statistics.iter_line_chunks(reader, WINDOW_CHUNK_SIZE):
+        data = bytes(buffer[:filled])
+        pos = 0
+        while pos < filled:
+            newline = data.find(b"\n", pos)
+            stamp = line_time(data, pos)
+            if stamp is not None:
+                if stamp > stop:
+                    return
+                current = stamp
+            if current is not None and start <= current <= end:
+                line = data[pos:newline]
+                if find is None or find in line:
+                    yield offset + pos, line
+            pos = newline + 1
+        offset += filled
+
+
+def search_file(path, start, end, find=None, slack=0, use_index=False, index_step_mb=DEFAULT_INDEX_STEP_MB,
+                index_dir=DEFAULT_INDEX_DIR, stats=None):
+    """
+    Yield (offset, line) for the lines of one file inside [start, end].
+
+    Args:
+        path: Log file (plain files are seeked, compressed ones read from the start)
+        start, end: Epoch seconds, inclusive
+        find: Optional bytes that the line must contain
+        slack: Seconds of out-of-order tolerance
+        use_index: Use (and maintain) the sparse index
+        stats: Optional Counter - bytes read, probes, skipped files
+    """
+    stats = Counter() if stats is None else stats
+    size = os.path.getsize(path)
+    stats["file_bytes"] += size
+
+    if log_statistics.detect_compression(path) is not None:
+        stats["compressed_files"] += 1
+        with log_statistics.open_log(path) as f:
+            for offset, line in iter_window_lines(f, 0, start, end, find, slack):
+                yield offset, line
+        stats["bytes"] += size  # Approximate: how far we got isn't known in compressed bytes
+        return
+
+    io = Counter()
+    with open(path, "rb") as f:
+        first, last = file_time_span(f, size, io)
+        if (last is not None and last < start - slack) or (first is not None and first > end + slack):
+            stats["skipped_files"] += 1
+            stats["bytes"] += min(io["bytes"], size)
+            stats["probes"] += io["reads"]
+            return
+        low, high = 0, size
+        if use_index:
+            index, status = load_index(path, index_step_mb, index_dir, io)
+            stats[f"index_{status}"] += 1
+            low, high = index_bracket(index, start - slack, size)
+        begin = find_time_offset(f, start - slack, low, high, io)
+    stats["probes"] += io["reads"]
+
+    reader, first_offset = log_statistics.open_range(path, begin, size)
+    with reader.f:
+        for offset, line in iter_window_lines(reader, first_offset, start, end, find, slack):
+            yield offset, line
+        # Small files: probes and the window read overlap
+        stats["bytes"] += min(io["bytes"] + reader.f.tell() - first_offset, size)
+
+
+def search_files(paths, start, end, find=None, slack=0, use_index=False, index_step_mb=DEFAULT_INDEX_STEP_MB,
+                 index_dir=DEFAULT_INDEX_DIR, stats=None):
+    """Yield (path, offset, line) for every file, oldest rotation first."""
+    for path in paths:
+        for offset, line in search_file(path, start, end, find, slack, use_index, index_step_mb, index_dir, stats):
+            yield path, offset, line
+
+
+def search_whole_file(path, start, end, find=None):
+    """
+    The 009/016 way: read every line, strptime() every timestamp.
+
+    Only understands "YYYY-MM-DD HH:MM:SS" lines - used to check the
+    results and as the benchmark baseline.
+    """
+    results = []
+    current = None
+    with open(path, "rb") as f:
+        offset = 0
+        for line in f:
+            text = line.decode("utf-8", errors="replace")
+            try:
+                current = calendar.timegm(datetime.strptime(text[:19], "%Y-%m-%d %H:%M:%S").timetuple())
+            except ValueError:
+                pass  # No timestamp: same time as the line before
+            if current is not None and start <= current <= end:
+                stripped = line.rstrip(b"\n")
+                if find is None or find in stripped:
+                    results.append((offset, stripped))
+            offset += len(line)
+    return results
+
+
+def parse_time_arg(text, reference=None):
+    """
+    "2026-01-27 14:00[:SS]" or "14:00[:SS]" (on the day of reference) -> epoch seconds.
+    """
+    text = text.strip().replace("T", " ")
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M"):
+        try:
+            return calendar.timegm(datetime.strptime(text, fmt).timetuple())
+        except ValueError:
+            pass
+    for fmt in ("%H:%M:%S", "%H:%M"):
+        try:
+            clock = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if reference is None:
+            raise ValueError(f"{text!r} has no date and no timestamp was found in the log")
+        return reference // 86400 * 86400 + clock.hour * 3600 + clock.minute * 60 + clock.second
+    raise ValueError(f"can't understand time {text!r} - use 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]'")
+
+
+def reference_time(paths):
+    """Timestamp of the newest file's first line (for times given without a date)."""
+    for path in reversed(paths):
+        if log_statistics.detect_compression(path) is None:
+            with open(path, "rb") as f:
+                _, stamp = first_stamp(f, 0, os.path.getsize(path))
+        else:
+            with log_statistics.open_log(path) as f:
+                stamp = line_time(f.read(PROBE_BYTES))
+        if stamp is not None:
+            return stamp
+    return None
+
+
+def format_time(epoch):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(epoch))
+
+
+def run_search(paths, start, end, find=None, slack=0, use_index=False, index_step_mb=DEFAULT_INDEX_STEP_MB,
+               max_lines=DEFAULT_MAX_LINES, count_only=False):
+    """Print the matching lines and how much of the files had to be read."""
+    stats = Counter()
+    matched = 0
+    begin = time.perf_counter()
+    for path, offset, line in search_files(paths, start, end, find, slack, use_index, index_step_mb, stats=stats):
+        matched += 1
+        if not count_only and matched <= max_lines:
+            print(f"  {path}:{offset}: {line.decode('utf-8', errors='replace')}")
+    elapsed = time.perf_counter() - begin
+
+    if not count_only and matched > max_lines:
+        print(f"  ... {matched - max_lines} more line(s) (--max-lines)")
+    what = f"lines containing {find.decode()!r}" if find else "lines"
+    print(f"\n{matched:,} {what} between {format_time(start)} and {format_time(end)}")
+    print(f"Read {stats['bytes'] / 1024 / 1024:.2f} MB of {stats['file_bytes'] / 1024 / 1024:.1f} MB "
+          f"({stats['probes']} probe reads) in {elapsed * 1000:.1f} ms")
+    if stats["skipped_files"]:
+        print(f"Skipped {stats['skipped_files']} file(s) entirely outside the window")
+    if stats["compressed_files"]:
+        print(f"⚠️  {stats['compressed_files']} compressed file(s) read from the start (can't seek)")
+    for status in ("built", "extended", "reused"):
+        if stats[f"index_{status}"]:
+            print(f"Sparse index: {status} for {stats[f'index_{status}']} file(s)")
+    return matched, stats
+
+
+def create_sample_log(path, lines=1_000_000):
+    """Write a time-ordered app log with occasional stack traces."""
+    levels = ["INFO"] * 7 + ["WARNING"] * 2 + ["ERROR"]
+    with open(path, "w") as f:
+        batch = []
+        for i in range(lines):
+            second = i // 40  # 40 lines per second, starting at midnight
+            level = levels[i % len(levels)]
+            batch.append(f"2026-01-27 {second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d} "
+                         f"{level} request {i} handled by worker-{i % 8}\n")
+            if i % 5000 == 4999:
+                batch.append("Traceback (most recent call last):\n"
+                             "  File \"app.py\", line 42, in handle\n"
+                             "ValueError: bad request\n")
+            if len(batch) >= 10_000:
+                f.write("".join(batch))
+                batch = []
+        f.write("".join(batch))
+
+
+def demo():
+    """Compare the full scan with the binary search on a sample log."""
+    sample = "/tmp/test_devops_time_seek.log"
+    create_sample_log(sample)
+    size_mb = os.path.getsize(sample) / 1024 / 1024
+    print(f"Created sample log: {sample} ({size_mb:.0f} MB, 00:00 to 06:56)\n")
+
+    start = parse_time_arg("2026-01-27 06:00")
+    end = parse_time_arg("2026-01-27 06:05")
+
+    print("Example 1: ERRORs between 06:00 and 06:05 - read everything (009/016 way)")
+    begin = time.perf_counter()
+    expected = search_whole_file(sample, start, end, b"ERROR")
+    full_seconds = time.perf_counter() - begin
+    print(f"  {len(expected):,} lines, read {size_mb:.0f} MB in {full_seconds:.2f}s")
+    print("-" * 50)
+
+    print("Example 2: same window with a binary search")
+    begin = time.perf_counter()
+    found = [(offset, line) for _, offset, line in search_files([sample], start, end, b"ERROR")]
+    seek_seconds = time.perf_counter() - begin
+    status = "✓ same lines" if found == expected else "✗ different lines!"
+    print(f"  {len(found):,} lines in {seek_seconds * 1000:.1f} ms "
+          f"({full_seconds / seek_seconds:.0f}x faster) - {status}")
+    print("-" * 50)
+
+    print("Example 3: with the sparse index (first run builds it, second reuses it)")
+    index_dir = "/tmp/test_devops_time_index"
+    shutil.rmtree(index_dir, ignore_errors=True)  # Left over from an earlier demo run
+    for _ in range(2):
+        stats = Counter()
+        begin = time.perf_counter()
+        found = [(offset, line) for _, offset, line in
+                 search_files([sample], start, end, b"ERROR", use_index=True, index_step_mb=1,
+                              index_dir=index_dir, stats=stats)]
+        status = "built" if stats["index_built"] else "reused"
+        print(f"  index {status}: {len(found):,} lines in {(time.perf_counter() - begin) * 1000:.1f} ms, "
+              f"{stats['probes']} probe reads")
+    print("-" * 50)
+
+    print("Example 4: 06:04:59 to 06:05:00, only the first 3 lines (--max-lines 3)")
+    run_search([sample], end - 1, end, max_lines=3)
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Print log lines inside a time window without reading the whole file")
+    parser.add_argument("files", nargs="*", help="log files or glob patterns (default: demo)")
+    parser.add_argument("--start", help="window start: 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]'")
+    parser.add_argument("--end", help="window end (inclusive), same formats")
+    parser.add_argument("--find", metavar="TEXT", help="only lines containing TEXT (e.g. ERROR)")
+    parser.add_argument("--slack", type=int, default=0, metavar="SECONDS",
+                        help="tolerate lines this much out of time order (default: 0)")
+    parser.add_argument("--index", action="store_true", help="use and update a sparse time index in ~/.cache")
+    parser.add_argument("--index-step", type=int, default=DEFAULT_INDEX_STEP_MB, metavar="MB",
+                        help=f"index entry every MB megabytes (default: {DEFAULT_INDEX_STEP_MB})")
+    parser.add_argument("--max-lines", type=int, default=DEFAULT_MAX_LINES,
+                        help=f"lines to print (default: {DEFAULT_MAX_LINES})")
+    parser.add_argument("--count", action="store_true", help="only count the lines")
+    return parser.parse_args()
+
+
+def main():
+    """Search the given files, or run the demo."""
+    args = parse_args()
+
+    if not args.files:
+        demo()
+    else:
+        paths = log_statistics.expand_log_files(args.files)
+        if not paths:
+            print(f"✗ No files match: {' '.join(args.files)}")
+            sys.exit(1)
+        if not args.start or not args.end:
+            print("✗ --start and --end are required")
+            sys.exit(1)
+        try:
+            reference = reference_time(paths)
+            start = parse_time_arg(args.start, reference)
+            end = parse_time_arg(args.end, reference)
+        except ValueError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        if end < start:
+            print("✗ --end is before --start")
+            sys.exit(1)
+        find = args.find.encode() if args.find else None
+        run_search(paths, start, end, find, args.slack, args.index, args.index_step, args.max_lines, args.count)
+
+    # DevOps Pro Tip
+    print("\n" + "=" * 50)
+    print("💡 Logs are sorted by time - use it!")
+    print("   Binary search the bytes, don't read them all")
+    print("   Skip to a line start after every seek")
+    print("   Stop reading as soon as you're past the window")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Fast Log Timestamp Parsing
+
+WHAT: Turn log timestamps into epoch seconds ~10x faster than strptime()
+WHERE: Any parser that reads millions of log lines (rates per minute,
+       time windows, columnar caches, ...)
+WHY: Example 3 in 016_dates_and_times.py uses
+     datetime.strptime(text, "%Y-%m-%d %H:%M:%S"). strptime() is written
+     in Python, re-reads the format string and runs a regex on every
+     call - about 10 µs per line, well over a minute for 10M lines
+
+FORMATS (detected automatically from the first line):
+    iso      2026-01-27 14:30:00   2026-01-27T14:30:00.123Z   ...+02:00
+    clf      27/Jan/2026:14:30:00 +0000   (nginx/Apache, inside [...])
+    syslog   Jan 27 14:30:00              (no year in the line: --year)
+
+HOW IT WORKS:
+- Fixed offsets: in "2026-01-27 14:30:00" the seconds are always
+  text[17:19]. Slicing plus int() is all it takes - no format string,
+  no regex
+- Cache: consecutive lines share the same minute, so "2026-01-27 14:30"
+  is converted once (validated with datetime(), converted with
+  calendar.timegm()) and looked up in a dict for every other line of
+  that minute. Per line that leaves one dict lookup and one int()
+- Epoch output: plain int (float with fractions), no datetime objects.
+  Easy to compare, subtract, bucket (epoch // 300 = 5-minute window)
+  and store in arrays
+- Timestamps without a zone are taken as UTC, like the other scripts
+  here; +02:00 / -0500 offsets are converted to UTC
+
+HOW TO RUN:
+    python3 028_fast_timestamps.py                         # demo + 1M line benchmark
+    python3 028_fast_timestamps.py --benchmark             # 10M lines
+    python3 028_fast_timestamps.py /var/log/app.log        # first/last time, lines per minute
+
+USE IT FROM ANOTHER SCRIPT:
+    fast_timestamps = importlib.import_module("028_fast_timestamps")
+    parser = fast_timestamps.TimestampParser()        # or TimestampParser("clf")
+    epoch = parser.parse("2026-01-27 14:30:00")       # 1769524200
+    epochs = parser.parse_many(timestamp_strings)     # list, fastest per line
+"""
+
+import argparse
+import calendar
+import re
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+# Cached minutes before the cache is emptied (a day has 1440)
+MAX_CACHED_MINUTES = 100_000
+
+MONTHS = {name: number for number, name in enumerate(calendar.month_abbr) if name}
+
+# Used once per distinct minute (validation) and for format detection
+ISO_MINUTE = re.compile(r"(\d{4})-(\d\d)-(\d\d)[ T](\d\d):(\d\d)$")
+CLF_MINUTE = re.compile(r"(\d\d)/([A-Z][a-z]{2})/(\d{4}):(\d\d):(\d\d)$")
+SYSLOG_MINUTE = re.compile(r"([A-Z][a-z]{2}) ([ \d]\d) (\d\d):(\d\d)$")
+
+# Fraction and zone after "...:SS" (only looked at when present)
+ISO_TAIL = re.compile(r"(?:[.,](\d+))?(Z|[+-]\d\d(?::?\d\d)?)?")
+ZONE = re.compile(r"([+-])(\d\d):?(\d\d)?$")
+
+DETECT = (
+    ("iso", re.compile(r"\d{4}-\d\d-\d\d[ T]\d\d:\d\d:\d\d")),
+    ("clf", re.compile(r"\d\d/[A-Z][a-z]{2}/\d{4}:\d\d:\d\d:\d\d")),
+    ("syslog", re.compile(r"[A-Z][a-z]{2} [ \d]\d \d\d:\d\d:\d\d")),
+)
+
+
+def detect_format(text):
+    """
+    Guess the timestamp format of a timestamp or log line.
+
+    Returns:
+        "iso", "clf", "syslog", or None
+    """
+    for name, pattern in DETECT:
+        if pattern.match(text):
+            return name
+    bracket = text.find("[")
+    if bracket != -1 and DETECT[1][1].match(text, bracket + 1):
+        return "clf"  # Whole access log line
+    return None
+
+
+def zone_offset(zone):
+    """'+02:00' / '-0500' / 'Z' -> seconds east of UTC."""
+    if zone in ("Z", ""):
+        return 0
+    match = ZONE.match(zone)
+    if match is None:
+        raise ValueError(f"invalid time zone {zone!r}")
+    sign, hours, minutes = match.groups()
+    offset = int(hours) * 3600 + int(minutes or 0) * 60
+    return -offset if sign == "-" else offset
+
+
+class TimestampParser:
+    """
+    Parse timestamps of one format into epoch seconds, caching per minute.
+
+    One parser per file or stream: the cache only helps if lines are
+    roughly in time order. Invalid timestamps raise ValueError, like
+    strptime().
+    """
+
+    def __init__(self, fmt="auto", year=None):
+        """
+        Args:
+            fmt: "iso", "clf", "syslog", or "auto" (detect on the first parse)
+            year: Year for syslog timestamps (default: the current year)
+        """
+        if fmt not in ("auto", "iso", "clf", "syslog"):
+            raise ValueError(f"unknown timestamp format {fmt!r}")
+        self.format = fmt
+        self.year = year or time.gmtime().tm_year
+        self._minutes = {}
+        self._zones = {}
+        self._parse = None if fmt == "auto" else getattr(self, f"_parse_{fmt}")
+
+    # -- minute cache ------------------------------------------------------
+
+    def _minute(self, key):
+        """Epoch of a minute key like '2026-01-27 14:30', computed once."""
+        if len(self._minutes) >= MAX_CACHED_MINUTES:
+            self._minutes.clear()
+        if self.format == "iso":
+            match = ISO_MINUTE.match(key)
+            fields = match and (int(match[1]), int(match[2]), int(match[3]), int(match[4]), int(match[5]))
+        elif self.format == "clf":
+            match = CLF_MINUTE.match(key)
+            fields = match and (int(match[3]), MONTHS.get(match[2], 0), int(match[1]), int(match[4]), int(match[5]))
+        else:
+            match = SYSLOG_MINUTE.match(key)
+            fields = match and (self.year, MONTHS.get(match[1], 0), int(match[2]), int(match[3]), int(match[4]))
+        if not fields:
+            raise ValueError(f"timestamp {key!r} is not in {self.format} format")
+        datetime(*fields)  # Raises ValueError for month 13, Feb 30, hour 24 ...
+        epoch = self._minutes[key] = calendar.timegm(fields + (0,))
+        return epoch
+
+    def _second(self, text, position):
+        digits = text[position:position + 2]
+        if len(digits) != 2 or not digits.isdigit() or digits > "60":
+            raise ValueError(f"invalid seconds in {text[:40]!r}")
+        return int(digits)
+
+    # -- one function per format -------------------------------------------
+
+    def _parse_iso(self, text):
+        key = text[:16]
+        minute = self._minutes.get(key)
+        if minute is None:
+            minute = self._minute(key)
+        if text[16:17] != ":":
+            raise ValueError(f"timestamp {text!r} is not in iso format")
+        epoch = minute + self._second(text, 17)
+        if text[19:20] in ("", " "):
+            return epoch                                    # "2026-01-27 14:30:00 ..."
+        if text[19] == "." and text[23:24] == "Z" and (len(text) == 24 or text[24] == " "):
+            return epoch + int(text[20:23]) / 1000          # "...:00.123Z" (very common)
+        match = ISO_TAIL.match(text, 19)
+        fraction, zone = match.groups()
+        if zone:
+            offset = self._zones.get(zone)
+            if offset is None:
+                offset = self._zones[zone] = zone_offset(zone)
+            epoch -= offset
+        if fraction:
+            return epoch + int(fraction) / 10 ** len(fraction)
+        return epoch
+
+    def _parse_clf(self, text):
+        if text[:1] == "[":
+            text = text[1:]
+        elif text[2:3] != "/":
+            bracket = text.find("[")                        # A whole access log line
+            if bracket == -1:
+                raise ValueError(f"no [dd/Mon/yyyy:...] timestamp in {text[:60]!r}")
+            text = text[bracket + 1:bracket + 27]
+        key = text[:17]
+        minute = self._minutes.get(key)
+        if minute is None:
+            minute = self._minute(key)
+        epoch = minute + self._second(text, 18)
+        zone = text[21:26]
+        if zone[:1] in ("+", "-"):
+            offset = self._zones.get(zone)
+            if offset is None:
+                offset = self._zones[zone] = zone_offset(zone)
+            epoch -= offset
+        return epoch
+
+    def _parse_syslog(self, text):
+        key = text[:12]
+        minute = self._minutes.get(key)
+        if minute is None:
+            minute = self._minute(key)
+        return minute + self._second(text, 13)
+
+    # -- public API --------------------------------------------------------
+
+    def parse(self, text):
+        """
+        Timestamp (or a log line starting with one) -> epoch seconds.
+
+        Returns:
+            int, or float if the timestamp has fractions of a second
+        """
+        if self._parse is None:
+            detected = detect_format(text)
+            if detected is None:
+                raise ValueError(f"unknown timestamp format: {text[:40]!r}")
+            self.format = detected
+            self._parse = getattr(self, f"_parse_{detected}")
+        return self._parse(text)
+
+    def parse_many(self, texts):
+        """
+        Parse many "YYYY-MM-DD HH:MM:SS..." / other timestamps.
+
+        Same results as parse() for each text, but the common case (same
+        minute as a cached one, no fractions or zone) runs inline without
+        a method call per line - the fastest way to fill a column.
+
+        Returns:
+            List of epochs
+        """
+        texts = iter(texts)
+        result = []
+        first = next(texts, None)
+        if first is None:
+            return result
+        result.append(self.parse(first))
+        parse = self._parse
+        if self.format != "iso":
+            result.extend(parse(text) for text in texts)
+            return result
+
+        minutes = self._minutes
+        append = result.append
+        for text in texts:
+            minute = minutes.get(text[:16])
+            seconds = text[17:19]
+            if minute is not None and (len(text) == 19 or text[19:20] == " ") and text[16:17] == ":" \
+                    and seconds.isdigit() and seconds <= "60":
+                append(minute + int(seconds))
+            else:
+                append(parse(text))
+        return result
+
+    def parse_datetime(self, text):
+        """Like parse(), but returns an aware datetime in UTC."""
+        return datetime.fromtimestamp(self.parse(text), timezone.utc)
+
+
+def strptime_epoch(text, fmt="%Y-%m-%d %H:%M:%S"):
+    """The 016 way, plus the conversion to epoch seconds (UTC)."""
+    return calendar.timegm(datetime.strptime(text[:19], fmt).timetuple())
+
+
+def generate_lines(count, first=0, start="2026-01-27 00:00:00", per_second=40):
+    """Yield app log lines first .. first + count - 1, per_second lines per second."""
+    begin = calendar.timegm(time.strptime(start, "%Y-%m-%d %H:%M:%S"))
+    levels = ["INFO"] * 7 + ["WARNING"] * 2 + ["ERROR"]
+    for i in range(first, first + count):
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(begin + i // per_second))
+        yield f"{stamp} {levels[i % len(levels)]} request {i} handled"
+
+
+def benchmark(lines=1_000_000, batch_size=200_000):
+    """
+    Time strptime() against the cached parser on generated log lines.
+
+    Lines are made in batches (10M strings would need GBs of memory);
+    only the parsing is timed.
+    """
+    parser_epochs = TimestampParser("iso")
+    parser_batch = TimestampParser("iso")
+
+    def run_strptime(batch):
+        for line in batch:
+            datetime.strptime(line[:19], "%Y-%m-%d %H:%M:%S")
+
+    def run_strptime_epoch(batch):
+        for line in batch:
+            strptime_epoch(line)
+
+    def run_fromisoformat_epoch(batch):
+        for line in batch:
+            datetime.fromisoformat(line[:19]).replace(tzinfo=timezone.utc).timestamp()
+
+    def run_parse(batch):
+        parse = parser_epochs.parse
+        for line in batch:
+            parse(line)
+
+    def run_parse_many(batch):
+        parser_batch.parse_many(batch)
+
+    methods = [
+        ("016: strptime() -> datetime", run_strptime),
+        ("strptime() -> epoch", run_strptime_epoch),
+        ("fromisoformat() -> epoch", run_fromisoformat_epoch),
+        ("TimestampParser.parse() -> epoch", run_parse),
+        ("TimestampParser.parse_many() -> epoch", run_parse_many),
+    ]
+    timings = Counter()
+    generated = 0
+    while generated < lines:
+        batch = list(generate_lines(min(batch_size, lines - generated), generated))
+        for name, function in methods:
+            start = time.perf_counter()
+            function(batch)
+            timings[name] += time.perf_counter() - start
+        generated += len(batch)
+
+    # All methods must agree
+    sample = list(generate_lines(5000, lines - 5000))
+    assert [strptime_epoch(line) for line in sample] == TimestampParser().parse_many(sample)
+
+    print(f"Benchmark: {lines:,} log lines")
+    baseline = timings[methods[0][0]]
+    for name, _ in methods:
+        seconds = timings[name]
+        print(f"  {name:<38} {seconds:6.2f}s  {lines / seconds:>12,.0f} lines/s  ({baseline / seconds:.1f}x)")
+
+
+def summarize_file(path, fmt="auto", year=None):
+    """Print the time span of a log file and its busiest minutes."""
+    parser = TimestampParser(fmt, year)
+    per_minute = Counter()
+    first = last = None
+    lines = bad = 0
+    start = time.perf_counter()
+    with open(path, "r", errors="replace") as f:
+        for line in f:
+            lines += 1
+            try:
+                epoch = parser.parse(line)
+            except ValueError:
+                bad += 1  # Stack traces, continuation lines
+                continue
+            if first is None:
+                first = epoch
+            last = epoch
+            per_minute[int(epoch) // 60] += 1
+    elapsed = time.perf_counter() - start
+
+    if first is None:
+        print(f"✗ No timestamps found in {path}")
+        return
+    print(f"File: {path} ({parser.format} timestamps)")
+    print(f"  {lines:,} lines, {bad:,} without a timestamp, parsed in {elapsed:.2f}s")
+    print(f"  First: {datetime.fromtimestamp(first, timezone.utc):%Y-%m-%d %H:%M:%S} UTC")
+    print(f"  Last:  {datetime.fromtimestamp(last, timezone.utc):%Y-%m-%d %H:%M:%S} UTC")
+    print("  Busiest minutes:")
+    for minute, count in sorted(per_minute.items(), key=lambda item: (-item[1], item[0]))[:5]:
+        print(f"    {datetime.fromtimestamp(minute * 60, timezone.utc):%Y-%m-%d %H:%M}  {count:,} lines")
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Fast log timestamp parsing (and a benchmark against strptime)")
+    parser.add_argument("files", nargs="*", help="log files to summarize (default: demo)")
+    parser.add_argument("--format", choices=["auto", "iso", "clf", "syslog"], default="auto",
+                        help="timestamp format (default: detect)")
+    parser.add_argument("--year", type=int, help="year for syslog timestamps (default: this year)")
+    parser.add_argument("--benchmark", type=int, nargs="?", const=10_000_000, metavar="LINES",
+                        help="only run the benchmark (default: 10,000,000 lines)")
+    return parser.parse_args()
+
+
+def main():
+    """Summarize files, run the benchmark, or show examples."""
+    args = parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+    elif args.files:
+        for path in args.files:
+            try:
+                summarize_file(path, args.format, args.year)
+            except OSError as e:
+                print(f"✗ {e}")
+                sys.exit(1)
+            print("-" * 50)
+    else:
+        print("Example 1: the same moment in different log formats")
+        for text in ["2026-01-27 14:30:00 ERROR Connection timeout",
+                     "2026-01-27T14:30:00.250Z",
+                     "2026-01-27T16:30:00+02:00",
+                     '10.0.0.1 - - [27/Jan/2026:14:30:00 +0000] "GET / HTTP/1.1" 200 12',
+                     "Jan 27 14:30:00 web-1 sshd[812]: Accepted publickey"]:
+            parser = TimestampParser(year=2026)
+            print(f"  {parser.parse(text)!s:<16} {parser.format:<7} {text[:50]}")
+        print("-" * 50)
+
+        print("Example 2: invalid timestamps raise ValueError, like strptime()")
+        # "...10:00:0" is the last line of a log whose writer was killed mid-line
+        for text in ["2026-02-30 10:00:00", "2026-01-27 10:00:61", "2026-01-27 10:00:0", "not a timestamp"]:
+            parser = TimestampParser()
+            parser.parse("2026-01-27 10:00:00")  # Format detected, minute cached
+            errors = []
+            for check in (parser.parse, lambda text: parser.parse_many(["2026-01-27 10:00:00", text])):
+                try:
+                    check(text)
+                except ValueError as e:
+                    errors.append(str(e))
+            if len(errors) == 2:
+                print(f"  ✓ {text!r}: {errors[0]}")
+            else:
+                print(f"  ✗ {text!r} was accepted by parse() or parse_many()")
+        print("-" * 50)
+
+        benchmark()
+
+    # DevOps Pro Tip
+    print("\n" + "=" * 50)
+    print("💡 Don't strptime() every line!")
+    print("   Fixed formats: slice + int()")
+    print("   Cache the date/minute - neighbours share it")
+    print("   Keep epochs (ints) until you need to print")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Streaming CSV / HTML / JSON Lines Reports
+
+WHAT: Write a report from any iterator of records (dicts) as CSV, HTML
+      or JSON Lines, one row at a time
+WHERE: Inventory exports, audit results, nightly fleet reports
+WHY: The CSV and HTML examples in 010_writing_files.py keep the whole
+     `servers` list in memory and build rows with f-strings:
+     - a comma, quote or newline in a value breaks the CSV row
+     - "<" or "&" in a value breaks the HTML (or injects a <script>)
+     - 1,000,000 hosts = 1,000,000 dicts in memory before the first byte
+
+REAL-WORLD SCENARIO:
+- Export the inventory of 1M hosts straight from a database cursor or API
+  pager, without loading it first
+- A host note says "moved, see ticket #42" - the CSV must still parse
+- A tag value contains "<b>" - the HTML report must show it, not run it
+- Turn last night's JSON Lines inventory into a CSV for the spreadsheet
+
+HOW IT WORKS:
+- Records are pulled from the iterator one at a time; only the current
+  chunk of rows (CHUNK_ROWS) is in memory, so memory stays flat whether
+  the report has 3 rows or 3 million
+- CSV: the csv module quotes commas, quotes and newlines correctly
+- HTML: every value goes through html.escape(); a chunk of rows is joined
+  into one string and written with one write() call
+- JSON Lines: one json.dumps() per record, values that JSON doesn't know
+  (datetime, Path...) are written as strings
+- Files are opened with a 1 MB buffer and written to a temporary file
+  that replaces the report only when it is complete - a reader never
+  sees half a report. Names ending in .gz are gzip-compressed
+- Columns come from the `fields` argument, or from the first record
+  (missing values are written as empty cells, extra keys are skipped)
+
+HOW TO RUN:
+    python3 030_streaming_reports.py                       # demo
+    python3 030_streaming_reports.py --hosts 1000000       # bigger demo
+    python3 030_streaming_reports.py --input inventory.jsonl --output report.html
+    python3 030_streaming_reports.py --input inventory.csv --output inventory.jsonl.gz
+
+USE IT FROM ANOTHER SCRIPT:
+    reports = importlib.import_module("030_streaming_reports")
+    rows = reports.write_report(fetch_hosts(), "inventory.csv", fields=["name", "ip", "status"])
+"""
+
+import argparse
+import csv
+import gzip
+import html
+import itertools
+import json
+import operator
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Rows formatted and written together - bounds memory per write() call
+CHUNK_ROWS = 1000
+# Buffer size of the output file
+WRITE_BUFFER = 1024 * 1024
+
+FORMATS = {".csv": "csv", ".html": "html", ".htm": "html", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+# Color of the status cell in HTML reports
+STATUS_COLORS = {
+    "running": "green", "healthy": "green", "ok": "green", "success": "green",
+    "warning": "orange", "degraded": "orange",
+    "stopped": "red", "down": "red", "failed": "red", "error": "red",
+}
+
+HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; }}
+table {{ border-collapse: collapse; }}
+th, td {{ border: 1px solid #ccc; padding: 2px 8px; text-align: left; }}
+{status_css}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<table>
+<tr>{header}</tr>
+"""
+
+HTML_TAIL = """</table>
+<p>{rows} rows</p>
+</body>
+</html>
+"""
+
+
+def detect_format(path):
+    """
+    Pick the report format from the file name.
+
+    Args:
+        path: Output file name, e.g. "inventory.csv" or "report.jsonl.gz"
+
+    Returns:
+        "csv", "html" or "jsonl"
+    """
+    name = path[:-3] if path.endswith(".gz") else path
+    extension = os.path.splitext(name)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unknown report format for {path} (use .csv, .html or .jsonl)")
+    return FORMATS[extension]
+
+
+def open_output(path, compress=False):
+    """Open a text file for writing with a large buffer (gzip if compress)."""
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+    return open(path, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER)
+
+
+def peek_fields(records, fields=None):
+    """
+    Get the column names without losing the first record.
+
+    Args:
+        records: Iterator of dicts
+        fields: Column names, or None to use the keys of the first record
+
+    Returns:
+        (fields, records) - records is an iterator that still starts
+        with the first record
+    """
+    records = iter(records)
+    if fields is not None:
+        return list(fields), records
+    first = next(records, None)
+    if first is None:
+        return [], records
+    return list(first), itertools.chain([first], records)
+
+
+def chunks(records, size=CHUNK_ROWS):
+    """Yield lists of up to `size` records."""
+    records = iter(records)
+    while True:
+        chunk = list(itertools.islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def row_values(chunk, fields):
+    """
+    Turn a chunk of dicts into rows of values in column order.
+
+    Uses one itemgetter call per record; only a chunk with a missing key
+    takes the slower .get() path (missing values become None).
+    """
+    if len(fields) == 1:
+        return [(record.get(fields[0]),) for record in chunk]
+    getter = operator.itemgetter(*fields)
+    try:
+        return [getter(record) for record in chunk]
+    except KeyError:
+        return [tuple(record.get(field) for field in fields) for record in chunk]
+
+
+def write_csv(records, f, fields):
+    """Write records to an open file as CSV. Returns the number of rows."""
+    writer = csv.writer(f)
+    writer.writerow(fields)
+    count = 0
+    for chunk in chunks(records):
+        writer.writerows(row_values(chunk, fields))
+        count += len(chunk)
+    return count
+
+
+def write_html(records, f, fields, title="Report", status_field="status"):
+    """
+    Write records to an open file as an HTML table.
+
+    Every value is escaped, so "<", "&" and quotes show up as text.
+
+    Args:
+        records: Iterator of dicts
+        f: File opened for writing (text)
+        fields: Column names
+        title: Page title and heading
+        status_field: Column whose cells are colored by STATUS_COLORS
+
+    Returns:
+        Number of rows written
+    """
+    status_css = "\n".join(f"td.status-{status} {{ color: {color}; }}" for status, color in STATUS_COLORS.items())
+    header = "".join(f"<th>{html.escape(field)}</th>" for field in fields)
+    f.write(HTML_HEAD.format(title=html.escape(title), status_css=status_css, header=header))
+
+    status_column = fields.index(status_field) if status_field in fields else -1
+    escape = html.escape
+    count = 0
+    for chunk in chunks(records):
+        rows = []
+        for values in row_values(chunk, fields):
+            cells = []
+            for column, value in enumerate(values):
+                value = "" if value is None else escape(str(value))
+                if column == status_column:
+                    cells.append(f'<td class="status-{value.lower()}">{value}</td>')
+                else:
+                    cells.append(f"<td>{value}</td>")
+            rows.append(f"<tr>{''.join(cells)}</tr>\n")
+        f.write("".join(rows))
+        count += len(chunk)
+
+    f.write(HTML_TAIL.format(rows=f"{count:,}"))
+    return count
+
+
+def write_jsonl(records, f, fields=None):
+    """
+    Write records to an open file as JSON Lines (one JSON object per line).
+
+    Args:
+        records: Iterator of dicts
+        f: File opened for writing (text)
+        fields: Keep only these keys, or None to write whole records
+
+    Returns:
+        Number of rows written
+    """
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+    encode = encoder.encode
+    count = 0
+    for chunk in chunks(records):
+        if fields:
+            chunk = [{field: record.get(field) for field in fields} for record in chunk]
+        f.write("".join([encode(record) + "\n" for record in chunk]))
+        count += len(chunk)
+    return count
+
+
+def write_report(records, path, fields=None, fmt=None, title="Report"):
+    """
+    Stream records into a CSV, HTML or JSON Lines report.
+
+    The report is written to path + ".tmp" and renamed over `path` when it
+    is complete. If writing fails, the old report is left as it was.
+
+    Args:
+        records: Any iterable of dicts - a list, a generator, a DB cursor
+        path: Output file (format from the extension, .gz = compressed)
+        fields: Column names, or None to use the keys of the first record
+        fmt: "csv", "html" or "jsonl" to override the extension
+        title: Title of HTML reports
+
+    Returns:
+        Number of rows written
+    """
+    fmt = fmt or detect_format(path)
+    if fmt == "jsonl" and fields is None:
+        records = iter(records)
+    else:
+        fields, records = peek_fields(records, fields)
+
+    tmp_path = f"{path}.tmp"
+    try:
+        with open_output(tmp_path, compress=path.endswith(".gz")) as f:
+            if fmt == "csv":
+                count = write_csv(records, f, fields)
+            elif fmt == "html":
+                count = write_html(records, f, fields, title=title)
+            elif fmt == "jsonl":
+                count = write_jsonl(records, f, fields)
+            else:
+                raise ValueError(f"Unknown report format: {fmt}")
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+def read_records(path):
+    """
+    Read records back from a CSV or JSON Lines file, one at a time.
+
+    Args:
+        path: .csv or .jsonl file (optionally .gz)
+
+    Yields:
+        One dict per row
+    """
+    fmt = detect_format(path)
+    if fmt == "html":
+        raise ValueError("HTML reports can't be read back - use CSV or JSON Lines")
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def generate_inventory(count):
+    """
+    Yield `count` fake hosts, one at a time (nothing is kept in memory).
+
+    Some notes contain commas, quotes, newlines and HTML on purpose.
+    """
+    statuses = ("running", "running", "running", "stopped", "degraded")
+    regions = ("us-east-1", "eu-west-1", "ap-south-1")
+    notes = ("", "", "moved, see ticket #42", 'owner says "do not reboot"',
+             "disk replaced\nreboot pending", "tag <b>prod</b> & <script>alert(1)</script>")
+    for i in range(count):
+        yield {
+            "name": f"web-{i:07d}",
+            "ip": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}",
+            "status": statuses[i % len(statuses)],
+            "region": regions[i % len(regions)],
+            "cpu": i * 7 % 100,
+            "notes": notes[i % len(notes)],
+        }
+
+
+def write_csv_fstring(servers, path):
+    """The 010_writing_files.py way: f-strings, one write() per row."""
+    with open(path, "w") as f:
+        f.write("name,ip,status,region,cpu,notes\n")
+        for server in servers:
+            f.write(f"{server['name']},{server['ip']},{server['status']},"
+                    f"{server['region']},{server['cpu']},{server['notes']}\n")
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process in MB (Linux reports KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_streaming(hosts, path):
+    """Stream a generated inventory into a report (runs in a fresh process)."""
+    base = peak_memory_mb()
+    start = time.perf_counter()
+    rows = write_report(generate_inventory(hosts), path)
+    return rows, time.perf_counter() - start, peak_memory_mb() - base
+
+
+def _run_in_memory(hosts, path):
+    """Build the whole list first, then write f-strings (runs in a fresh process)."""
+    base = peak_memory_mb()
+    start = time.perf_counter()
+    servers = list(generate_inventory(hosts))
+    write_csv_fstring(servers, path)
+    return len(servers), time.perf_counter() - start, peak_memory_mb() - base
+
+
+def in_fresh_process(function, *args):
+    """Run function in its own process so its peak memory is measured alone."""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(function, *args).result()
+
+
+def demo(hosts=200_000):
+    """Compare f-string CSV with streaming reports and show the escaping."""
+    directory = "/tmp/test_devops_reports"
+    os.makedirs(directory, exist_ok=True)
+
+    print("Example 1: f-string CSV vs csv module")
+    sample = list(generate_inventory(6))
+    write_csv_fstring(sample, f"{directory}/fstring.csv")
+    write_report(sample, f"{directory}/small.csv")
+    for label, path in (("f-string", f"{directory}/fstring.csv"), ("csv module", f"{directory}/small.csv")):
+        with open(path, newline="") as f:
+            widths = [len(row) for row in csv.reader(f)]
+        status = "✓" if widths == [6] * 7 else "✗"
+        print(f"  {status} {label:<10}: {len(widths)} rows read back, columns per row: {widths}")
+    print(f"  ✓ value with comma/quote/newline kept: {list(read_records(f'{directory}/small.csv'))[4]['notes']!r}")
+    print("-" * 50)
+
+    print("Example 2: HTML escaping")
+    write_report(sample, f"{directory}/small.html", title="Server Status Report")
+    with open(f"{directory}/small.html") as f:
+        page = f.read()
+    status = "✗" if "<script>" in page else "✓"
+    print(f"  {status} <script> written as text: {'&lt;script&gt;' in page}")
+    print(f"  ✓ {directory}/small.html (open it in a browser)")
+    print("-" * 50)
+
+    print(f"Example 3: {hosts:,} hosts - memory and time")
+    rows, seconds, memory = in_fresh_process(_run_in_memory, hosts, f"{directory}/fstring.csv")
+    print(f"  list + f-strings : {rows:,} rows in {seconds:.2f}s, +{memory:.0f} MB memory")
+    for name in ("inventory.csv", "inventory.jsonl", "inventory.html", "inventory.csv.gz"):
+        path = f"{directory}/{name}"
+        rows, seconds, memory = in_fresh_process(_run_streaming, hosts, path)
+        size = os.path.getsize(path) / 1024 / 1024
+        print(f"  {name:<17}: {rows:,} rows in {seconds:.2f}s, +{memory:.0f} MB memory ({size:.0f} MB file)")
+    print("-" * 50)
+
+    print("Example 4: Read back and convert")
+    count = 0
+    start = time.perf_counter()
+    for count, record in enumerate(read_records(f"{directory}/inventory.csv.gz"), 1):
+        pass
+    status = "✓" if count == hosts else "✗"
+    print(f"  {status} inventory.csv.gz read back: {count:,} rows in {time.perf_counter() - start:.2f}s")
+    running = (record for record in read_records(f"{directory}/inventory.jsonl") if record["status"] == "running")
+    rows = write_report(running, f"{directory}/running.csv", fields=["name", "ip", "region"])
+    print(f"  ✓ jsonl -> csv, running hosts only: {rows:,} rows in {directory}/running.csv")
+    print("-" * 50)
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Streaming CSV/HTML/JSON Lines report writer")
+    parser.add_argument("--input", help="CSV or JSON Lines file to convert")
+    parser.add_argument("--output", help="report file: .csv, .html or .jsonl (add .gz to compress)")
+    parser.add_argument("--fields", help="comma-separated columns to keep (default: all)")
+    parser.add_argument("--title", default="Report", help="title of HTML reports")
+    parser.add_argument("--hosts", type=int, default=200_000, help="hosts in the demo inventory (default: 200000)")
+    return parser.parse_args()
+
+
+def main():
+    """Convert a file, or run the demo."""
+    args = parse_args()
+
+    if args.input or args.output:
+        if not (args.input and args.output):
+            print("✗ --input and --output go together")
+            sys.exit(1)
+        fields = args.fields.split(",") if args.fields else None
+        try:
+            rows = write_report(read_records(args.input), args.output, fields=fields, title=args.title)
+        except (OSError, ValueError) as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        print(f"✓ Wrote {rows:,} rows to {args.output}")
+    else:
+        demo(args.hosts)
+
+    # DevOps Pro Tip
+    print("\n" + "=" * 50)
+    print("💡 Reports: stream them, escape them!")
+    print("   Pass a generator, not a list - memory stays flat")
+    print("   csv module for CSV, html.escape() for HTML")
+    print("   Write to .tmp, then os.replace() - never half a report")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
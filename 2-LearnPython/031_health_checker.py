@@ -0,0 +1,709 @@
+#!/usr/bin/env python3
+"""
+Concurrent HTTP Health Checker
+
+WHAT: Check thousands of HTTP endpoints at once over pooled keep-alive
+      connections and print each result as soon as it is known
+WHERE: Fleet health checks, smoke tests after a deploy, uptime cron jobs
+WHY: check_health() in 019_http_requests.py checks one URL at a time and
+     opens a new connection (TCP + TLS handshake) for every check.
+     5,000 endpoints x (handshake + response) one after another = minutes,
+     and one dead host adds a full timeout to the total
+
+REAL-WORLD SCENARIO:
+- After a deploy, check /health on all 5,000 service instances in seconds
+- 20 instances of the same service share a host:port - reuse connections
+- The batch job host answers slowly on purpose: give it its own timeout
+- A cron job exits 1 if anything is unhealthy and lists only failures
+
+HOW IT WORKS:
+- HTTPPool keeps idle keep-alive connections per (scheme, host, port)
+  and hands them back out: a check to a host that was seen before skips
+  the TCP and TLS handshake. A semaphore per host caps how many
+  connections one host gets (--max-per-host), so 5,000 checks to one
+  load balancer don't open 5,000 sockets
+- A connection the server closed while idle is detected on reuse and the
+  request is sent once more on a fresh connection (GET/HEAD/PUT/DELETE
+  only - a POST could run twice)
+- check_all() runs checks in a thread pool (--concurrency). URLs are
+  submitted a few at a time, so a list of a million URLs is never all in
+  flight, and results are yielded in completion order: fast hosts report
+  at once, slow ones don't hold them back
+- Timeouts are per host (--host-timeout 'batch-*=30'), exact host name
+  first, then shell-style patterns, then --timeout
+- Circuit breaker per endpoint (CircuitBreakers): after --breaker-failures
+  failed checks in a row the endpoint is "open" and reported down at
+  once, without a request. After --breaker-reset seconds one probe is let
+  through ("half-open"): success closes the circuit, failure opens it again
+- Hedged requests (--replica, --hedge-after): if the endpoint hasn't
+  answered within --hedge-after seconds, the same check is also sent to
+  its replica, and the first healthy answer wins. This cuts the slow tail
+  (p99) for a few percent of extra requests
+- Only the standard library is used (http.client), no 'requests' needed
+
+HOW TO RUN:
+    python3 031_health_checker.py                       # demo with local test servers
+    python3 031_health_checker.py --demo 20000
+    python3 031_health_checker.py --url https://example.com --url https://api.github.com
+    python3 031_health_checker.py --file urls.txt --concurrency 200 --failures-only
+    python3 031_health_checker.py --file urls.txt --timeout 2 --host-timeout 'batch-*=30'
+    python3 031_health_checker.py --file urls.txt --every 10       # keep checking, with circuit breakers
+    python3 031_health_checker.py --url http://a:8080/health --replica http://a:8080/health=http://b:8080/health --hedge-after 0.2
+    (034_fault_server.py shows the breaker and hedging against failing servers)
+
+USE IT FROM ANOTHER SCRIPT:
+    health = importlib.import_module("031_health_checker")
+    for result in health.check_all(urls, concurrency=100, timeout=3):
+        if not result.healthy:
+            print(result.url, result.message)
+"""
+
+import argparse
+import fnmatch
+import http.client
+import http.server
+import itertools
+import queue
+import socket
+import ssl
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_CONCURRENCY = 64
+DEFAULT_MAX_PER_HOST = 16
+DEFAULT_BREAKER_FAILURES = 3
+DEFAULT_BREAKER_RESET = 30.0
+# Bodies larger than this are not read; the connection is closed instead
+MAX_BODY = 1024 * 1024
+# Safe to send again when a reused connection turns out to be closed
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+HealthResult = namedtuple("HealthResult", ["url", "healthy", "status", "message", "seconds"])
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class HTTPPool:
+    """
+    Thread-safe pool of keep-alive HTTP(S) connections, per host.
+
+    Every request borrows an idle connection to the host (or opens one),
+    and gives it back when the response has been read completely.
+    """
+
+    def __init__(self, max_per_host=DEFAULT_MAX_PER_HOST, timeout=DEFAULT_TIMEOUT, verify=True, headers=None):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.headers = {"User-Agent": "devops-health-checker/1.0"}
+        self.headers.update(headers or {})
+        self.opened = 0  # Connections opened so far (reused ones are not counted)
+        self._context = ssl.create_default_context()
+        if not verify:
+            self._context.check_hostname = False
+            self._context.verify_mode = ssl.CERT_NONE
+        self._idle = {}
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, key):
+        """Semaphore that limits connections to one host."""
+        with self._lock:
+            if key not in self._slots:
+                self._slots[key] = threading.BoundedSemaphore(self.max_per_host)
+                self._idle[key] = []
+            return self._slots[key]
+
+    def _borrow(self, key, timeout):
+        """Return (connection, reused) - an idle connection or a new one."""
+        with self._lock:
+            idle = self._idle[key]
+            connection = idle.pop() if idle else None
+        if connection is not None:
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+            return connection, True
+
+        scheme, host, port = key
+        if scheme == "https":
+            connection = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._context)
+        else:
+            connection = http.client.HTTPConnection(host, port, timeout=timeout)
+        with self._lock:
+            self.opened += 1
+        return connection, False
+
+    def _give_back(self, key, connection):
+        with self._lock:
+            self._idle[key].append(connection)
+
+    def request(self, method, url, body=None, headers=None, timeout=None, max_body=MAX_BODY):
+        """
+        Send one request over a pooled connection.
+
+        Args:
+            method: "GET", "HEAD", "POST"...
+            url: Full URL (http:// or https://)
+            body: Request body (bytes) or None
+            headers: Extra headers for this request
+            timeout: Seconds for connecting and for each read (default: pool timeout)
+            max_body: Read at most this many bytes of the body (None = all of it)
+
+        Returns:
+            (status, headers, body) - headers is a dict with lower-case names,
+            body is cut to max_body bytes
+
+        Raises:
+            OSError or http.client.HTTPException: connection failed or timed out
+        """
+        parsed = urllib.parse.urlsplit(url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise ValueError(f"Invalid URL: {url}")
+        key = (parsed.scheme, parsed.hostname, parsed.port)
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+        request_headers = dict(self.headers)
+        request_headers.update(headers or {})
+        timeout = self.timeout if timeout is None else timeout
+
+        with self._slot(key):
+            while True:
+                connection, reused = self._borrow(key, timeout)
+                try:
+                    connection.request(method, path, body=body, headers=request_headers)
+                    response = connection.getresponse()
+                    payload = response.read() if max_body is None else response.read(max_body + 1)
+                except TimeoutError:
+                    connection.close()
+                    raise
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    if reused and method in IDEMPOTENT_METHODS:
+                        continue  # The server closed the idle connection - try a new one
+                    raise
+                break
+
+        if max_body is not None and len(payload) > max_body:
+            connection.close()  # Unread body left on the connection
+            payload = payload[:max_body]
+        elif response.will_close:
+            connection.close()
+        else:
+            self._give_back(key, connection)
+        response_headers = {name.lower(): value for name, value in response.getheaders()}
+        return response.status, response_headers, payload
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            for idle in self._idle.values():
+                for connection in idle:
+                    connection.close()
+                idle.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def timeout_for(host, timeouts, default=DEFAULT_TIMEOUT):
+    """
+    Find the timeout for a host.
+
+    Args:
+        host: Host name from the URL
+        timeouts: {host or pattern: seconds}, e.g. {"batch-*": 30}
+        default: Timeout when nothing matches
+
+    Returns:
+        Seconds
+    """
+    if not timeouts:
+        return default
+    if host in timeouts:
+        return timeouts[host]
+    for pattern, seconds in timeouts.items():
+        if fnmatch.fnmatch(host, pattern):
+            return seconds
+    return default
+
+
+class CircuitBreaker:
+    """
+    Stop checking an endpoint that keeps failing, and probe it now and then.
+
+    closed    -> checks go through; `failures` failures in a row open it
+    open      -> checks fail at once; after `reset_timeout` seconds it
+                 turns half-open
+    half-open -> ONE probe goes through: success closes the circuit,
+                 failure opens it for another `reset_timeout` seconds
+    """
+
+    def __init__(self, failures=DEFAULT_BREAKER_FAILURES, reset_timeout=DEFAULT_BREAKER_RESET):
+        self.max_failures = failures
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """True if a request may be sent now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record(self, success):
+        """Report the outcome of a request that allow() let through."""
+        with self._lock:
+            self._probing = False
+            if success:
+                self.state = CLOSED
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.max_failures:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def retry_in(self):
+        """Seconds until the next probe (0 if not open)."""
+        with self._lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per endpoint URL, created when first needed."""
+
+    def __init__(self, failures=DEFAULT_BREAKER_FAILURES, reset_timeout=DEFAULT_BREAKER_RESET):
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            breaker = self._breakers.get(url)
+            if breaker is None:
+                breaker = self._breakers[url] = CircuitBreaker(self.failures, self.reset_timeout)
+            return breaker
+
+    def states(self):
+        """{url: state} of every endpoint seen so far."""
+        with self._lock:
+            return {url: breaker.state for url, breaker in self._breakers.items()}
+
+
+def describe_error(error, timeout):
+    """Short reason for a failed check."""
+    if isinstance(error, TimeoutError):
+        return f"Timeout after {timeout:g}s"
+    if isinstance(error, ConnectionRefusedError):
+        return "Connection refused"
+    if isinstance(error, socket.gaierror):
+        return "Unknown host"
+    if isinstance(error, ssl.SSLError):
+        return f"TLS error: {error.reason or error}"
+    return str(error) or type(error).__name__
+
+
+def _check_once(pool, url, timeout, expect_status, breakers=None):
+    """Send one check, unless the endpoint's circuit is open."""
+    breaker = breakers.get(url) if breakers else None
+    if breaker is not None and not breaker.allow():
+        return HealthResult(url, False, None, f"Circuit open (next probe in {breaker.retry_in():.1f}s)", 0.0)
+    start = time.perf_counter()
+    try:
+        status, _, _ = pool.request("GET", url, timeout=timeout)
+    except (OSError, http.client.HTTPException, ValueError) as e:
+        result = HealthResult(url, False, None, describe_error(e, timeout), time.perf_counter() - start)
+    else:
+        seconds = time.perf_counter() - start
+        if status == expect_status:
+            result = HealthResult(url, True, status, "Healthy", seconds)
+        else:
+            result = HealthResult(url, False, status, f"Status {status}", seconds)
+    if breaker is not None:
+        breaker.record(result.healthy)
+    return result
+
+
+def _check_hedged(pool, urls, timeout, expect_status, breakers, hedge_after):
+    """
+    Check urls[0]; if no answer within hedge_after seconds (or it failed),
+    also check the next URL. Returns the first healthy result, or the
+    primary's failure if none was healthy.
+    """
+    start = time.perf_counter()
+    results = queue.Queue()
+    failures = []
+    started = 0
+
+    def attempt(url):
+        results.put(_check_once(pool, url, timeout, expect_status, breakers))
+
+    while True:
+        if started < len(urls):
+            threading.Thread(target=attempt, args=(urls[started],), daemon=True).start()
+            started += 1
+        try:
+            wait = hedge_after if started < len(urls) else None
+            result = results.get(timeout=wait)
+        except queue.Empty:
+            continue  # Too slow - hedge to the next replica
+        if result.healthy:
+            seconds = time.perf_counter() - start
+            if result.url != urls[0]:
+                return HealthResult(urls[0], True, result.status, f"Healthy (via {result.url})", seconds)
+            return result._replace(seconds=seconds)
+        failures.append(result)
+        if len(failures) == len(urls):
+            primary = next((failure for failure in failures if failure.url == urls[0]), failures[0])
+            return primary._replace(url=urls[0], seconds=time.perf_counter() - start)
+        # A failure: the loop hedges to the next replica at once
+
+
+def check_url(pool, url, timeout=DEFAULT_TIMEOUT, expect_status=200, breakers=None,
+              replicas=None, hedge_after=None):
+    """
+    Check one URL.
+
+    Args:
+        pool: HTTPPool to send the request through
+        url: URL to check
+        timeout: Seconds for connecting and reading
+        expect_status: Status code that means healthy
+        breakers: CircuitBreakers - skip endpoints whose circuit is open
+        replicas: Other URLs that answer the same check (for hedging)
+        hedge_after: Seconds to wait before also asking the next replica
+
+    Returns:
+        HealthResult(url, healthy, status, message, seconds)
+    """
+    if replicas and hedge_after is not None:
+        return _check_hedged(pool, [url] + list(replicas), timeout, expect_status, breakers, hedge_after)
+    return _check_once(pool, url, timeout, expect_status, breakers)
+
+
+def check_health(url, pool=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Check if service is healthy - same interface as 019_http_requests.py.
+
+    Returns:
+        (healthy, message)
+    """
+    if pool is None:
+        with HTTPPool(timeout=timeout) as pool:
+            result = check_url(pool, url, timeout)
+    else:
+        result = check_url(pool, url, timeout)
+    return result.healthy, result.message
+
+
+def check_all(urls, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT, timeouts=None,
+              pool=None, expect_status=200, breakers=None, replicas=None, hedge_after=None):
+    """
+    Check many URLs at once and yield results as they complete.
+
+    Args:
+        urls: Any iterable of URLs (read lazily)
+        concurrency: Checks running at the same time
+        timeout: Default timeout per check
+        timeouts: {host or pattern: seconds} overriding the default
+        pool: HTTPPool to use (a new one is created and closed if None)
+        expect_status: Status code that means healthy
+        breakers: CircuitBreakers kept between calls (endpoints known to be
+            down are reported at once)
+        replicas: {url: [replica urls]} for hedged requests
+        hedge_after: Seconds before a slow check is also sent to a replica
+
+    Yields:
+        HealthResult, in completion order
+    """
+    own_pool = pool is None
+    if own_pool:
+        pool = HTTPPool(timeout=timeout)
+    urls = iter(urls)
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="health")
+    pending = set()
+    try:
+        while True:
+            # Keep at most 2x concurrency checks submitted
+            for url in itertools.islice(urls, 2 * concurrency - len(pending)):
+                host = urllib.parse.urlsplit(url).hostname or ""
+                pending.add(executor.submit(check_url, pool, url, timeout_for(host, timeouts, timeout),
+                                            expect_status, breakers, (replicas or {}).get(url), hedge_after))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if own_pool:
+            pool.close()
+
+
+def check_health_serial(url, timeout=DEFAULT_TIMEOUT):
+    """The 019_http_requests.py way: a new connection per check, one at a time."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            return response.status == 200, "Healthy"
+    except OSError as e:
+        return False, str(e)
+
+
+def read_urls(path):
+    """Yield URLs from a file, one per line (blank lines and # comments skipped)."""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+class TestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Stand-in for a fleet of services (keep-alive, HTTP/1.1).
+
+    /health/<n>  200, or 503 for every 97th instance
+    /slow/<n>    answers after the server's `slow` seconds
+
+    A local server answers in microseconds; `latency` (per request) and
+    `handshake` (per new connection) add the delays of a real network.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately - without this, Nagle's
+    # algorithm + delayed ACK add ~40 ms to every keep-alive answer
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        time.sleep(self.server.handshake)
+
+    def do_GET(self):
+        kind, _, number = self.path.strip("/").partition("/")
+        time.sleep(self.server.slow if kind == "slow" else self.server.latency)
+        status = 503 if number.isdigit() and int(number) % 97 == 96 else 200
+        body = b'{"status": "ok"}' if status == 200 else b'{"status": "unavailable"}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep the demo output readable
+
+
+class TestServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+def start_test_server(address="127.0.0.1", latency=0.0, handshake=0.0, slow=2.0):
+    """Start a local test server in a thread. Returns (server, base_url)."""
+    server = TestServer((address, 0), TestHandler)
+    server.latency = latency
+    server.handshake = handshake
+    server.slow = slow
+    threading.Thread(target=server.serve_forever, name="test-server", daemon=True).start()
+    return server, f"http://{address}:{server.server_address[1]}"
+
+
+def closed_port():
+    """A local port with nothing listening on it."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def demo(endpoints=5000, concurrency=DEFAULT_CONCURRENCY):
+    """Check a simulated fleet served by local test servers."""
+    # 4 "data centers": 20 ms per request, 30 ms to set up a connection (TCP + TLS)
+    servers = [start_test_server(latency=0.02, handshake=0.03) for _ in range(4)]
+    urls = [f"{servers[i % 4][1]}/health/{i}" for i in range(endpoints)]
+    print("Test servers answer in 20 ms, a new connection costs 30 ms more\n")
+
+    serial_count = min(100, endpoints)
+    print(f"Example 1: One at a time, new connection per check ({serial_count} URLs)")
+    start = time.perf_counter()
+    healthy = sum(check_health_serial(url)[0] for url in urls[:serial_count])
+    seconds = time.perf_counter() - start
+    print(f"  {healthy}/{serial_count} healthy in {seconds:.2f}s "
+          f"({serial_count / seconds:,.0f} checks/s, {serial_count} connections)")
+    print(f"  -> {endpoints:,} endpoints would take ~{seconds * endpoints / serial_count:.1f}s")
+    print("-" * 50)
+
+    print(f"Example 2: Pooled and concurrent ({endpoints:,} URLs, concurrency {concurrency})")
+    pool = HTTPPool()
+    start = time.perf_counter()
+    first = None
+    failed = []
+    shown = 0
+    for result in check_all(urls, concurrency=concurrency, pool=pool):
+        if first is None:
+            first = time.perf_counter() - start
+        if result.healthy and shown < 3:
+            print(f"  ✓ {result.url}: {result.message} ({result.seconds * 1000:.0f} ms)")
+            shown += 1
+        elif not result.healthy:
+            failed.append(result)
+    seconds = time.perf_counter() - start
+    print("  ...")
+    print(f"  {endpoints - len(failed):,} healthy, {len(failed)} unhealthy in {seconds:.2f}s "
+          f"({endpoints / seconds:,.0f} checks/s)")
+    print(f"  First result after {first * 1000:.0f} ms; {pool.opened} connections for {endpoints:,} checks")
+    expected = sum(1 for i in range(endpoints) if i % 97 == 96)
+    status = "✓" if len(failed) == expected and all(r.status == 503 for r in failed) else "✗"
+    print(f"  {status} every 97th instance reported: {failed[0].message if failed else '-'}")
+    pool.close()
+    print("-" * 50)
+
+    print("Example 3: Slow and dead hosts with per-host timeouts")
+    slow_server, slow_url = start_test_server(slow=3.0)
+    slow_url = slow_url.replace("127.0.0.1", "localhost")  # Its own host name, its own timeout
+    dead_url = f"http://127.0.0.1:{closed_port()}"
+    mixed = [f"{servers[0][1]}/health/{i}" for i in range(20)]
+    mixed += [f"{slow_url}/slow/{i}" for i in range(5)]
+    mixed += [f"{dead_url}/health/{i}" for i in range(5)]
+    start = time.perf_counter()
+    for result in check_all(mixed, timeout=5, timeouts={"localhost": 0.5}):
+        if not result.healthy and result.url.endswith("/0"):
+            print(f"  ✗ {result.url}: {result.message} ({result.seconds * 1000:.0f} ms)")
+    seconds = time.perf_counter() - start
+    status = "✓" if seconds < 3 else "✗"
+    print(f"  {status} 30 checks, 5 slow + 5 dead, done in {seconds:.2f}s (serial: 5 x 3s slow at least)")
+    print("-" * 50)
+
+    for server, _ in servers + [(slow_server, None)]:
+        server.shutdown()
+    return not failed
+
+
+def parse_host_timeout(text):
+    """'batch-*=30' -> ('batch-*', 30.0)"""
+    host, separator, seconds = text.partition("=")
+    try:
+        return host, float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected HOST=SECONDS, got {text!r}") from None
+
+
+def parse_replica(text):
+    """'http://a/health=http://b/health' -> ('http://a/health', 'http://b/health')"""
+    split = text.find("=http", 1)
+    if split < 0:
+        raise argparse.ArgumentTypeError(f"expected URL=REPLICA_URL, got {text!r}")
+    return text[:split], text[split + 1:]
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Concurrent HTTP health checker")
+    parser.add_argument("--url", action="append", default=[], help="URL to check (repeatable)")
+    parser.add_argument("--file", help="file with one URL per line")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"checks at the same time (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--max-per-host", type=int, default=DEFAULT_MAX_PER_HOST,
+                        help=f"connections per host (default: {DEFAULT_MAX_PER_HOST})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"seconds per check (default: {DEFAULT_TIMEOUT:g})")
+    parser.add_argument("--host-timeout", type=parse_host_timeout, action="append", default=[],
+                        metavar="HOST=SECONDS", help="timeout for a host or pattern (repeatable)")
+    parser.add_argument("--expect-status", type=int, default=200, help="healthy status code (default: 200)")
+    parser.add_argument("--failures-only", action="store_true", help="print only unhealthy endpoints")
+    parser.add_argument("--insecure", action="store_true", help="don't verify TLS certificates")
+    parser.add_argument("--every", type=float, metavar="SECONDS", help="keep checking every SECONDS")
+    parser.add_argument("--breaker-failures", type=int, default=DEFAULT_BREAKER_FAILURES,
+                        help=f"failures in a row that open an endpoint's circuit (default: {DEFAULT_BREAKER_FAILURES})")
+    parser.add_argument("--breaker-reset", type=float, default=DEFAULT_BREAKER_RESET,
+                        help=f"seconds before an open circuit is probed again (default: {DEFAULT_BREAKER_RESET:g})")
+    parser.add_argument("--replica", type=parse_replica, action="append", default=[], metavar="URL=REPLICA",
+                        help="replica URL for hedged checks (repeatable)")
+    parser.add_argument("--hedge-after", type=float, metavar="SECONDS",
+                        help="also check the replica when URL hasn't answered after SECONDS")
+    parser.add_argument("--demo", type=int, nargs="?", const=5000, default=5000,
+                        help="endpoints in the local demo (default: 5000)")
+    return parser.parse_args()
+
+
+def run_round(args, pool, breakers, replicas):
+    """Check every URL once and print the results. Returns True if all were healthy."""
+    urls = itertools.chain(args.url, read_urls(args.file) if args.file else [])
+    counts = {True: 0, False: 0}
+    start = time.perf_counter()
+    for result in check_all(urls, concurrency=args.concurrency, timeout=args.timeout,
+                            timeouts=dict(args.host_timeout), pool=pool, expect_status=args.expect_status,
+                            breakers=breakers, replicas=replicas, hedge_after=args.hedge_after):
+        counts[result.healthy] += 1
+        if not (args.failures_only and result.healthy):
+            status = "✓" if result.healthy else "✗"
+            print(f"{status} {result.url}: {result.message} ({result.seconds * 1000:.0f} ms)", flush=True)
+    print(f"\n{counts[True]} healthy, {counts[False]} unhealthy in {time.perf_counter() - start:.2f}s")
+    return counts[False] == 0
+
+
+def main():
+    """Check the given URLs, or run the demo."""
+    args = parse_args()
+    all_healthy = True
+
+    if args.url or args.file:
+        replicas = {}
+        for url, replica in args.replica:
+            replicas.setdefault(url, []).append(replica)
+        breakers = CircuitBreakers(args.breaker_failures, args.breaker_reset)
+        with HTTPPool(max_per_host=args.max_per_host, timeout=args.timeout, verify=not args.insecure) as pool:
+            try:
+                while True:
+                    all_healthy = run_round(args, pool, breakers, replicas)
+                    if not args.every:
+                        break
+                    time.sleep(args.every)
+                    print(f"\n--- {time.strftime('%H:%M:%S')} " + "-" * 38)
+            except OSError as e:
+                print(f"✗ {e}")
+                sys.exit(1)
+            except KeyboardInterrupt:
+                print("\nStopped")
+    else:
+        demo(args.demo, args.concurrency)
+
+    # DevOps Pro Tip
+    print("\n" + "=" * 50)
+    print("💡 Health checks at fleet scale!")
+    print("   Reuse connections - handshakes cost more than the check")
+    print("   Check concurrently, but cap connections per host")
+    print("   Stream results - don't wait for the slowest host")
+    print("=" * 50)
+
+    if not all_healthy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
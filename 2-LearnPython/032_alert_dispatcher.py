@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+Rate-Limited Webhook Alert Dispatcher
+
+WHAT: Queue alerts, merge duplicates, and deliver them to a webhook
+      (Slack, Teams, Mattermost...) as digest messages from a background
+      thread, within the webhook's rate limit
+WHERE: Monitoring scripts, deploy tools, log watchers - anything that
+       alerts a chat channel
+WHY: send_slack_alert() in 019_http_requests.py POSTs every alert right
+     away. During an incident 50 hosts x 20 checks = 1,000 POSTs in a
+     minute: Slack allows about 1 message per second per webhook, answers
+     429 Too Many Requests, and the alerts that matter are lost in the
+     flood (or never arrive). Every caller also waits for the HTTP round trip
+
+REAL-WORLD SCENARIO:
+- 020_simple_monitoring.py finds 50 hosts down and alerts every 10s
+- The channel should get ONE message "50 alerts" - not 1,000 messages
+- "web-01 is down" repeated 20 times shows up once, with "(x20)"
+- The webhook says 429 + Retry-After: 30 - wait 30s, then send the rest
+- The monitoring loop must not slow down while Slack is slow
+
+HOW IT WORKS:
+- alert() only updates an in-memory queue and returns (microseconds)
+- Coalescing: alerts with the same key (default: the message) that are
+  still waiting are merged and counted. Once a key is taken for sending,
+  repeats in the next `window` seconds (also those arriving while the
+  POST is in flight) wait and go out as one "(xN)" line later
+- Batching: a worker thread waits `linger` seconds after the first alert
+  to collect the rest of the storm, then sends up to `max_batch` alerts
+  in one digest message (critical first)
+- Token bucket: at most `rate` messages per second (`burst` at once).
+  On 429 the rate is halved and the worker pauses for Retry-After
+  (seconds or an HTTP date); every success raises the rate again by a
+  tenth of the maximum
+- Failures (5xx, timeouts) are retried with exponential backoff; an alert
+  is dropped after `max_attempts`. Other 4xx answers (bad URL, revoked
+  token) won't get better - the batch is dropped at once. The queue
+  holds at most `max_queue` distinct alerts - beyond that new ones are
+  dropped and counted
+- Messages are POSTed over the keep-alive pool from 031_health_checker.py
+
+HOW TO RUN:
+    python3 032_alert_dispatcher.py          # demo with a local rate-limited webhook
+    python3 032_alert_dispatcher.py --webhook https://hooks.slack.com/services/XXX --message "Deploy finished"
+
+USE IT FROM ANOTHER SCRIPT:
+    alerts = importlib.import_module("032_alert_dispatcher")
+    dispatcher = alerts.AlertDispatcher(webhook_url)
+    dispatcher.alert("web-01 is down", severity="critical")
+    ...
+    dispatcher.close()  # Sends what is still queued
+"""
+
+import argparse
+import email.utils
+import http.client
+import http.server
+import importlib
+import json
+import sys
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+
+health_checker = importlib.import_module("031_health_checker")
+
+DEFAULT_RATE = 1.0  # Messages per second (Slack: about 1 per second per webhook)
+DEFAULT_BURST = 3
+DEFAULT_WINDOW = 60.0
+DEFAULT_LINGER = 1.0
+DEFAULT_MAX_BATCH = 20
+DEFAULT_MAX_QUEUE = 10_000
+DEFAULT_MAX_ATTEMPTS = 5
+
+SEVERITIES = {"critical": 0, "error": 1, "warning": 2, "info": 3}
+
+
+class TokenBucket:
+    """
+    Allow `rate` events per second on average, `capacity` at once.
+
+    The rate can be changed while running (adaptive rate limiting).
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self):
+        """
+        Take one token if there is one.
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+def parse_retry_after(value, default=1.0):
+    """
+    Seconds to wait from a Retry-After header ("30" or an HTTP date).
+
+    Args:
+        value: Header value or None
+        default: Seconds if the header is missing or invalid
+
+    Returns:
+        Seconds (never negative)
+    """
+    if not value:
+        return default
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    return max(0.0, when.timestamp() - time.time())
+
+
+def format_digest(batch):
+    """
+    Turn a batch of alerts into one chat message.
+
+    Args:
+        batch: List of alert dicts (message, severity, count)
+
+    Returns:
+        Message text
+    """
+    batch = sorted(batch, key=lambda entry: SEVERITIES.get(entry["severity"], len(SEVERITIES)))
+
+    def line(entry):
+        repeats = f" (x{entry['count']})" if entry["count"] > 1 else ""
+        return f"[{entry['severity'].upper()}] {entry['message']}{repeats}"
+
+    if len(batch) == 1:
+        return line(batch[0])
+    events = sum(entry["count"] for entry in batch)
+    return f"{len(batch)} alerts ({events} events):\n" + "\n".join(f"• {line(entry)}" for entry in batch)
+
+
+class AlertDispatcher:
+    """
+    Deliver alerts to a webhook from a background thread.
+
+    alert() never blocks on the network. close() (or the with-block end)
+    sends what is still queued and stops the worker. A pool passed in
+    stays open - it belongs to the caller.
+    """
+
+    def __init__(self, webhook_url, rate=DEFAULT_RATE, burst=DEFAULT_BURST, window=DEFAULT_WINDOW,
+                 linger=DEFAULT_LINGER, max_batch=DEFAULT_MAX_BATCH, max_queue=DEFAULT_MAX_QUEUE,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS, timeout=10.0, pool=None):
+        self.webhook_url = webhook_url
+        self.max_rate = rate
+        self.min_rate = rate / 16
+        self.window = window
+        self.linger = linger
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self._own_pool = pool is None  # Only close a pool we created
+        self.pool = pool or health_checker.HTTPPool(max_per_host=1, timeout=timeout)
+        self.bucket = TokenBucket(rate, burst)
+        self.stats = {"received": 0, "coalesced": 0, "messages": 0, "delivered": 0,
+                      "rate_limited": 0, "retries": 0, "dropped": 0, "failed": 0}
+
+        self._pending = OrderedDict()  # key -> alert dict, oldest first
+        self._last_sent = {}           # key -> monotonic time it was last sent
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._closing = False
+        self._condition = threading.Condition()
+        self._worker = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+        self._worker.start()
+
+    def alert(self, message, severity="warning", key=None):
+        """
+        Queue an alert. Returns at once.
+
+        Args:
+            message: Alert text
+            severity: "critical", "error", "warning" or "info"
+            key: Alerts with the same key are merged (default: the message)
+
+        Returns:
+            True if queued or merged, False if dropped (queue full or closed)
+        """
+        key = message if key is None else key
+        now = time.monotonic()
+        with self._condition:
+            self.stats["received"] += 1
+            entry = self._pending.get(key)
+            if entry is not None:
+                entry["count"] += 1
+                self.stats["coalesced"] += 1
+                return True
+            if self._closing or len(self._pending) >= self.max_queue:
+                self.stats["dropped"] += 1
+                return False
+            ready_at = now + self.linger
+            last_sent = self._last_sent.get(key)
+            if last_sent is not None and now - last_sent < self.window:
+                ready_at = last_sent + self.window  # Sent recently - collect repeats until the window ends
+            self._pending[key] = {"key": key, "message": message, "severity": severity,
+                                  "count": 1, "ready_at": ready_at, "attempts": 0}
+            self._condition.notify()
+        return True
+
+    def flush(self, timeout=None):
+        """
+        Wait until everything queued has been sent (ignoring linger and window).
+
+        Returns:
+            True if the queue is empty, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            for entry in self._pending.values():
+                entry["ready_at"] = 0.0
+            self._condition.notify_all()
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self, timeout=30.0):
+        """Send what is queued (waiting at most `timeout` seconds) and stop the worker."""
+        self.flush(timeout)
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._worker.join(timeout)
+        if self._own_pool:
+            self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _next_batch(self):
+        """Wait for alerts that are ready and return up to max_batch of them (None to stop)."""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if self._closing and not self._pending:
+                    return None
+                ready = []
+                next_ready = None
+                for entry in self._pending.values():
+                    if entry["ready_at"] <= now or self._closing:
+                        ready.append(entry)
+                        if len(ready) == self.max_batch:
+                            break
+                    elif next_ready is None or entry["ready_at"] < next_ready:
+                        next_ready = entry["ready_at"]
+                if ready and now >= self._paused_until:
+                    for entry in ready:
+                        del self._pending[entry["key"]]
+                        # The window starts now: repeats during the POST wait for it too
+                        self._last_sent[entry["key"]] = now
+                    self._in_flight += 1
+                    return ready
+                if ready:
+                    wait = self._paused_until - now
+                else:
+                    wait = None if next_ready is None else next_ready - now
+                self._condition.wait(wait)
+
+    def _requeue(self, batch, delay):
+        """Put a batch that failed back in the queue, merged with newer repeats."""
+        now = time.monotonic()
+        for entry in batch:
+            entry["attempts"] += 1
+            if entry["attempts"] >= self.max_attempts:
+                self.stats["failed"] += entry["count"]
+                continue
+            newer = self._pending.pop(entry["key"], None)
+            if newer is not None:
+                entry["count"] += newer["count"]
+            entry["ready_at"] = now + delay
+            self._pending[entry["key"]] = entry
+            self._pending.move_to_end(entry["key"], last=False)  # Keep its place at the front
+
+    def _send(self, text):
+        """POST one message. Returns (status, headers) or (None, {}) on a connection error."""
+        body = json.dumps({"text": text}).encode()
+        try:
+            status, headers, _ = self.pool.request("POST", self.webhook_url, body=body,
+                                                   headers={"Content-Type": "application/json"},
+                                                   timeout=self.timeout)
+        except (OSError, http.client.HTTPException):
+            return None, {}
+        return status, headers
+
+    def _run(self):
+        """Worker thread: take batches, respect the rate limit, send, retry."""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            wait = self.bucket.take()
+            while wait:
+                time.sleep(wait)
+                wait = self.bucket.take()
+
+            status, headers = self._send(format_digest(batch))
+            now = time.monotonic()
+            with self._condition:
+                self._in_flight -= 1
+                if status is not None and status < 300:
+                    self.stats["messages"] += 1
+                    self.stats["delivered"] += sum(entry["count"] for entry in batch)
+                    for entry in batch:
+                        self._last_sent[entry["key"]] = now
+                    self.bucket.rate = min(self.max_rate, self.bucket.rate + self.max_rate / 10)
+                    if len(self._last_sent) > self.max_queue:
+                        self._last_sent = {key: sent for key, sent in self._last_sent.items()
+                                           if now - sent < self.window}
+                elif status == 429:
+                    self.stats["rate_limited"] += 1
+                    retry_after = parse_retry_after(headers.get("retry-after"))
+                    self._paused_until = now + retry_after
+                    self.bucket.rate = max(self.min_rate, self.bucket.rate / 2)
+                    self.bucket.tokens = 0
+                    for entry in batch:
+                        entry["attempts"] -= 1  # Being told to wait is not a failure
+                    self._requeue(batch, retry_after)
+                elif status is not None and status < 500:
+                    # 400/403/404...: the webhook rejects the message itself
+                    self.stats["failed"] += sum(entry["count"] for entry in batch)
+                else:
+                    self.stats["retries"] += 1
+                    self._requeue(batch, min(60.0, 2 ** batch[0]["attempts"]))
+                self._condition.notify_all()
+
+
+def send_slack_alert(webhook_url, message):
+    """The 019_http_requests.py way: one blocking POST per alert."""
+    request = urllib.request.Request(webhook_url, data=json.dumps({"text": message}).encode(),
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+class WebhookHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Stand-in for a chat webhook: answers 429 + Retry-After above
+    the server's rate, like Slack does.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        time.sleep(server.latency)
+        with server.lock:
+            if server.bucket.take():
+                status, retry_after = 429, str(server.retry_after)
+            else:
+                status, retry_after = 200, None
+                server.received.append(json.loads(body)["text"])
+            server.statuses.append(status)
+        reply = b"ok" if status == 200 else b"rate_limited"
+        self.send_response(status)
+        if retry_after:
+            self.send_header("Retry-After", retry_after)
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, format, *args):
+        pass  # Keep the demo output readable
+
+
+def start_webhook_server(rate=1.0, burst=3, retry_after=1, latency=0.05):
+    """Start a local rate-limited webhook in a thread. Returns (server, url)."""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), WebhookHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.bucket = TokenBucket(rate, burst)
+    server.retry_after = retry_after
+    server.latency = latency
+    server.received = []
+    server.statuses = []
+    threading.Thread(target=server.serve_forever, name="webhook-server", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/services/demo"
+
+
+def incident_storm(hosts=50, rounds=20):
+    """Alerts of an incident: every host reports the same problem each round."""
+    for round_number in range(rounds):
+        for host in range(hosts):
+            severity = "critical" if host < 5 else "warning"
+            yield f"web-{host:02d} is down (health check failed)", severity
+
+
+def demo():
+    """Send an incident storm naively, then through the dispatcher."""
+    storm = list(incident_storm())
+    hosts = len({message for message, _ in storm})
+
+    print(f"Example 1: One POST per alert ({len(storm):,} alerts, webhook allows 1/s)")
+    server, url = start_webhook_server()
+    start = time.perf_counter()
+    for message, _ in storm[:200]:
+        send_slack_alert(url, f"🚨 {message}")
+    seconds = time.perf_counter() - start
+    rejected = server.statuses.count(429)
+    print(f"  First 200 alerts: caller blocked {seconds:.1f}s, {rejected} rejected with 429, "
+          f"{len(server.received)} delivered")
+    print(f"  ✗ {rejected / 200:.0%} of the alerts were lost")
+    server.shutdown()
+    print("-" * 50)
+
+    print(f"Example 2: AlertDispatcher ({len(storm):,} alerts from {hosts} hosts over 3s)")
+    server, url = start_webhook_server()
+    dispatcher = AlertDispatcher(url, window=2, linger=0.5)
+    start = time.perf_counter()
+    blocked = 0.0
+    for number, (message, severity) in enumerate(storm):
+        if number and number % hosts == 0:
+            time.sleep(0.15)  # Next round of checks
+        before = time.perf_counter()
+        dispatcher.alert(message, severity=severity)
+        blocked += time.perf_counter() - before
+    print(f"  alert() x {len(storm):,}: caller blocked {blocked * 1000:.1f} ms in total")
+    dispatcher.close()
+    seconds = time.perf_counter() - start
+    delivered = "\n".join(server.received)
+    missing = [host for host in range(hosts) if f"web-{host:02d} is down" not in delivered]
+    stats = dispatcher.stats
+    print(f"  {stats['messages']} messages carried {stats['delivered']:,} alerts "
+          f"({stats['coalesced']:,} merged), {stats['rate_limited']} x 429, done in {seconds:.1f}s")
+    status = "✓" if not missing and stats["delivered"] == len(storm) else "✗"
+    print(f"  {status} every host reported, nothing lost")
+    print("  First message:")
+    for line in server.received[0].splitlines()[:4]:
+        print(f"    {line}")
+    print("    ...")
+    server.shutdown()
+    print("-" * 50)
+
+    print("Example 3: The webhook says 429 + Retry-After: 2")
+    server, url = start_webhook_server(rate=0.5, burst=1, retry_after=2)
+    # The dispatcher thinks it may send 5/s - the webhook disagrees
+    dispatcher = AlertDispatcher(url, rate=5, burst=5, linger=0, max_batch=1)
+    start = time.perf_counter()
+    for host in range(4):
+        dispatcher.alert(f"db-{host:02d} replication lag > 30s", severity="error")
+    dispatcher.close()
+    seconds = time.perf_counter() - start
+    stats = dispatcher.stats
+    status = "✓" if len(server.received) == 4 else "✗"
+    print(f"  {status} 4/4 delivered in {seconds:.1f}s after {stats['rate_limited']} x 429; "
+          f"rate lowered to {dispatcher.bucket.rate:.2f}/s")
+    server.shutdown()
+    print("-" * 50)
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Rate-limited webhook alert dispatcher")
+    parser.add_argument("--webhook", help="webhook URL to send to")
+    parser.add_argument("--message", action="append", default=[], help="alert text (repeatable)")
+    parser.add_argument("--severity", choices=SEVERITIES, default="warning", help="severity of the alerts")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help=f"messages per second (default: {DEFAULT_RATE:g})")
+    return parser.parse_args()
+
+
+def main():
+    """Send alerts to a webhook, or run the demo."""
+    args = parse_args()
+
+    if args.webhook:
+        if not args.message:
+            print("✗ Give at least one --message")
+            sys.exit(1)
+        with AlertDispatcher(args.webhook, rate=args.rate, linger=0) as dispatcher:
+            for message in args.message:
+                dispatcher.alert(message, severity=args.severity)
+        stats = dispatcher.stats
+        status = "✓" if stats["delivered"] == len(args.message) else "✗"
+        print(f"{status} {stats['delivered']}/{len(args.message)} alerts delivered in {stats['messages']} message(s)")
+        if status == "✗":
+            sys.exit(1)
+    else:
+        demo()
+
+    # DevOps Pro Tip
+    print("\n" + "=" * 50)
+    print("💡 Alerts: fewer, better messages!")
+    print("   Merge duplicates, send digests")
+    print("   Stay under the webhook rate limit, obey Retry-After")
+    print("   Never let a slow webhook block your monitoring")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
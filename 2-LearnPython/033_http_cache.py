@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+HTTP Response Cache with ETag Revalidation
+
+WHAT: Cache GET responses in memory (LRU) and optionally on disk, and
+      revalidate them with If-None-Match / If-Modified-Since
+WHERE: Scripts that poll the same API every few seconds - status pages,
+       deployment APIs, inventory endpoints, GitHub/GitLab APIs
+WHY: The API examples in 019_http_requests.py and
+     1-LearnPython/11_handling_apis/freeapi_username.py download the full
+     response on every call. A dashboard polling 20 endpoints every 5s
+     moves the same bytes again and again, and uses up API rate limits
+     (GitHub doesn't count 304 answers against the limit)
+
+REAL-WORLD SCENARIO:
+- A deploy watcher polls /api/deployments/42 every 2 seconds for 10 minutes
+- The answer only changes 3 times - the other polls should cost nothing
+- The script restarts every minute from cron - the cache must survive
+- The API has a short outage - show the last known answer, marked stale
+
+HOW IT WORKS:
+- Fresh: a cached response younger than its TTL is returned without
+  any request. The TTL is `ttl`, or the server's Cache-Control max-age
+- Stale: the request carries If-None-Match (the ETag) and/or
+  If-Modified-Since (Last-Modified). The server answers 304 Not Modified
+  with no body, and the cached body is returned and refreshed
+- Memory tier: an LRU (OrderedDict) limited by entries and bytes
+- Disk tier (cache_dir): one file per URL - a JSON header line and the
+  body - written to a temporary file and renamed, so a crash never leaves
+  half an entry. It survives restarts; the oldest files are pruned
+  when it grows past max_disk_bytes
+- Cache-Control: no-store is never cached, no-cache is always revalidated
+- Stale-if-error: when the server can't be reached, the last cached answer
+  is returned (source "stale") instead of an exception
+- The cache key is the URL plus the Accept and Authorization headers, so
+  two API tokens never share cached answers
+- Requests go through the keep-alive pool from 031_health_checker.py
+
+HOW TO RUN:
+    python3 033_http_cache.py                              # demo with a local API
+    python3 033_http_cache.py --url https://api.github.com/repos/python/cpython --poll 5 --interval 2
+    python3 033_http_cache.py --url https://api.github.com/users/github --cache-dir ~/.cache/devops_http
+
+USE IT FROM ANOTHER SCRIPT:
+    http_cache = importlib.import_module("033_http_cache")
+    cache = http_cache.CachedHTTP(ttl=10, cache_dir="~/.cache/devops_http")
+    response = cache.get("https://api.example.com/deployments/42")
+    print(response.source, response.json())
+"""
+
+import argparse
+import hashlib
+import http.client
+import http.server
+import importlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import urllib.request
+from collections import OrderedDict, namedtuple
+from email.utils import formatdate
+
+health_checker = importlib.import_module("031_health_checker")
+
+DEFAULT_TTL = 60.0
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_MAX_MEMORY = 64 * 1024 * 1024
+DEFAULT_MAX_DISK = 512 * 1024 * 1024
+# Larger responses are returned in full but not cached
+MAX_CACHED_BODY = 16 * 1024 * 1024
+
+# Request headers that change the answer - part of the cache key
+KEY_HEADERS = ("accept", "authorization")
+
+
+class CachedResponse(namedtuple("CachedResponse", ["status", "headers", "body", "source"])):
+    """
+    A response and where it came from:
+    "cache" (fresh, no request), "revalidated" (304), "network" or "stale".
+    """
+
+    __slots__ = ()
+
+    def json(self):
+        return json.loads(self.body)
+
+
+def cache_key(url, headers=None):
+    """Hash of the URL and the request headers that change the answer."""
+    headers = {name.lower(): value for name, value in (headers or {}).items()}
+    parts = [url] + [f"{name}={headers.get(name, '')}" for name in KEY_HEADERS]
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def parse_cache_control(value):
+    """'public, max-age=30' -> {'public': True, 'max-age': '30'}"""
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or True
+    return directives
+
+
+class CachedHTTP:
+    """
+    GET with a two-tier cache (memory LRU + optional disk) and conditional
+    revalidation. Safe to share between threads.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, max_memory=DEFAULT_MAX_MEMORY,
+                 cache_dir=None, max_disk_bytes=DEFAULT_MAX_DISK, stale_if_error=True, pool=None, timeout=10.0):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_memory = max_memory
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        self.max_disk_bytes = max_disk_bytes
+        self.stale_if_error = stale_if_error
+        self.pool = pool or health_checker.HTTPPool(timeout=timeout)
+        self.stats = {"cache": 0, "revalidated": 0, "network": 0, "stale": 0, "bytes": 0}
+
+        self._memory = OrderedDict()  # key -> entry, least recently used first
+        self._memory_bytes = 0
+        self._disk_bytes = None       # Counted on first disk write
+        self._lock = threading.Lock()
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    # --- memory tier -------------------------------------------------
+
+    def _memory_get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            return entry
+
+    def _memory_put(self, key, entry):
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old["body"])
+            self._memory[key] = entry
+            self._memory_bytes += len(entry["body"])
+            while self._memory and (len(self._memory) > self.max_entries or self._memory_bytes > self.max_memory):
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted["body"])
+
+    # --- disk tier ---------------------------------------------------
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.cache")
+
+    def _disk_get(self, key):
+        """Read an entry from disk, or None."""
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                entry = json.loads(f.readline())
+                entry["body"] = f.read()
+        except (OSError, ValueError):
+            return None
+        if len(entry["body"]) != entry.get("size"):
+            return None  # Truncated file
+        return entry
+
+    def _disk_put(self, key, entry):
+        """Write an entry to disk atomically, then prune if the cache is too big."""
+        path = self._disk_path(key)
+        meta = {name: value for name, value in entry.items() if name != "body"}
+        meta["size"] = len(entry["body"])
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(json.dumps(meta).encode() + b"\n")
+                f.write(entry["body"])
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(entry.stat().st_size for entry in os.scandir(self.cache_dir))
+            else:
+                self._disk_bytes += len(entry["body"])
+            if self._disk_bytes > self.max_disk_bytes:
+                self._prune_disk()
+
+    def _prune_disk(self):
+        """Delete the least recently written files until the disk tier is at 90% of its limit."""
+        files = sorted((entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                       for entry in os.scandir(self.cache_dir) if entry.name.endswith(".cache"))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_disk_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+        self._disk_bytes = total
+
+    # --- requests ----------------------------------------------------
+
+    def _expires(self, headers, now):
+        """When a response stops being fresh (epoch seconds), or None if it must not be stored."""
+        directives = parse_cache_control(headers.get("cache-control"))
+        if "no-store" in directives:
+            return None
+        if "no-cache" in directives:
+            return now
+        max_age = directives.get("max-age")
+        if isinstance(max_age, str) and max_age.isdigit():
+            return now + int(max_age)
+        return now + self.ttl
+
+    def _store(self, key, entry):
+        self._memory_put(key, entry)
+        if self.cache_dir:
+            self._disk_put(key, entry)
+
+    def _response(self, entry, source):
+        self.stats[source] += 1
+        return CachedResponse(entry["status"], entry["headers"], entry["body"], source)
+
+    def get(self, url, headers=None, timeout=None):
+        """
+        GET a URL through the cache.
+
+        Args:
+            url: URL to get
+            headers: Extra request headers
+            timeout: Seconds for the request (default: pool timeout)
+
+        Returns:
+            CachedResponse(status, headers, body, source)
+
+        Raises:
+            OSError or http.client.HTTPException: the request failed and
+            there is no cached answer to fall back to
+        """
+        key = cache_key(url, headers)
+        entry = self._memory_get(key)
+        if entry is None and self.cache_dir:
+            entry = self._disk_get(key)
+            if entry is not None:
+                self._memory_put(key, entry)
+
+        now = time.time()
+        if entry is not None and now < entry["expires"]:
+            return self._response(entry, "cache")
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            status, response_headers, body = self.pool.request("GET", url, headers=request_headers,
+                                                               timeout=timeout, max_body=None)
+        except (OSError, http.client.HTTPException):
+            if entry is not None and self.stale_if_error:
+                return self._response(entry, "stale")
+            raise
+        self.stats["bytes"] += len(body)
+        now = time.time()
+
+        if status == 304 and entry is not None:
+            # Not modified: keep the body, take the new validators and freshness
+            entry = dict(entry)
+            entry["etag"] = response_headers.get("etag", entry.get("etag"))
+            entry["last_modified"] = response_headers.get("last-modified", entry.get("last_modified"))
+            entry["headers"] = dict(entry["headers"], **{name: value for name, value in response_headers.items()
+                                                         if name in ("cache-control", "expires", "date")})
+            expires = self._expires(entry["headers"], now)
+            entry["expires"] = now if expires is None else expires
+            self._store(key, entry)
+            return self._response(entry, "revalidated")
+
+        entry = {"url": url, "status": status, "headers": response_headers, "body": body,
+                 "etag": response_headers.get("etag"), "last_modified": response_headers.get("last-modified"),
+                 "expires": now}
+        expires = self._expires(response_headers, now)
+        if status == 200 and expires is not None and len(body) <= MAX_CACHED_BODY:
+            entry["expires"] = expires
+            self._store(key, entry)
+        return self._response(entry, "network")
+
+    def get_json(self, url, headers=None, timeout=None):
+        """GET a URL through the cache and decode the JSON body."""
+        return self.get(url, headers, timeout).json()
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class APIHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Stand-in for a polled API with ETag and Last-Modified support.
+
+    /deployments/<n>  a deployment whose status changes when the server's
+                      `version` changes; every 200 body is ~4 KB
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        version, changed = server.version, server.changed
+        etag = f'"v{version}-{self.path.strip("/").replace("/", "-")}"'
+        last_modified = formatdate(changed, usegmt=True)
+        with server.lock:
+            server.requests += 1
+        if self.headers.get("If-None-Match") == etag:
+            with server.lock:
+                server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps({
+            "success": True,
+            "data": {"id": self.path, "version": version,
+                     "status": "deploying" if version < 3 else "finished",
+                     "hosts": [f"web-{i:02d}" for i in range(300)]},
+        }).encode()
+        with server.lock:
+            server.sent_bytes += len(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        if server.max_age is not None:
+            self.send_header("Cache-Control", f"max-age={server.max_age}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep the demo output readable
+
+
+def start_api_server(max_age=None):
+    """Start a local API server in a thread. Returns (server, base_url)."""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), APIHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.version = 1
+    server.changed = time.time()
+    server.max_age = max_age
+    server.requests = server.not_modified = server.sent_bytes = 0
+    threading.Thread(target=server.serve_forever, name="api-server", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def reset_counters(server):
+    server.requests = server.not_modified = server.sent_bytes = 0
+
+
+def demo(polls=200, interval=0.01):
+    """Poll a local API with and without the cache."""
+    server, base_url = start_api_server()
+    url = f"{base_url}/deployments/42"
+    cache_dir = "/tmp/test_devops_http_cache"
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+    def change(number):
+        # The deployment changes status twice during the polling
+        if number in (polls // 3, 2 * polls // 3):
+            server.version += 1
+            server.changed = time.time()
+
+    print(f"Example 1: Poll {polls} times without a cache")
+    start = time.perf_counter()
+    for number in range(polls):
+        change(number)
+        with urllib.request.urlopen(url) as response:
+            json.loads(response.read())
+        time.sleep(interval)
+    print(f"  {server.requests} requests, {server.sent_bytes / 1024:,.0f} KB downloaded "
+          f"in {time.perf_counter() - start:.1f}s")
+    print("-" * 50)
+
+    print("Example 2: Same polling through CachedHTTP (ttl=0.1s)")
+    server.version = 1
+    reset_counters(server)
+    cache = CachedHTTP(ttl=0.1, cache_dir=cache_dir)
+    start = time.perf_counter()
+    versions = []
+    for number in range(polls):
+        change(number)
+        data = cache.get_json(url)
+        versions.append(data["data"]["version"])
+        time.sleep(interval)
+    stats = cache.stats
+    print(f"  {stats['cache']} from cache, {stats['revalidated']} x 304, {stats['network']} downloads "
+          f"in {time.perf_counter() - start:.1f}s")
+    print(f"  {server.requests} requests, {server.sent_bytes / 1024:,.0f} KB downloaded")
+    status = "✓" if versions[-1] == 3 and sorted(versions) == versions else "✗"
+    print(f"  {status} every change seen: versions {sorted(set(versions))}")
+    cache.close()
+    print("-" * 50)
+
+    print("Example 3: Restart - the disk tier survives")
+    reset_counters(server)
+    time.sleep(0.2)  # The cached answer is stale now
+    cache = CachedHTTP(ttl=0.1, cache_dir=cache_dir)
+    response = cache.get(url)
+    status = "✓" if response.source == "revalidated" and server.sent_bytes == 0 else "✗"
+    print(f"  {status} first call after restart: source={response.source}, "
+          f"{server.sent_bytes} bytes downloaded")
+    print("-" * 50)
+
+    print("Example 4: The API goes down")
+    cache.close()
+    server.shutdown()
+    server.server_close()
+    time.sleep(0.2)  # Let the entry go stale
+    cache = CachedHTTP(ttl=0.1, cache_dir=cache_dir)
+    response = cache.get(url)
+    status = "✓" if response.source == "stale" else "✗"
+    print(f"  {status} source={response.source}, last known status: {response.json()['data']['status']}")
+    cache.close()
+    print("-" * 50)
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="HTTP response cache with ETag revalidation")
+    parser.add_argument("--url", help="URL to poll")
+    parser.add_argument("--poll", type=int, default=3, help="how many times to poll (default: 3)")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between polls (default: 2)")
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL, help=f"seconds a response stays fresh (default: {DEFAULT_TTL:g})")
+    parser.add_argument("--cache-dir", help="keep the cache on disk in this directory")
+    return parser.parse_args()
+
+
+def main():
+    """Poll a URL through the cache, or run the demo."""
+    args = parse_args()
+
+    if args.url:
+        with CachedHTTP(ttl=args.ttl, cache_dir=args.cache_dir) as cache:
+            for number in range(args.poll):
+                if number:
+                    time.sleep(args.interval)
+                start = time.perf_counter()
+                try:
+                    response = cache.get(args.url)
+                except (OSError, http.client.HTTPException, ValueError) as e:
+                    print(f"✗ {e}")
+                    sys.exit(1)
+                print(f"  {response.status} {response.source:<12} {len(response.body):>9,} bytes "
+                      f"{(time.perf_counter() - start) * 1000:7.1f} ms")
+            print(f"\n  Downloaded {cache.stats['bytes']:,} bytes in {args.poll} polls")
+    else:
+        demo()
+
+    # DevOps Pro Tip
+    print("\n" + "=" * 50)
+    print("💡 Polling APIs? Cache and revalidate!")
+    print("   Fresh answers come from memory - no request at all")
+    print("   Stale answers: If-None-Match -> 304, no body")
+    print("   Keep the last answer for when the API is down")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Fault Injection Test Server
+
+WHAT: A small HTTP server that fails on purpose - slow answers, errors,
+      hangs, dropped connections - and can be switched while it runs
+WHERE: Testing health checkers, retries, timeouts, circuit breakers and
+       hedged requests before production does it for you
+WHY: check_health() in 019_http_requests.py waits the full 5s timeout on
+     every poll of a dead host, and one slow replica makes every p99
+     slow. 031_health_checker.py has a circuit breaker and hedged
+     requests for that - this server shows what they do
+
+REAL-WORLD SCENARIO:
+- A host hangs (accepts connections, never answers): after 3 timeouts
+  the checker should stop waiting on it and probe it now and then
+- 5% of the answers take 500 ms (GC pause, cold cache): ask a replica
+  when the first answer is late and take whichever comes first
+- Turn faults on and off with curl while a checker is running
+
+HOW IT WORKS:
+- Every request first waits `latency` seconds; `slow_rate` of them wait
+  `slow` seconds instead, `error_rate` of them answer 503
+- mode "up" (normal), "error" (always 503), "hang" (never answers) or
+  "reset" (closes the connection without an answer)
+- GET /_fault shows the settings as JSON; GET /_fault?mode=hang&latency=0.1
+  changes them - no restart needed
+- Every server has its own random generator, so runs can be repeated
+
+HOW TO RUN:
+    python3 034_fault_server.py                      # demo: circuit breaker and hedging
+    python3 034_fault_server.py --serve --port 8080 --slow-rate 0.05 --slow 0.5
+    curl 'http://127.0.0.1:8080/_fault?mode=hang'    # make it hang
+    python3 031_health_checker.py --url http://127.0.0.1:8080/health --every 2 --timeout 1
+"""
+
+import argparse
+import http.server
+import importlib
+import json
+import random
+import socket
+import statistics
+import struct
+import threading
+import time
+import urllib.parse
+
+health_checker = importlib.import_module("031_health_checker")
+
+MODES = ("up", "error", "hang", "reset")
+DEFAULT_FAULTS = {"mode": "up", "latency": 0.0, "slow_rate": 0.0, "slow": 1.0, "error_rate": 0.0}
+# How long a "hang" lasts - longer than any sensible client timeout
+HANG_SECONDS = 300
+
+
+class FaultHandler(http.server.BaseHTTPRequestHandler):
+    """Answer every path like a health endpoint, with the server's faults."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately - without this, Nagle's
+    # algorithm + delayed ACK add ~40 ms to every keep-alive answer
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        if path == "/_fault":
+            self.control(urllib.parse.parse_qs(query))
+            return
+
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            faults = dict(server.faults)
+            roll = server.random.random()
+            error_roll = server.random.random()
+
+        if faults["mode"] == "reset":
+            # SO_LINGER 0: close() sends a TCP reset instead of a normal close
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            self.close_connection = True
+            return
+        if faults["mode"] == "hang":
+            self.server.stopped.wait(HANG_SECONDS)
+            self.close_connection = True
+            return
+
+        time.sleep(faults["slow"] if roll < faults["slow_rate"] else faults["latency"])
+        if faults["mode"] == "error" or error_roll < faults["error_rate"]:
+            self.reply(503, {"status": "unavailable"})
+        else:
+            self.reply(200, {"status": "ok", "server": server.name})
+
+    def control(self, params):
+        """/_fault?mode=...&latency=... - change the faults, return them."""
+        server = self.server
+        try:
+            with server.lock:
+                for name, values in params.items():
+                    if name not in DEFAULT_FAULTS:
+                        raise ValueError(f"unknown setting: {name}")
+                    if name == "mode" and values[-1] not in MODES:
+                        raise ValueError(f"mode must be one of {', '.join(MODES)}")
+                    server.faults[name] = values[-1] if name == "mode" else float(values[-1])
+                faults = dict(server.faults)
+        except ValueError as e:
+            self.reply(400, {"error": str(e)})
+            return
+        self.reply(200, faults)
+
+    def reply(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class FaultServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def shutdown(self):
+        self.stopped.set()  # Wake up hanging handlers
+        super().shutdown()
+
+
+def start_fault_server(name="fault", address="127.0.0.1", port=0, seed=None, verbose=False, **faults):
+    """
+    Start a fault server in a thread.
+
+    Args:
+        name: Shown in the answers ({"server": name})
+        address, port: Where to listen (port 0 = any free port)
+        seed: Seed of the random generator (None = random)
+        verbose: Log every request
+        **faults: mode, latency, slow_rate, slow, error_rate
+
+    Returns:
+        (server, base_url) - change server.faults[...] to switch faults
+    """
+    server = FaultServer((address, port), FaultHandler)
+    server.name = name
+    server.faults = dict(DEFAULT_FAULTS, **faults)
+    server.lock = threading.Lock()
+    server.random = random.Random(seed)
+    server.requests = 0
+    server.stopped = threading.Event()
+    server.verbose = verbose
+    threading.Thread(target=server.serve_forever, name=f"fault-{name}", daemon=True).start()
+    return server, f"http://{address}:{server.server_address[1]}"
+
+
+def percentile(values, percent):
+    """Value below which `percent` % of the values fall."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def poll(url, pool, breakers, polls=15, recover_at=9, server=None):
+    """Poll url every 0.3s; the server hangs until poll `recover_at`. Returns the results."""
+    server.faults["mode"] = "hang"
+    results = []
+    for number in range(1, polls + 1):
+        if number == recover_at:
+            server.faults["mode"] = "up"
+        results.append(health_checker.check_url(pool, url, timeout=0.5, breakers=breakers))
+        time.sleep(0.3)
+    return results
+
+
+def demo_breaker():
+    """A host hangs, then recovers - with and without a circuit breaker."""
+    print("Example 1: A hanging host, polled every 0.3s (timeout 0.5s)")
+    server, url = start_fault_server("web-01")
+    url += "/health"
+    pool = health_checker.HTTPPool(timeout=0.5)
+
+    plain = poll(url, pool, None, server=server)
+    breakers = health_checker.CircuitBreakers(failures=3, reset_timeout=1.5)
+    guarded = poll(url, pool, breakers, server=server)
+    for number, result in enumerate(guarded, 1):
+        if number == 9:
+            print("  -- web-01 recovers --")
+        status = "✓" if result.healthy else "✗"
+        print(f"  poll {number:2d}: {status} {result.message:<34} {result.seconds * 1000:4.0f} ms")
+
+    print(f"  Time spent waiting on web-01: {sum(result.seconds for result in plain):.1f}s without a breaker, "
+          f"{sum(result.seconds for result in guarded):.1f}s with one")
+    pool.close()
+    server.shutdown()
+    print("-" * 50)
+
+
+def demo_hedging(checks=300):
+    """Two replicas with a slow tail - plain checks vs hedged checks."""
+    print(f"Example 2: Hedged requests ({checks} checks, 5% of answers take 500 ms)")
+    primary, primary_url = start_fault_server("primary", latency=0.005, slow_rate=0.05, slow=0.5, seed=1)
+    replica, replica_url = start_fault_server("replica", latency=0.005, slow_rate=0.05, slow=0.5, seed=2)
+    urls = [f"{primary_url}/health/{i}" for i in range(checks)]
+    replicas = {url: [url.replace(primary_url, replica_url)] for url in urls}
+
+    for label, hedge_after in (("plain", None), ("hedged after 50 ms", 0.05)):
+        primary.requests = replica.requests = 0
+        times = [result.seconds for result in health_checker.check_all(
+            urls, concurrency=16, timeout=2, replicas=replicas, hedge_after=hedge_after)]
+        extra = replica.requests / checks
+        print(f"  {label:<19}: p50 {percentile(times, 50) * 1000:4.0f} ms  p99 {percentile(times, 99) * 1000:4.0f} ms  "
+              f"max {max(times) * 1000:4.0f} ms  mean {statistics.mean(times) * 1000:3.0f} ms  "
+              f"(+{extra:.0%} requests)")
+
+    print("-" * 50)
+    print("Example 3: The primary drops connections - hedge at once")
+    primary.faults["mode"] = "reset"
+    result = health_checker.check_url(health_checker.HTTPPool(), urls[0], timeout=2,
+                                      replicas=replicas[urls[0]], hedge_after=0.05)
+    status = "✓" if result.healthy else "✗"
+    print(f"  {status} {result.message} in {result.seconds * 1000:.0f} ms")
+    primary.shutdown()
+    replica.shutdown()
+    print("-" * 50)
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="HTTP server with injectable faults")
+    parser.add_argument("--serve", action="store_true", help="run a fault server until Ctrl+C")
+    parser.add_argument("--address", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on (default: 8080)")
+    parser.add_argument("--mode", choices=MODES, default="up", help="fault mode (default: up)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before every answer")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="fraction of slow answers (0-1)")
+    parser.add_argument("--slow", type=float, default=1.0, help="seconds a slow answer takes (default: 1)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 503 answers (0-1)")
+    return parser.parse_args()
+
+
+def main():
+    """Serve faults, or run the demo."""
+    args = parse_args()
+
+    if args.serve:
+        try:
+            server, url = start_fault_server(address=args.address, port=args.port, verbose=True, mode=args.mode,
+                                             latency=args.latency, slow_rate=args.slow_rate, slow=args.slow,
+                                             error_rate=args.error_rate)
+        except OSError as e:
+            print(f"✗ Can't listen on {args.address}:{args.port}: {e}")
+            raise SystemExit(1)
+        print(f"✓ Fault server on {url} - change it with {url}/_fault?mode=hang")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+            print("\nStopped")
+    else:
+        demo_breaker()
+        demo_hedging()
+
+    # DevOps Pro Tip
+    print("\n" + "=" * 50)
+    print("💡 Test failure handling before production does!")
+    print("   Circuit breaker: stop waiting on hosts known to be down")
+    print("   Hedging: ask a replica when the answer is late")
+    print("   Inject hangs, not just errors - timeouts hurt most")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
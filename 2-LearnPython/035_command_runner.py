@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Async Command Runner Pool
+
+WHAT: Run many commands at the same time with asyncio, stream their
+      output line by line, and kill the whole process group on timeout
+WHERE: Fleet scripts - ssh to every host, run a check on every node,
+       build/lint/test many repositories, rotate certificates everywhere
+WHY: run_command() in 015_running_commands.py runs one command at a time
+     with subprocess.run(): 2,000 short commands of 50 ms each = 100s+
+     of waiting. capture_output=True keeps all output in memory until
+     the command ends, and on timeout only the direct child is killed -
+     its children (ssh sessions, pipelines, background jobs) keep running
+
+REAL-WORLD SCENARIO:
+- Run `uptime` over ssh on 2,000 hosts, 64 at a time
+- Tail the output of a long build while it runs, prefixed by its name
+- A command that prints millions of lines must not fill the memory
+- `ssh host 'backup.sh'` hangs - after 30s kill ssh AND everything it started
+
+HOW IT WORKS:
+- asyncio.create_subprocess_exec() starts processes without threads
+  blocking on them; at most `concurrency` run at once and results come
+  back in completion order
+- stdout and stderr are read line by line as they arrive. Every line
+  goes to an on_line(name, stream, line) callback; only the last
+  `keep_lines` lines per stream are kept for the result (None = all)
+- Every command starts in a new session (its own process group). On
+  timeout the group gets SIGTERM, then SIGKILL after `grace` seconds, so
+  shells, pipelines and background children all stop
+- If the runner itself is cancelled (Ctrl+C), running groups are killed too
+- run_commands() / run_command() are plain (non-async) wrappers;
+  run_command() keeps the interface of 015_running_commands.py
+
+HOW TO RUN:
+    python3 035_command_runner.py                                 # demo
+    python3 035_command_runner.py --file commands.txt --concurrency 32 --timeout 60
+    python3 035_command_runner.py --hosts hosts.txt --ssh 'uptime' --stream
+    python3 035_command_runner.py --file commands.txt --shell --failures-only
+
+USE IT FROM ANOTHER SCRIPT:
+    runner = importlib.import_module("035_command_runner")
+    jobs = [runner.Job(host, ["ssh", host, "uptime"]) for host in hosts]
+    for result in runner.run_commands(jobs, concurrency=64, timeout=30):
+        print(result.name, result.returncode, result.stdout.strip())
+"""
+
+import argparse
+import asyncio
+import importlib
+import itertools
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import time
+from collections import deque, namedtuple
+
+reports = importlib.import_module("030_streaming_reports")
+
+DEFAULT_CONCURRENCY = 32
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_GRACE = 2.0
+DEFAULT_KEEP_LINES = 20
+# Longest line read in one piece; longer lines are cut
+LINE_LIMIT = 1024 * 1024
+
+Job = namedtuple("Job", ["name", "command"])
+CommandResult = namedtuple("CommandResult", [
+    "name", "command", "returncode", "stdout", "stderr", "seconds", "timed_out",
+])
+
+
+def _kill_group(process, sig):
+    """Send a signal to the process group of a command (it may already be gone)."""
+    try:
+        os.killpg(process.pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def _pump(stream, name, stream_name, tail, on_line):
+    """Read a pipe line by line until EOF."""
+    while True:
+        try:
+            line = await stream.readline()
+        except ValueError:
+            line = b"[line longer than LINE_LIMIT cut]\n"  # readline() dropped the rest of it
+        if not line:
+            return
+        text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+        tail.append(text)
+        if on_line is not None:
+            on_line(name, stream_name, text)
+
+
+async def run_command_async(command, name=None, timeout=DEFAULT_TIMEOUT, on_line=None,
+                            keep_lines=DEFAULT_KEEP_LINES, shell=False, cwd=None, env=None,
+                            grace=DEFAULT_GRACE):
+    """
+    Run one command, streaming its output.
+
+    Args:
+        command: List of arguments (or a string with shell=True)
+        name: Name in results and on_line calls (default: the command)
+        timeout: Seconds before the process group is killed (None = no limit)
+        on_line: Called as on_line(name, "stdout"/"stderr", line) for every line
+        keep_lines: Lines of each stream kept in the result (None = all)
+        shell: Run the command with /bin/sh
+        cwd, env: Working directory and environment
+        grace: Seconds between SIGTERM and SIGKILL
+
+    Returns:
+        CommandResult(name, command, returncode, stdout, stderr, seconds, timed_out)
+        - returncode is negative when killed by a signal, 127 if it couldn't start
+    """
+    if name is None:
+        name = command if isinstance(command, str) else shlex.join(command)
+    start = time.monotonic()
+    options = dict(stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                   start_new_session=True, cwd=cwd, env=env, limit=LINE_LIMIT)
+    try:
+        if shell:
+            process = await asyncio.create_subprocess_shell(command, **options)
+        else:
+            process = await asyncio.create_subprocess_exec(*command, **options)
+    except OSError as e:
+        return CommandResult(name, command, 127, "", str(e), time.monotonic() - start, False)
+
+    tails = {"stdout": deque(maxlen=keep_lines), "stderr": deque(maxlen=keep_lines)}
+    tasks = {asyncio.create_task(process.wait())}
+    for stream_name, stream in (("stdout", process.stdout), ("stderr", process.stderr)):
+        tasks.add(asyncio.create_task(_pump(stream, name, stream_name, tails[stream_name], on_line)))
+
+    timed_out = False
+    try:
+        # Wait for the exit AND the end of both pipes - a background child
+        # that still holds a pipe counts as "still running"
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            timed_out = True
+            _kill_group(process, signal.SIGTERM)
+            _, pending = await asyncio.wait(pending, timeout=grace)
+            if pending:
+                _kill_group(process, signal.SIGKILL)
+                _, pending = await asyncio.wait(pending, timeout=grace)
+            for task in pending:
+                task.cancel()
+    except asyncio.CancelledError:
+        _kill_group(process, signal.SIGKILL)
+        for task in tasks:
+            task.cancel()
+        raise
+
+    returncode = process.returncode
+    if returncode is None:
+        returncode = -signal.SIGKILL
+    stdout = "\n".join(tails["stdout"]) + ("\n" if tails["stdout"] else "")
+    stderr = "\n".join(tails["stderr"]) + ("\n" if tails["stderr"] else "")
+    return CommandResult(name, command, returncode, stdout, stderr, time.monotonic() - start, timed_out)
+
+
+async def iter_commands(commands, concurrency=DEFAULT_CONCURRENCY, **options):
+    """
+    Run commands, at most `concurrency` at a time, and yield results as they finish.
+
+    Args:
+        commands: Iterable of commands, or of Job(name, command) (read lazily)
+        concurrency: Commands running at the same time
+        **options: Passed to run_command_async() (timeout, on_line, shell...)
+
+    Yields:
+        CommandResult, in completion order
+    """
+    commands = iter(commands)
+    pending = set()
+    try:
+        while True:
+            for item in itertools.islice(commands, concurrency - len(pending)):
+                if isinstance(item, Job):
+                    task = run_command_async(item.command, name=item.name, **options)
+                else:
+                    task = run_command_async(item, **options)
+                pending.add(asyncio.create_task(task))
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        # Stopped early (break, Ctrl+C): kill what is still running
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+
+def run_commands(commands, concurrency=DEFAULT_CONCURRENCY, on_result=None, **options):
+    """
+    Run commands concurrently from normal (non-async) code.
+
+    Args:
+        commands: Iterable of commands or Job(name, command)
+        concurrency: Commands running at the same time
+        on_result: Called with each CommandResult as soon as it finishes
+        **options: Passed to run_command_async()
+
+    Returns:
+        List of CommandResult, in completion order
+    """
+    async def collect():
+        results = []
+        async for result in iter_commands(commands, concurrency, **options):
+            if on_result is not None:
+                on_result(result)
+            results.append(result)
+        return results
+
+    return asyncio.run(collect())
+
+
+def run_command(command, description="", timeout=DEFAULT_TIMEOUT):
+    """
+    Safely run a command - same interface as 015_running_commands.py,
+    but a timeout kills the whole process group.
+
+    Returns:
+        Output string if successful, None if failed
+    """
+    if description:
+        print(f"Running: {description}")
+    result = asyncio.run(run_command_async(command, timeout=timeout, keep_lines=None))
+    if result.timed_out:
+        print("  ✗ Command timed out")
+        return None
+    if result.returncode != 0:
+        print(f"  ✗ Failed: {result.stderr.strip()}")
+        return None
+    return result.stdout
+
+
+def ssh_jobs(hosts, remote_command, connect_timeout=10):
+    """Yield one Job per host that runs remote_command over ssh (no password prompts)."""
+    for host in hosts:
+        yield Job(host, ["ssh", "-o", "BatchMode=yes", "-o", f"ConnectTimeout={connect_timeout}",
+                         host, remote_command])
+
+
+def read_lines(path):
+    """Yield non-empty lines of a file, skipping # comments."""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def _capture_all(lines):
+    """subprocess.run(capture_output=True) on a chatty command (runs in a fresh process)."""
+    base = reports.peak_memory_mb()
+    result = subprocess.run(["seq", "1", str(lines)], capture_output=True, text=True)
+    return len(result.stdout.splitlines()), reports.peak_memory_mb() - base
+
+
+def _stream_all(lines):
+    """The same command, streamed line by line (runs in a fresh process)."""
+    base = reports.peak_memory_mb()
+    counted = [0]
+
+    def count(name, stream, line):
+        counted[0] += 1
+
+    asyncio.run(run_command_async(["seq", "1", str(lines)], on_line=count))
+    return counted[0], reports.peak_memory_mb() - base
+
+
+def _is_running(pid):
+    """True if pid is alive (a zombie waiting to be reaped counts as dead)."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except (OSError, IndexError):
+        return False
+
+
+def demo(commands=2000, concurrency=64):
+    """Compare serial subprocess.run() with the async runner."""
+    # A "short remote command": 50 ms of waiting (network, ssh...) and one line of output
+    jobs = [Job(f"web-{i:04d}", ["sh", "-c", 'sleep 0.05; echo "$0 up 12 days"', f"web-{i:04d}"])
+            for i in range(commands)]
+
+    serial_count = min(100, commands)
+    print(f"Example 1: subprocess.run() one at a time ({serial_count} commands)")
+    start = time.perf_counter()
+    for job in jobs[:serial_count]:
+        subprocess.run(job.command, capture_output=True, text=True, timeout=30)
+    seconds = time.perf_counter() - start
+    print(f"  {serial_count} commands in {seconds:.2f}s -> {commands:,} would take ~{seconds * commands / serial_count:.0f}s")
+    print("-" * 50)
+
+    print(f"Example 2: Async runner ({commands:,} commands, concurrency {concurrency})")
+    start = time.perf_counter()
+    first = []
+    results = run_commands(jobs, concurrency=concurrency, timeout=30,
+                           on_result=lambda result: first or first.append(time.perf_counter() - start))
+    seconds = time.perf_counter() - start
+    ok = sum(1 for result in results if result.returncode == 0 and result.stdout.endswith("up 12 days\n"))
+    status = "✓" if ok == commands else "✗"
+    print(f"  {status} {ok:,}/{commands:,} succeeded in {seconds:.2f}s ({commands / seconds:,.0f} commands/s)")
+    print(f"  First result after {first[0] * 1000:.0f} ms: {results[0].name}: {results[0].stdout.strip()}")
+    print("-" * 50)
+
+    lines = 2_000_000
+    print(f"Example 3: A command that prints {lines:,} lines")
+    count, memory = reports.in_fresh_process(_capture_all, lines)
+    print(f"  capture_output=True : {count:,} lines, +{memory:.0f} MB memory")
+    count, memory = reports.in_fresh_process(_stream_all, lines)
+    print(f"  streamed, on_line() : {count:,} lines, +{memory:.0f} MB memory (last {DEFAULT_KEEP_LINES} lines kept)")
+    print("-" * 50)
+
+    print("Example 4: Timeout with a background child (timeout 1s)")
+    command = ["sh", "-c", "sleep 3 & echo $!; wait"]
+    start = time.perf_counter()
+    try:
+        subprocess.run(command, capture_output=True, timeout=1)
+    except subprocess.TimeoutExpired as e:
+        child = int((e.stdout or b"0").split()[0])
+        time.sleep(0.1)
+        print(f"  ✗ subprocess.run(timeout=1) returned after {time.perf_counter() - start:.1f}s, "
+              f"background sleep (pid {child}) still running: {_is_running(child)}")
+    result = asyncio.run(run_command_async(command, timeout=1))
+    child = int(result.stdout.split()[0])
+    time.sleep(0.1)
+    status = "✓" if result.timed_out and not _is_running(child) else "✗"
+    print(f"  {status} runner returned after {result.seconds:.1f}s, returncode {result.returncode}, "
+          f"background sleep (pid {child}) killed: {not _is_running(child)}")
+    print("-" * 50)
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Run many commands concurrently with asyncio")
+    parser.add_argument("--file", help="file with one command per line")
+    parser.add_argument("--hosts", help="file with one host per line (use with --ssh)")
+    parser.add_argument("--ssh", metavar="COMMAND", help="command to run on every host over ssh")
+    parser.add_argument("--shell", action="store_true", help="run --file lines with /bin/sh (pipes, globs)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"commands at the same time (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"seconds per command (default: {DEFAULT_TIMEOUT:g})")
+    parser.add_argument("--stream", action="store_true", help="print every output line as it arrives")
+    parser.add_argument("--failures-only", action="store_true", help="print only failed commands")
+    parser.add_argument("--demo", type=int, default=2000, help="commands in the demo (default: 2000)")
+    return parser.parse_args()
+
+
+def main():
+    """Run commands from a file or over ssh, or run the demo."""
+    args = parse_args()
+    failed = 0
+
+    if args.file or args.hosts:
+        if args.hosts and not args.ssh:
+            print("✗ --hosts needs --ssh COMMAND")
+            sys.exit(1)
+        if args.hosts:
+            commands = ssh_jobs(read_lines(args.hosts), args.ssh)
+        elif args.shell:
+            commands = read_lines(args.file)
+        else:
+            commands = (shlex.split(line) for line in read_lines(args.file))
+
+        def print_line(name, stream, line):
+            print(f"[{name}] {line}" if stream == "stdout" else f"[{name}] ! {line}", flush=True)
+
+        def print_result(result):
+            nonlocal failed
+            ok = result.returncode == 0 and not result.timed_out
+            failed += not ok
+            if ok and args.failures_only:
+                return
+            if result.timed_out:
+                reason = f"timed out after {args.timeout:g}s"
+            elif ok:
+                reason = "ok"
+            else:
+                errors = result.stderr.strip().splitlines()
+                reason = f"exit {result.returncode}" + (f": {errors[-1]}" if errors else "")
+            print(f"{'✓' if ok else '✗'} {result.name} ({result.seconds:.1f}s) {reason}", flush=True)
+
+        start = time.perf_counter()
+        try:
+            results = run_commands(commands, concurrency=args.concurrency, timeout=args.timeout,
+                                   shell=args.shell and not args.hosts, on_result=print_result,
+                                   on_line=print_line if args.stream else None)
+        except OSError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            print("\nStopped - running commands were killed")
+            sys.exit(130)
+        print(f"\n{len(results) - failed} succeeded, {failed} failed in {time.perf_counter() - start:.1f}s")
+    else:
+        demo(args.demo, max(args.concurrency, 64))
+
+    # DevOps Pro Tip
+    print("\n" + "=" * 50)
+    print("💡 Running commands at fleet scale!")
+    print("   Run them concurrently - waiting is the slow part")
+    print("   Stream output line by line, keep only the tail")
+    print("   Own process group per command: kill the group on timeout")
+    print("=" * 50)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
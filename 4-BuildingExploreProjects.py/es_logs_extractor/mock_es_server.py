@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Mock Elasticsearch Server
+
+WHAT: A small HTTP server that answers the Elasticsearch API calls
+      es_logs_extractor.py makes, backed by generated log documents
+WHERE: Trying the extractor (and its resume/retry logic) without a cluster
+WHY: A real 200M document index is not something you start on a laptop
+
+SUPPORTED API:
+    GET    /                        cluster info
+    POST   /<index>/_count          {"query": ...}
+    POST   /<index>/_pit?keep_alive=5m
+    POST   /_search                 pit, slice, sort, search_after, size, _source
+    DELETE /_pit                    {"id": ...}
+
+    Queries: match_all, term, terms, range, bool (must/filter/must_not)
+    Sort: _shard_doc or any fields, ascending
+    filter_path is accepted and ignored (the full response is sent)
+
+LIKE THE REAL THING:
+- A point-in-time (PIT) is a frozen snapshot: documents indexed after
+  the PIT was opened are not visible through it
+- A PIT expires keep_alive after its last use -> 404
+  search_context_missing_exception
+- Slices split documents by a hash of _id, so each document is in
+  exactly one slice
+- Responses are gzip-compressed when the client sends Accept-Encoding
+
+FAULT INJECTION:
+    --fail-rate 0.05   answer 5% of searches with 429 Too Many Requests
+    --latency 0.05     wait 50ms before answering each search (like a shard query)
+
+HOW TO RUN:
+    python3 mock_es_server.py                          # 100,000 docs on :9200
+    python3 mock_es_server.py --docs 1000000 --port 9201 --latency 0.02
+    curl -s localhost:9200/logs-app/_count
+"""
+
+import argparse
+import bisect
+import calendar
+import gzip
+import json
+import random
+import threading
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_INDEX = "logs-app"
+
+
+def generate_docs(count, start="2026-01-27T00:00:00"):
+    """Create log documents as they would be stored in an index."""
+    hosts = ["web-1", "web-2", "api-1", "worker-1"]
+    levels = ["INFO"] * 16 + ["WARNING", "WARNING", "ERROR", "DEBUG"]
+    messages = ["GET /api/users 200", "POST /api/orders 201", "cache miss for key user:42",
+                "Connection to db-1 timed out", "Job nightly-report finished", "Disk usage at 85%"]
+    start_epoch = calendar.timegm(time.strptime(start, "%Y-%m-%dT%H:%M:%S"))
+    docs = []
+    for i in range(count):
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(start_epoch + i // 10))
+        docs.append({
+            "_id": f"{i:010d}",
+            "_source": {
+                "@timestamp": f"{stamp}.{i % 10}00Z",
+                "host": {"name": hosts[i % len(hosts)]},
+                "log": {"level": levels[i % len(levels)]},
+                "message": messages[i * 7 % len(messages)],
+                "http": {"status": [200, 200, 201, 404, 500][i % 5]},
+                "event": {"sequence": i},
+            },
+        })
+    return docs
+
+
+def get_field(source, field):
+    """Look up a dotted field name ("host.name") in a document."""
+    value = source
+    for part in field.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def matches(query, source):
+    """Evaluate the supported query DSL subset against one document."""
+    if not query or "match_all" in query:
+        return True
+    if "term" in query:
+        (field, value), = query["term"].items()
+        if isinstance(value, dict):
+            value = value["value"]
+        return get_field(source, field) == value
+    if "terms" in query:
+        (field, values), = query["terms"].items()
+        return get_field(source, field) in values
+    if "range" in query:
+        (field, bounds), = query["range"].items()
+        value = get_field(source, field)
+        if value is None:
+            return False
+        checks = {"gt": lambda a, b: a > b, "gte": lambda a, b: a >= b,
+                  "lt": lambda a, b: a < b, "lte": lambda a, b: a <= b}
+        return all(checks[name](value, bound) for name, bound in bounds.items() if name in checks)
+    if "bool" in query:
+        clauses = query["bool"]
+
+        def as_list(value):
+            return value if isinstance(value, list) else [value]
+
+        positive = as_list(clauses.get("must", [])) + as_list(clauses.get("filter", []))
+        return (all(matches(clause, source) for clause in positive)
+                and not any(matches(clause, source) for clause in as_list(clauses.get("must_not", []))))
+    raise ValueError(f"unsupported query: {sorted(query)}")
+
+
+def parse_keep_alive(text):
+    """'5m' -> 300 seconds"""
+    units = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400}
+    for unit in sorted(units, key=len, reverse=True):
+        if text.endswith(unit) and text[:-len(unit)].isdigit():
+            return int(text[:-len(unit)]) * units[unit]
+    raise ValueError(f"invalid keep_alive {text!r}")
+
+
+class ElasticsearchError(Exception):
+    """An error answered as an Elasticsearch error response."""
+
+    def __init__(self, status, error_type, reason):
+        super().__init__(reason)
+        self.status = status
+        self.error_type = error_type
+
+
+class MockElasticsearch:
+    """The index data, open PITs and request counters (shared by all handler threads)."""
+
+    def __init__(self, docs, index=DEFAULT_INDEX, fail_rate=0.0, latency=0.0, seed=42):
+        self.indices = {index: docs}
+        self.pits = {}  # pit id -> [index, docs snapshot, expires at]
+        self.fail_rate = fail_rate
+        self.latency = latency
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "searches": 0, "failures": 0, "pits_opened": 0, "pits_closed": 0}
+        self._views = {}  # (pit, query, sort, slice) -> (sort keys, hits)
+
+    def handle(self, method, path, params, body):
+        """Answer one request. Returns (status, response dict, extra headers)."""
+        with self.lock:
+            self.counts["requests"] += 1
+        parts = [part for part in path.split("/") if part]
+        try:
+            if method == "GET" and not parts:
+                return 200, {"name": "mock-es", "version": {"number": "8.12.0"},
+                             "tagline": "You Know, for Search"}, {}
+            if method == "POST" and len(parts) == 2 and parts[1] == "_count":
+                docs = self._index(parts[0])
+                query = body.get("query") if body else None
+                return 200, {"count": sum(1 for doc in docs if matches(query, doc["_source"]))}, {}
+            if method == "POST" and len(parts) == 2 and parts[1] == "_pit":
+                return 200, self.open_pit(parts[0], params.get("keep_alive", ["1m"])[0]), {}
+            if method == "POST" and parts == ["_search"]:
+                return self.search(body or {})
+            if method == "DELETE" and parts == ["_pit"]:
+                with self.lock:
+                    found = self.pits.pop((body or {}).get("id"), None) is not None
+                    self.counts["pits_closed"] += found
+                return (200 if found else 404), {"succeeded": found, "num_freed": int(found)}, {}
+            raise ElasticsearchError(400, "illegal_argument_exception", f"no handler for {method} {path}")
+        except ElasticsearchError as e:
+            return e.status, {"error": {"type": e.error_type, "reason": str(e)}, "status": e.status}, {}
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {"error": {"type": "parsing_exception", "reason": str(e)}, "status": 400}, {}
+
+    def _index(self, name):
+        if name not in self.indices:
+            raise ElasticsearchError(404, "index_not_found_exception", f"no such index [{name}]")
+        return self.indices[name]
+
+    def open_pit(self, index, keep_alive):
+        docs = self._index(index)
+        pit_id = uuid.uuid4().hex
+        with self.lock:
+            # A snapshot: later indexing doesn't change what the PIT sees
+            self.pits[pit_id] = [index, list(docs), time.monotonic() + parse_keep_alive(keep_alive)]
+            self.counts["pits_opened"] += 1
+        return {"id": pit_id}
+
+    def _view(self, pit_id, docs, query, sort, slice_spec):
+        """Matching docs of one slice, sorted, with their sort keys (cached per PIT)."""
+        cache_key = (pit_id, json.dumps(query, sort_keys=True), json.dumps(sort), json.dumps(slice_spec))
+        with self.lock:
+            view = self._views.get(cache_key)
+        if view is not None:
+            return view
+
+        fields = []
+        for item in sort:
+            field, order = (item, "asc") if isinstance(item, str) else next(iter(item.items()))
+            if isinstance(order, dict):
+                order = order.get("order", "asc")
+            if order != "asc":
+                raise ElasticsearchError(400, "illegal_argument_exception", "mock only supports ascending sort")
+            fields.append(field)
+
+        selected = []
+        for position, doc in enumerate(docs):
+            if slice_spec and zlib.crc32(doc["_id"].encode()) % slice_spec["max"] != slice_spec["id"]:
+                continue
+            if not matches(query, doc["_source"]):
+                continue
+            values = [position if field == "_shard_doc" else get_field(doc["_source"], field)
+                      for field in fields]
+            selected.append((values, doc))
+        selected.sort(key=lambda item: item[0])
+        view = ([values for values, _ in selected], selected)
+        with self.lock:
+            self._views[cache_key] = view
+        return view
+
+    def search(self, body):
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            self.counts["searches"] += 1
+            if self.fail_rate and self.random.random() < self.fail_rate:
+                self.counts["failures"] += 1
+                raise ElasticsearchError(429, "es_rejected_execution_exception",
+                                         "rejected execution: search thread pool queue is full")
+
+        pit = body.get("pit")
+        if not pit:
+            raise ElasticsearchError(400, "action_request_validation_exception", "mock only supports PIT searches")
+        now = time.monotonic()
+        with self.lock:
+            entry = self.pits.get(pit["id"])
+            if entry is None or entry[2] < now:
+                self.pits.pop(pit["id"], None)
+                raise ElasticsearchError(404, "search_context_missing_exception",
+                                         f"No search context found for id [{pit['id']}]")
+            if "keep_alive" in pit:
+                entry[2] = now + parse_keep_alive(pit["keep_alive"])
+        _, docs, _ = entry
+
+        sort = body.get("sort", [{"_shard_doc": "asc"}])
+        keys, selected = self._view(pit["id"], docs, body.get("query"), sort, body.get("slice"))
+        start = 0
+        if body.get("search_after") is not None:
+            start = bisect.bisect_right(keys, list(body["search_after"]))
+        page = selected[start:start + body.get("size", 10)]
+
+        source_filter = body.get("_source", True)
+        hits = []
+        for values, doc in page:
+            hit = {"_index": entry[0], "_id": doc["_id"], "_score": None, "sort": values}
+            if source_filter is True:
+                hit["_source"] = doc["_source"]
+            elif source_filter:
+                includes = [source_filter] if isinstance(source_filter, str) else source_filter
+                hit["_source"] = _include_fields(doc["_source"], includes)
+            hits.append(hit)
+
+        response = {"pit_id": pit["id"], "took": 1, "timed_out": False,
+                    "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+                    "hits": {"max_score": None, "hits": hits}}
+        if body.get("track_total_hits", True) is not False:
+            response["hits"]["total"] = {"value": len(keys), "relation": "eq"}
+        return 200, response, {}
+
+
+def _include_fields(source, includes):
+    """Keep only the listed dotted fields, preserving the nesting."""
+    result = {}
+    for field in includes:
+        value = get_field(source, field)
+        if value is None:
+            continue
+        target = result
+        parts = field.split(".")
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+        target[parts[-1]] = value
+    return result
+
+
+class Handler(BaseHTTPRequestHandler):
+    """HTTP/1.1 keep-alive handler that hands requests to server.es."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self):
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            status, response, headers = 400, {"error": {"type": "parsing_exception", "reason": "invalid JSON"}}, {}
+        else:
+            status, response, headers = self.server.es.handle(self.command, url.path, parse_qs(url.query), body)
+
+        payload = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            payload = gzip.compress(payload, compresslevel=1)
+            self.send_header("Content-Encoding", "gzip")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass  # Keep the output readable
+
+
+def start_server(es, port=0, host="127.0.0.1"):
+    """
+    Serve es in a background thread.
+
+    Returns:
+        (server, url) - call server.shutdown() when done
+    """
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.es = es
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Mock Elasticsearch server for es_logs_extractor.py")
+    parser.add_argument("--port", type=int, default=9200, help="port to listen on (default: 9200)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--index", default=DEFAULT_INDEX, help=f"index name (default: {DEFAULT_INDEX})")
+    parser.add_argument("--docs", type=int, default=100_000, help="documents to generate (default: 100000)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of searches answered with 429")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before each search answer")
+    return parser.parse_args()
+
+
+def main():
+    """Generate documents and serve until Ctrl+C."""
+    args = parse_args()
+    print(f"Generating {args.docs:,} documents...")
+    es = MockElasticsearch(generate_docs(args.docs), args.index, args.fail_rate, args.latency)
+    server, url = start_server(es, args.port, args.host)
+    print(f"✓ Mock Elasticsearch on {url} (index: {args.index})")
+    print("  Press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\nRequests: {es.counts['requests']:,}, searches: {es.counts['searches']:,}, "
+              f"injected failures: {es.counts['failures']:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1060 @@
+#!/usr/bin/env python3
+"""
+S3 Logs Search - a small Athena for partitioned log archives
+
+WHAT: Run SQL queries over log files stored as dt=YYYY-MM-DD/ partitions,
+      in a local directory or an S3 bucket (AWS, MinIO, moto)
+WHERE: Searching months of archived nginx/app logs without loading them
+       into a database
+WHY: Downloading and grepping every file reads terabytes to answer a
+     question about one day. Athena avoids that - so can we
+
+REAL-WORLD SCENARIO:
+    SELECT path, COUNT(*) AS errors FROM logs
+    WHERE dt = '2026-01-27' AND status >= 500
+    GROUP BY path ORDER BY errors DESC LIMIT 10
+
+HOW IT WORKS (the same tricks Athena/Presto use):
+- Partition pruning: dt=2026-01-27/ in the object key is a column. The
+  WHERE clause is evaluated on partition values alone first; partitions
+  where it can't be true are never listed, opened or read
+- Predicate pushdown: `status = 500`, `level = 'ERROR'` or
+  `path LIKE '%/login%'` means a matching line must contain that text.
+  Chunks are searched for it with bytes.find() and only those lines are
+  parsed - most lines are skipped without running the parser
+- Parallel scan: every file is a work item for a process pool
+- Projection: only the columns the query uses are extracted, and
+  workers send back partial aggregates (or at most LIMIT rows), not
+  whole records
+- Reports "data scanned" like Athena: bytes read from storage
+
+SQL SUPPORTED:
+    SELECT col, ... | * | COUNT(*) | COUNT/SUM/MIN/MAX/AVG(col) [AS name]
+    FROM logs
+    WHERE  = != <> < <= > >=  LIKE  NOT LIKE  IN (...)  BETWEEN x AND y
+           combined with AND / OR / NOT and parentheses
+    GROUP BY col, ...   ORDER BY col|alias [ASC|DESC], ...   LIMIT n
+    The time column can be compared with 'YYYY-MM-DD HH:MM:SS' (UTC)
+
+LOG FORMATS (--format):
+    access  nginx/Apache combined format
+    app     "2026-01-27 14:30:00 ERROR message"
+    json    one JSON object per line (any fields)
+
+HOW TO RUN:
+    python3 s3_logs_search.py --demo
+    python3 s3_logs_search.py --location /data/logs/access \\
+        "SELECT status, COUNT(*) FROM logs WHERE dt >= '2026-01-01' GROUP BY status"
+    python3 s3_logs_search.py --location s3://my-bucket/logs/app --format app \\
+        "SELECT message, COUNT(*) AS n FROM logs WHERE level = 'ERROR' GROUP BY message ORDER BY n DESC LIMIT 5"
+    python3 s3_logs_search.py --location s3://logs/access --endpoint-url http://localhost:9000 "..."   # MinIO
+
+S3 support needs boto3 (pip3 install boto3). The demo also runs against
+an in-memory S3 if moto is installed (pip3 install moto).
+"""
+
+import argparse
+import bz2
+import calendar
+import gzip
+import json
+import lzma
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# boto3 and moto are optional
+try:
+    import boto3
+    HAS_BOTO3 = True
+except ImportError:
+    HAS_BOTO3 = False
+
+try:
+    from moto import mock_aws
+    HAS_MOTO = True
+except ImportError:
+    HAS_MOTO = False
+
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# ---------------------------------------------------------------------------
+# Log formats
+# ---------------------------------------------------------------------------
+
+ACCESS_LINE = re.compile(
+    r'([^ ]+) [^ ]+ ([^ ]+) \[([^\]]*)\] "([^ "]*) ([^ "]*) ([^"]*)" ([0-9]+) ([0-9]+|-)'
+    r'(?: "([^"]*)" "([^"]*)")?'
+)
+APP_LINE = re.compile(r"(\d{4}-\d\d-\d\d)[ T](\d\d):(\d\d):(\d\d)\S*\s+\[?([A-Z]+)\]?:?\s+(.*)")
+MONTHS = {name: number for number, name in enumerate(calendar.month_abbr) if name}
+
+# Column -> type for the fixed formats (json columns are whatever the lines have)
+FORMAT_COLUMNS = {
+    "access": {
+        "remote_addr": "str", "remote_user": "str", "time": "int", "method": "str", "path": "str",
+        "protocol": "str", "status": "int", "body_bytes": "int", "referer": "str", "user_agent": "str",
+    },
+    "app": {"time": "int", "level": "str", "message": "str"},
+    "json": {},
+}
+
+# Columns whose value is not written as-is in the raw line (can't push down)
+NOT_PUSHABLE = {"time"}
+
+
+def _day_epoch(year, month, day, cache={}):
+    """Epoch seconds of midnight UTC, cached per day."""
+    key = (year, month, day)
+    if key not in cache:
+        cache[key] = calendar.timegm((year, month, day, 0, 0, 0))
+    return cache[key]
+
+
+def _access_time(text):
+    """'27/Jan/2026:14:30:00 +0000' -> epoch seconds (UTC), 0 if unparsable."""
+    try:
+        epoch = _day_epoch(int(text[7:11]), MONTHS[text[3:6]], int(text[0:2]))
+        epoch += int(text[12:14]) * 3600 + int(text[15:17]) * 60 + int(text[18:20])
+        zone = text[21:26]
+        if len(zone) == 5:
+            offset = int(zone[1:3]) * 3600 + int(zone[3:5]) * 60
+            epoch += offset if zone[0] == "-" else -offset
+        return epoch
+    except (KeyError, ValueError):
+        return 0
+
+
+def parse_access(line):
+    """Combined-format line -> dict of all columns (None if it doesn't match)."""
+    match = ACCESS_LINE.match(line)
+    if match is None:
+        return None
+    addr, user, stamp, method, path, protocol, status, size, referer, agent = match.groups()
+    return {
+        "remote_addr": addr, "remote_user": user, "time": _access_time(stamp), "method": method,
+        "path": path, "protocol": protocol, "status": int(status),
+        "body_bytes": int(size) if size != "-" else 0, "referer": referer or "", "user_agent": agent or "",
+    }
+
+
+def parse_app(line):
+    """'2026-01-27 14:30:00 ERROR message' -> dict (None if it doesn't match)."""
+    match = APP_LINE.match(line)
+    if match is None:
+        return None
+    date, hour, minute, second, level, message = match.groups()
+    epoch = _day_epoch(int(date[:4]), int(date[5:7]), int(date[8:10]))
+    return {"time": epoch + int(hour) * 3600 + int(minute) * 60 + int(second),
+            "level": level, "message": message}
+
+
+def parse_json(line):
+    """NDJSON line -> dict (None if it isn't a JSON object)."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+PARSERS = {"access": parse_access, "app": parse_app, "json": parse_json}
+
+
+def to_epoch(text):
+    """'YYYY-MM-DD[ HH:MM[:SS]]' (UTC) -> epoch seconds."""
+    match = re.fullmatch(r"(\d{4})-(\d\d)-(\d\d)(?:[ T](\d\d):(\d\d)(?::(\d\d))?)?", text.strip())
+    if match is None:
+        raise ValueError(f"can't compare time with {text!r} - use 'YYYY-MM-DD HH:MM:SS'")
+    year, month, day, hour, minute, second = (int(part or 0) for part in match.groups())
+    return _day_epoch(year, month, day) + hour * 3600 + minute * 60 + second
+
+
+# ---------------------------------------------------------------------------
+# SQL parser
+# ---------------------------------------------------------------------------
+
+TOKEN = re.compile(r"""\s*(?:
+    (?P<number>-?\d+(?:\.\d+)?)
+  | '(?P<string>(?:[^']|'')*)'
+  | (?P<op><=|>=|<>|!=|=|<|>|\(|\)|,|\*)
+  | (?P<word>[A-Za-z_][A-Za-z0-9_]*)
+)""", re.VERBOSE)
+
+AGGREGATES = {"COUNT", "SUM", "MIN", "MAX", "AVG"}
+KEYWORDS = {"SELECT", "FROM", "WHERE", "GROUP", "BY", "ORDER", "LIMIT", "AND", "OR", "NOT",
+            "LIKE", "IN", "BETWEEN", "AS", "ASC", "DESC"}
+
+
+class QueryError(Exception):
+    """The SQL text is invalid or not supported."""
+
+
+def tokenize(sql):
+    """Split SQL into (kind, value) tokens."""
+    tokens = []
+    pos = 0
+    sql = sql.strip().rstrip(";")
+    while pos < len(sql):
+        match = TOKEN.match(sql, pos)
+        if match is None or match.end() == pos:
+            raise QueryError(f"unexpected text at: {sql[pos:pos + 20]!r}")
+        pos = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "number":
+            tokens.append(("value", float(value) if "." in value else int(value)))
+        elif kind == "string":
+            tokens.append(("value", value.replace("''", "'")))
+        elif kind == "word" and value.upper() in KEYWORDS | AGGREGATES:
+            tokens.append(("keyword", value.upper()))
+        elif kind == "word":
+            tokens.append(("name", value))  # Case is kept: json fields are case-sensitive
+        else:
+            tokens.append(("op", value))
+    return tokens
+
+
+class Parser:
+    """Recursive-descent parser for the supported SELECT subset."""
+
+    def __init__(self, sql):
+        self.tokens = tokenize(sql)
+        self.pos = 0
+
+    def peek(self, offset=0):
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def accept(self, kind, value=None):
+        token = self.peek()
+        if token[0] == kind and (value is None or token[1] == value):
+            self.pos += 1
+            return token[1]
+        return None
+
+    def expect(self, kind, value=None):
+        result = self.accept(kind, value)
+        if result is None:
+            found = self.peek()[1]
+            raise QueryError(f"expected {value or kind}, found {found if found is not None else 'end of query'}")
+        return result
+
+    def parse(self):
+        """Return the query as a dict."""
+        self.expect("keyword", "SELECT")
+        select = [self.select_item()]
+        while self.accept("op", ","):
+            select.append(self.select_item())
+        self.expect("keyword", "FROM")
+        table = self.expect("name")
+        where = self.expression() if self.accept("keyword", "WHERE") else None
+        group_by = []
+        if self.accept("keyword", "GROUP"):
+            self.expect("keyword", "BY")
+            group_by = [self.expect("name")]
+            while self.accept("op", ","):
+                group_by.append(self.expect("name"))
+        order_by = []
+        if self.accept("keyword", "ORDER"):
+            self.expect("keyword", "BY")
+            order_by = [self.order_item()]
+            while self.accept("op", ","):
+                order_by.append(self.order_item())
+        limit = self.expect("value") if self.accept("keyword", "LIMIT") else None
+        if self.peek()[0] is not None:
+            raise QueryError(f"unexpected {self.peek()[1]!r}")
+        if limit is not None and (not isinstance(limit, int) or limit < 0):
+            raise QueryError("LIMIT must be a whole number")
+        return {"select": select, "table": table, "where": where, "group_by": group_by,
+                "order_by": order_by, "limit": limit}
+
+    def select_item(self):
+        """* | column [AS alias] | AGG(column|*) [AS alias]"""
+        if self.accept("op", "*"):
+            return ("star", None, None, "*")
+        function = self.peek()
+        if function[0] == "keyword" and function[1] in AGGREGATES:
+            self.pos += 1
+            self.expect("op", "(")
+            column = "*" if self.accept("op", "*") else self.expect("name")
+            self.expect("op", ")")
+            if column == "*" and function[1] != "COUNT":
+                raise QueryError(f"{function[1]}(*) is not supported")
+            name = f"{function[1].lower()}({column})"
+            kind, value = "agg", (function[1], column)
+        else:
+            name = self.expect("name")
+            kind, value = "column", name
+        alias = self.expect("name") if self.accept("keyword", "AS") else name
+        return (kind, value, name, alias)
+
+    def order_item(self):
+        """column|alias|AGG(...) [ASC|DESC] -> (output name, descending)"""
+        function = self.peek()
+        if function[0] == "keyword" and function[1] in AGGREGATES:
+            self.pos += 1
+            self.expect("op", "(")
+            column = "*" if self.accept("op", "*") else self.expect("name")
+            self.expect("op", ")")
+            name = f"{function[1].lower()}({column})"
+        else:
+            name = self.expect("name")
+        descending = bool(self.accept("keyword", "DESC"))
+        if not descending:
+            self.accept("keyword", "ASC")
+        return (name, descending)
+
+    def expression(self):
+        terms = [self.conjunction()]
+        while self.accept("keyword", "OR"):
+            terms.append(self.conjunction())
+        return terms[0] if len(terms) == 1 else ("or", terms)
+
+    def conjunction(self):
+        terms = [self.negation()]
+        while self.accept("keyword", "AND"):
+            terms.append(self.negation())
+        return terms[0] if len(terms) == 1 else ("and", terms)
+
+    def negation(self):
+        if self.accept("keyword", "NOT"):
+            return ("not", self.negation())
+        if self.accept("op", "("):
+            inner = self.expression()
+            self.expect("op", ")")
+            return inner
+        return self.comparison()
+
+    def comparison(self):
+        column = self.expect("name")
+        negate = bool(self.accept("keyword", "NOT"))
+        if self.accept("keyword", "LIKE"):
+            return ("like", column, self.expect("value"), negate)
+        if self.accept("keyword", "IN"):
+            self.expect("op", "(")
+            values = [self.expect("value")]
+            while self.accept("op", ","):
+                values.append(self.expect("value"))
+            self.expect("op", ")")
+            return ("in", column, values, negate)
+        if self.accept("keyword", "BETWEEN"):
+            low = self.expect("value")
+            self.expect("keyword", "AND")
+            high = self.expect("value")
+            node = ("and", [("cmp", column, ">=", low), ("cmp", column, "<=", high)])
+            return ("not", node) if negate else node
+        if negate:
+            raise QueryError("NOT must be followed by LIKE, IN or BETWEEN here")
+        operator = self.expect("op")
+        if operator not in ("=", "!=", "<>", "<", "<=", ">", ">="):
+            raise QueryError(f"unknown operator {operator!r}")
+        return ("cmp", column, "!=" if operator == "<>" else operator, self.expect("value"))
+
+
+def parse_query(sql):
+    """Parse SQL text into a query dict (raises QueryError)."""
+    return Parser(sql).parse()
+
+
+# ---------------------------------------------------------------------------
+# Predicates
+# ---------------------------------------------------------------------------
+
+def _coerce(column, value, column_types):
+    """Convert a literal to the column's type (e.g. time strings to epoch)."""
+    kind = column_types.get(column)
+    if kind == "int" and isinstance(value, str):
+        return to_epoch(value) if column == "time" else int(value)
+    if kind == "str" and not isinstance(value, str):
+        return str(value)
+    return value
+
+
+def like_to_regex(pattern):
+    """SQL LIKE pattern -> compiled regex (% = anything, _ = one character)."""
+    parts = [".*" if char == "%" else "." if char == "_" else re.escape(char) for char in pattern]
+    return re.compile("".join(parts), re.DOTALL)
+
+
+def prepare_predicate(node, column_types):
+    """Coerce literals and compile LIKE patterns once, before scanning."""
+    if node is None:
+        return None
+    kind = node[0]
+    if kind in ("and", "or"):
+        return (kind, [prepare_predicate(term, column_types) for term in node[1]])
+    if kind == "not":
+        return ("not", prepare_predicate(node[1], column_types))
+    if kind == "cmp":
+        return ("cmp", node[1], node[2], _coerce(node[1], node[3], column_types))
+    if kind == "like":
+        return ("like", node[1], like_to_regex(node[2]), node[3], node[2])
+    if kind == "in":
+        return ("in", node[1], {_coerce(node[1], value, column_types) for value in node[2]}, node[3])
+    raise QueryError(f"unknown condition {kind}")
+
+
+COMPARE = {
+    "=": lambda a, b: a == b, "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b, "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b, ">=": lambda a, b: a >= b,
+}
+
+
+def evaluate(node, row):
+    """
+    Evaluate a prepared predicate against a row dict.
+
+    Returns True, False, or None when a column is unknown (missing from
+    row) and the answer depends on it - used for partition pruning.
+    """
+    kind = node[0]
+    if kind == "and":
+        result = True
+        for term in node[1]:
+            value = evaluate(term, row)
+            if value is False:
+                return False
+            if value is None:
+                result = None
+        return result
+    if kind == "or":
+        result = False
+        for term in node[1]:
+            value = evaluate(term, row)
+            if value is True:
+                return True
+            if value is None:
+                result = None
+        return result
+    if kind == "not":
+        value = evaluate(node[1], row)
+        return None if value is None else not value
+
+    column = node[1]
+    if column not in row:
+        return None
+    value = row[column]
+    if value is None:
+        return False
+    try:
+        if kind == "cmp":
+            return COMPARE[node[2]](value, node[3])
+        if kind == "like":
+            return (node[2].fullmatch(str(value)) is not None) != node[3]
+        return (value in node[2]) != node[3]
+    except TypeError:
+        return False  # e.g. comparing text with a number in json logs
+
+
+def pushdown_needle(node, column_types, partition_columns, log_format):
+    """
+    Find text that every matching line must contain.
+
+    Only conditions joined by AND at the top level are used. Returns the
+    longest such text as bytes, or None.
+    """
+    if node is None:
+        return None
+    terms = node[1] if node[0] == "and" else [node]
+    best = ""
+    for term in terms:
+        if term[0] not in ("cmp", "like", "in") or term[1] in partition_columns or term[1] in NOT_PUSHABLE:
+            continue
+        candidate = ""
+        if term[0] == "cmp" and term[2] == "=":
+            candidate = term[3] if isinstance(term[3], str) else str(term[3]) if isinstance(term[3], int) else ""
+        elif term[0] == "in" and not term[3] and len(term[2]) == 1:
+            value = next(iter(term[2]))
+            candidate = value if isinstance(value, str) else str(value) if isinstance(value, int) else ""
+        elif term[0] == "like" and not term[3]:
+            candidate = max(re.split(r"[%_]", term[4]), key=len)
+        if log_format == "json" and json.dumps(candidate)[1:-1] != candidate:
+            continue  # Would be escaped differently in the raw JSON line
+        if len(candidate) > len(best):
+            best = candidate
+    return best.encode() if best else None
+
+
+# ---------------------------------------------------------------------------
+# Storage: local directory or S3 bucket
+# ---------------------------------------------------------------------------
+
+class LocalStorage:
+    """Log files under a local directory."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def __str__(self):
+        return self.root
+
+    def list_files(self):
+        """Return [(relative key, size)] for every file, sorted."""
+        files = []
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(directory, name)
+                files.append((os.path.relpath(path, self.root).replace(os.sep, "/"), os.path.getsize(path)))
+        return sorted(files)
+
+    def open(self, key):
+        return open(os.path.join(self.root, key), "rb")
+
+
+class S3Storage:
+    """Log objects under s3://bucket/prefix (AWS, MinIO or moto)."""
+
+    def __init__(self, bucket, prefix, endpoint_url=None):
+        if not HAS_BOTO3:
+            raise RuntimeError("S3 needs boto3: pip3 install boto3")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.endpoint_url = endpoint_url
+        self._client = None
+
+    def __str__(self):
+        return f"s3://{self.bucket}/{self.prefix}"
+
+    def __getstate__(self):
+        # boto3 clients can't be pickled - each worker process makes its own
+        state = dict(self.__dict__)
+        state["_client"] = None
+        return state
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = boto3.client("s3", endpoint_url=self.endpoint_url)
+        return self._client
+
+    def list_files(self):
+        files = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for item in page.get("Contents", []):
+                if not item["Key"].endswith("/"):
+                    files.append((item["Key"][len(self.prefix):], item["Size"]))
+        return sorted(files)
+
+    def open(self, key):
+        # Streamed: the object is read chunk by chunk, never saved to disk
+        return self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)["Body"]
+
+
+def open_storage(location, endpoint_url=None):
+    """LocalStorage or S3Storage from a path or s3:// URL."""
+    if location.startswith("s3://"):
+        bucket, _, prefix = location[5:].partition("/")
+        return S3Storage(bucket, prefix, endpoint_url)
+    if not os.path.isdir(location):
+        raise RuntimeError(f"{location} is not a directory")
+    return LocalStorage(location)
+
+
+def partition_values(key):
+    """'dt=2026-01-27/host=web-1/app.log.gz' -> {'dt': '2026-01-27', 'host': 'web-1'}"""
+    values = {}
+    for part in key.split("/")[:-1]:
+        name, equals, value = part.partition("=")
+        if equals:
+            values[name.lower()] = value
+    return values
+
+
+def _open_decompressed(stream, key):
+    """Wrap a binary stream so it yields decompressed bytes (by file extension)."""
+    if key.endswith(".gz"):
+        return gzip.GzipFile(fileobj=stream)
+    if key.endswith(".bz2"):
+        return bz2.BZ2File(stream)
+    if key.endswith(".xz"):
+        return lzma.LZMAFile(stream)
+    return stream
+
+
+def iter_chunks(stream, chunk_size=CHUNK_SIZE):
+    """Yield bytes chunks that end on a line boundary."""
+    tail = b""
+    while True:
+        block = stream.read(chunk_size)
+        if not block:
+            break
+        block = tail + block
+        end = block.rfind(b"\n") + 1
+        if end == 0:
+            tail = block
+            continue
+        tail = block[end:]
+        yield block[:end]
+    if tail:
+        yield tail + b"\n"
+
+
+def candidate_lines(chunk, needle):
+    """Yield the lines of chunk, or only those containing needle."""
+    if needle is None:
+        yield from chunk.split(b"\n")[:-1]
+        return
+    pos = chunk.find(needle)
+    while pos != -1:
+        start = chunk.rfind(b"\n", 0, pos) + 1
+        end = chunk.find(b"\n", pos)
+        yield chunk[start:end]
+        pos = chunk.find(needle, end)  # One line, however many hits
+
+
+# ---------------------------------------------------------------------------
+# Execution
+# ---------------------------------------------------------------------------
+
+def new_states(aggregates):
+    """Fresh aggregate states, one per (function, column)."""
+    return [[0] if function in ("COUNT", "SUM") else [None] if function in ("MIN", "MAX") else [0, 0]
+            for function, _ in aggregates]
+
+
+def update_states(states, aggregates, row):
+    for state, (function, column) in zip(states, aggregates):
+        if column == "*":
+            state[0] += 1
+            continue
+        value = row.get(column)
+        if value is None:
+            continue
+        if function == "COUNT":
+            state[0] += 1
+        elif function == "SUM":
+            state[0] += value
+        elif function == "MIN":
+            state[0] = value if state[0] is None or value < state[0] else state[0]
+        elif function == "MAX":
+            state[0] = value if state[0] is None or value > state[0] else state[0]
+        else:
+            state[0] += value
+            state[1] += 1
+
+
+def merge_states(total, part, aggregates):
+    for state, other, (function, _) in zip(total, part, aggregates):
+        if function in ("COUNT", "SUM"):
+            state[0] += other[0]
+        elif function == "AVG":
+            state[0] += other[0]
+            state[1] += other[1]
+        elif other[0] is not None:
+            if state[0] is None or (other[0] < state[0] if function == "MIN" else other[0] > state[0]):
+                state[0] = other[0]
+
+
+def final_value(state, function):
+    if function == "AVG":
+        return state[0] / state[1] if state[1] else None
+    return state[0]
+
+
+def sort_rows(rows, order_by, names):
+    """Sort row tuples by ORDER BY (stable sort per key, last key first)."""
+    for name, descending in reversed(order_by):
+        index = names.index(name)
+        # None sorts last in both directions
+        rows.sort(key=lambda row: (row[index] is None, row[index] if row[index] is not None else 0),
+                  reverse=descending)
+        if descending:
+            rows.sort(key=lambda row: row[index] is None)
+    return rows
+
+
+def scan_file(storage, key, plan):
+    """
+    Scan one file for a query (runs in a worker process).
+
+    Returns:
+        (stats dict, result) - result is {group: states} for aggregate
+        queries, or a list of row tuples otherwise
+    """
+    parse = PARSERS[plan["format"]]
+    where = plan["where"]
+    needle = plan["needle"]
+    partition = plan["partition"]
+    columns = plan["columns"]
+    stats = {"lines": 0, "parsed": 0, "matched": 0}
+    groups = {}
+    rows = []
+    limit = plan["row_limit"]
+
+    with storage.open(key) as raw:
+        stream = _open_decompressed(raw, key)
+        for chunk in iter_chunks(stream):
+            stats["lines"] += chunk.count(b"\n")
+            for line in candidate_lines(chunk, needle):
+                stats["parsed"] += 1
+                record = parse(line.decode("utf-8", errors="replace"))
+                if record is None:
+                    continue
+                # Projection: keep only the columns the query uses
+                row = {column: record.get(column) for column in columns}
+                row.update(partition)
+                if where is not None and not evaluate(where, row):
+                    continue
+                stats["matched"] += 1
+                if plan["aggregates"] is not None:
+                    group = tuple(row.get(column) for column in plan["group_by"])
+                    states = groups.get(group)
+                    if states is None:
+                        states = groups[group] = new_states(plan["aggregates"])
+                    update_states(states, plan["aggregates"], row)
+                else:
+                    rows.append(tuple(row.get(column) for column in plan["output"]))
+                    if limit is not None and not plan["order_by"] and len(rows) >= limit:
+                        return stats, rows  # LIMIT without ORDER BY: stop early
+            if limit is not None and plan["order_by"] and len(rows) > 4 * limit:
+                rows = sort_rows(rows, plan["order_by"], plan["output"])[:limit]
+
+    if plan["aggregates"] is not None:
+        return stats, groups
+    if limit is not None and plan["order_by"]:
+        rows = sort_rows(rows, plan["order_by"], plan["output"])[:limit]
+    return stats, rows
+
+
+def resolve_columns(query, columns):
+    """
+    Rewrite the column names of a query to their spelling in `columns`,
+    ignoring case (STATUS -> status). Other names are left as written.
+    """
+    spelling = {column.lower(): column for column in columns}
+
+    def column(name):
+        return spelling.get(name.lower(), name) if name != "*" else name
+
+    def output_name(name):
+        # "count(status)" / "status" as produced by the parser
+        function, paren, rest = name.partition("(")
+        if paren and rest.endswith(")"):
+            return f"{function}({column(rest[:-1])})"
+        return column(name)
+
+    def predicate(node):
+        if node[0] in ("and", "or"):
+            return (node[0], [predicate(term) for term in node[1]])
+        if node[0] == "not":
+            return ("not", predicate(node[1]))
+        return (node[0], column(node[1])) + node[2:]
+
+    select = []
+    for kind, value, name, alias in query["select"]:
+        if kind == "column":
+            value = column(value)
+        elif kind == "agg":
+            value = (value[0], column(value[1]))
+        new_name = output_name(name) if name is not None else None
+        select.append((kind, value, new_name, new_name if alias == name else alias))
+    aliases = {item[3] for item in select}
+    order_by = [(name if name in aliases else output_name(name), descending)
+                for name, descending in query["order_by"]]
+    return dict(query, select=select, group_by=[column(name) for name in query["group_by"]],
+                where=None if query["where"] is None else predicate(query["where"]), order_by=order_by)
+
+
+def plan_query(query, log_format, partition_columns):
+    """
+    Work out columns, aggregates and pushdowns for a parsed query.
+
+    Returns:
+        Plan dict shared by all workers, and output column names
+    """
+    column_types = dict(FORMAT_COLUMNS[log_format])
+    for column in partition_columns:
+        column_types[column] = "str"
+    known = None if log_format == "json" else set(column_types)
+    # Fixed columns and partition keys match in any case, json fields only as written
+    query = resolve_columns(query, column_types)
+
+    select = query["select"]
+    aggregates = [item[1] for item in select if item[0] == "agg"]
+    is_aggregate = bool(aggregates or query["group_by"])
+
+    if any(item[0] == "star" for item in select):
+        if is_aggregate:
+            raise QueryError("SELECT * can't be combined with aggregates or GROUP BY")
+        if log_format == "json":
+            raise QueryError("SELECT * needs a fixed format - list the json fields you want")
+        output = list(FORMAT_COLUMNS[log_format]) + sorted(partition_columns)
+        aliases = output
+    else:
+        output = [item[2] for item in select]
+        aliases = [item[3] for item in select]
+
+    used = set(query["group_by"])
+    used.update(item[1] for item in select if item[0] == "column")
+    used.update(column for _, column in aggregates if column != "*")
+    if not is_aggregate:
+        used.update(output)
+    where_columns = set()
+
+    def collect(node):
+        if node[0] in ("and", "or"):
+            for term in node[1]:
+                collect(term)
+        elif node[0] == "not":
+            collect(node[1])
+        else:
+            where_columns.add(node[1])
+
+    if query["where"] is not None:
+        collect(query["where"])
+    used |= where_columns
+    if known is not None:
+        unknown = sorted(used - known)
+        if unknown:
+            raise QueryError(f"unknown column(s): {', '.join(unknown)} (have: {', '.join(sorted(known))})")
+
+    if is_aggregate:
+        for item in select:
+            if item[0] == "column" and item[1] not in query["group_by"]:
+                raise QueryError(f"{item[1]} must be in GROUP BY or inside an aggregate")
+
+    # ORDER BY may use output names or aliases
+    order_by = []
+    for name, descending in query["order_by"]:
+        if name in aliases:
+            name = output[aliases.index(name)]
+        if name not in output:
+            raise QueryError(f"ORDER BY {name}: only selected columns can be used")
+        order_by.append((name, descending))
+
+    where = prepare_predicate(query["where"], column_types)
+    plan = {
+        "format": log_format,
+        "where": where,
+        "needle": pushdown_needle(where, column_types, partition_columns, log_format),
+        "columns": sorted(used - set(partition_columns)),
+        "group_by": query["group_by"],
+        "aggregates": aggregates if is_aggregate else None,
+        "output": output,
+        "order_by": order_by,
+        # Each file only needs to return LIMIT rows (aggregates need all groups)
+        "row_limit": None if is_aggregate else query["limit"],
+    }
+    return plan, aliases
+
+
+def run_query(storage, sql, log_format="access", jobs=None, table="logs"):
+    """
+    Run SQL against the log files in storage.
+
+    Returns:
+        (column names, rows, stats dict)
+    """
+    query = parse_query(sql)
+    if query["table"].lower() != table.lower():
+        raise QueryError(f"unknown table {query['table']!r} (use FROM {table})")
+
+    started = time.perf_counter()
+    files = storage.list_files()
+    partitions = {}
+    for key, size in files:
+        values = partition_values(key)
+        partitions.setdefault(tuple(sorted(values.items())), []).append((key, size))
+    partition_columns = {name for values in partitions for name, _ in values}
+
+    plan, names = plan_query(query, log_format, partition_columns)
+
+    # Partition pruning: evaluate WHERE on partition values only
+    work = []
+    kept = 0
+    for values, partition_files in partitions.items():
+        partition = dict(values)
+        if plan["where"] is not None and evaluate(plan["where"], partition) is False:
+            continue
+        kept += 1
+        for key, size in partition_files:
+            work.append((key, size, partition))
+
+    stats = {"partitions": len(partitions), "partitions_scanned": kept, "files": len(work),
+             "bytes_scanned": sum(size for _, size, _ in work), "lines": 0, "parsed": 0, "matched": 0,
+             "needle": plan["needle"].decode() if plan["needle"] else None}
+
+    plans = [dict(plan, partition=partition) for _, _, partition in work]
+    keys = [key for key, _, _ in work]
+    if jobs == 1 or len(work) <= 1:
+        parts = [scan_file(storage, key, file_plan) for key, file_plan in zip(keys, plans)]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            parts = list(pool.map(scan_file, [storage] * len(work), keys, plans))
+
+    if plan["aggregates"] is not None:
+        groups = {}
+        for part_stats, part_groups in parts:
+            for group, states in part_groups.items():
+                if group in groups:
+                    merge_states(groups[group], states, plan["aggregates"])
+                else:
+                    groups[group] = states
+        if not groups and not plan["group_by"]:
+            groups[()] = new_states(plan["aggregates"])  # SELECT COUNT(*) with no rows -> 0
+        rows = []
+        for group, states in groups.items():
+            values = dict(zip(plan["group_by"], group))
+            for (function, column), state in zip(plan["aggregates"], states):
+                values[f"{function.lower()}({column})"] = final_value(state, function)
+            rows.append(tuple(values[name] for name in plan["output"]))
+    else:
+        rows = [row for _, part_rows in parts for row in part_rows]
+
+    for part_stats, _ in parts:
+        for name in ("lines", "parsed", "matched"):
+            stats[name] += part_stats[name]
+
+    if plan["order_by"]:
+        rows = sort_rows(rows, plan["order_by"], plan["output"])
+    if query["limit"] is not None:
+        rows = rows[:query["limit"]]
+    stats["seconds"] = time.perf_counter() - started
+    return names, rows, stats
+
+
+def print_result(names, rows, stats):
+    """Print rows as a table, then Athena-style statistics."""
+    def show(name, value):
+        if value is None:
+            return ""
+        if isinstance(value, float):
+            return f"{value:.2f}"
+        if name == "time" and isinstance(value, int):
+            return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(value))
+        return str(value)
+
+    text_rows = [[show(name, value) for name, value in zip(names, row)] for row in rows]
+    widths = [max([len(name)] + [len(row[i]) for row in text_rows]) for i, name in enumerate(names)]
+    print("  ".join(name.ljust(width) for name, width in zip(names, widths)))
+    print("  ".join("-" * width for width in widths))
+    for row in text_rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
+    print(f"({len(rows)} row(s))")
+
+    print(f"\nPartitions: {stats['partitions_scanned']}/{stats['partitions']} scanned, "
+          f"files: {stats['files']}, data scanned: {stats['bytes_scanned'] / 1024 / 1024:.2f} MB, "
+          f"time: {stats['seconds']:.2f}s")
+    pushed = f" (pushed down: {stats['needle']!r})" if stats["needle"] else ""
+    print(f"Lines: {stats['lines']:,}, parsed: {stats['parsed']:,}{pushed}, matched: {stats['matched']:,}")
+
+
+# ---------------------------------------------------------------------------
+# Demo
+# ---------------------------------------------------------------------------
+
+def create_demo_archive(root, days=("2026-01-25", "2026-01-26", "2026-01-27"), lines_per_file=50_000):
+    """Write a dt=YYYY-MM-DD/ partitioned access log archive (gzip and plain)."""
+    paths = ["/", "/api/users", "/api/orders", "/login", "/static/app.js", "/health"]
+    statuses = [200] * 15 + [301, 404, 404, 500, 503]
+    for day_number, day in enumerate(days):
+        directory = os.path.join(root, f"dt={day}")
+        os.makedirs(directory, exist_ok=True)
+        stamp_day = f"{day[8:10]}/{calendar.month_abbr[int(day[5:7])]}/{day[:4]}"
+        for host in ("web-1", "web-2"):
+            lines = []
+            for i in range(lines_per_file):
+                second = i * 86400 // lines_per_file
+                status = statuses[(i + day_number) % len(statuses)]
+                lines.append(
+                    f'10.0.{i % 7}.{i % 200} - - [{stamp_day}:{second // 3600:02d}:{second // 60 % 60:02d}:'
+                    f'{second % 60:02d} +0000] "GET {paths[i % len(paths)]} HTTP/1.1" {status} '
+                    f'{i * 13 % 5000} "-" "curl/8.5.0"\n'
+                )
+            data = "".join(lines).encode()
+            if host == "web-1":
+                with gzip.open(os.path.join(directory, f"{host}.access.log.gz"), "wb") as f:
+                    f.write(data)
+            else:
+                with open(os.path.join(directory, f"{host}.access.log"), "wb") as f:
+                    f.write(data)
+
+
+DEMO_QUERIES = [
+    "SELECT status, COUNT(*) AS requests FROM logs WHERE dt = '2026-01-27' GROUP BY status ORDER BY status",
+    "SELECT path, COUNT(*) AS errors, SUM(body_bytes) AS bytes FROM logs "
+    "WHERE dt BETWEEN '2026-01-26' AND '2026-01-27' AND status = 503 GROUP BY path ORDER BY errors DESC LIMIT 3",
+    "SELECT time, remote_addr, path FROM logs WHERE dt = '2026-01-25' AND path LIKE '/login%' "
+    "AND time >= '2026-01-25 23:59:00' ORDER BY time DESC LIMIT 5",
+]
+
+
+def run_demo(jobs):
+    """Build a sample archive and query it locally (and in a mock S3 if moto is installed)."""
+    root = "/tmp/test_devops_s3_logs/access"
+    create_demo_archive(root)
+    print(f"Created partitioned archive: {root}\n")
+    storage = LocalStorage(root)
+    for sql in DEMO_QUERIES:
+        print(f"SQL> {sql}\n")
+        print_result(*run_query(storage, sql, "access", jobs))
+        print("-" * 50)
+
+    if HAS_MOTO and HAS_BOTO3:
+        print("Same archive in a mock S3 bucket (moto):\n")
+        with mock_aws():
+            client = boto3.client("s3", region_name="us-east-1")
+            client.create_bucket(Bucket="demo-logs")
+            for key, _ in storage.list_files():
+                with storage.open(key) as f:
+                    client.put_object(Bucket="demo-logs", Key=f"access/{key}", Body=f.read())
+            s3 = S3Storage("demo-logs", "access")
+            s3._client = client
+            print(f"SQL> {DEMO_QUERIES[1]}\n")
+            # moto only exists in this process: no worker processes here
+            print_result(*run_query(s3, DEMO_QUERIES[1], "access", jobs=1))
+    else:
+        print("(pip3 install boto3 moto to also run the demo against a mock S3 bucket)")
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="SQL over partitioned log archives (local or S3)")
+    parser.add_argument("sql", nargs="?", help="query, e.g. \"SELECT COUNT(*) FROM logs WHERE dt = '2026-01-27'\"")
+    parser.add_argument("--location", help="directory or s3://bucket/prefix with dt=YYYY-MM-DD/ folders")
+    parser.add_argument("--format", choices=sorted(PARSERS), default="access", help="log format (default: access)")
+    parser.add_argument("--table", default="logs", help="table name used in FROM (default: logs)")
+    parser.add_argument("--endpoint-url", help="S3 endpoint for MinIO/localstack, e.g. http://localhost:9000")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes (default: CPU count)")
+    parser.add_argument("--demo", action="store_true", help="build a sample archive and run example queries")
+    return parser.parse_args()
+
+
+def main():
+    """Run one query, or the demo."""
+    args = parse_args()
+
+    if args.demo or not args.sql:
+        if not args.demo:
+            print("No query given - running the demo (see --help)\n")
+        run_demo(args.jobs)
+    else:
+        if not args.location:
+            print("✗ --location is required")
+            sys.exit(1)
+        try:
+            storage = open_storage(args.location, args.endpoint_url)
+            print_result(*run_query(storage, args.sql, args.format, args.jobs, args.table))
+        except QueryError as e:
+            print(f"✗ Query error: {e}")
+            sys.exit(1)
+        except (RuntimeError, ValueError, OSError) as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+
+    # DevOps Pro Tip
+    print("\n" + "=" * 50)
+    print("💡 The fastest data is the data you never read!")
+    print("   Partition by date: dt=YYYY-MM-DD/")
+    print("   Skip partitions and lines before parsing anything")
+    print("   Ship small partial results, not raw records")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()